@@ -0,0 +1,35 @@
+"""add_period_date_indexes
+
+Revision ID: a7c4e1f8b2d6
+Revises: f6b3d9e2a5c8
+Create Date: 2026-10-18 18:26:52.771034
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c4e1f8b2d6'
+down_revision: Union[str, None] = 'f6b3d9e2a5c8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - índices para filtros de período (date >= ? AND date < ?)."""
+    # Distribuições atuais em um período: old = false AND date >= ? AND date < ?
+    op.create_index('ix_distribution_old_date', 'distribution', ['old', 'date'], unique=False)
+    # Coberto pelo índice composto (old é a primeira coluna)
+    op.execute("DROP INDEX IF EXISTS ix_distribution_old")
+
+    op.create_index('ix_ration_input_date', 'ration_input', ['date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema - remove os índices de período."""
+    op.drop_index('ix_ration_input_date', table_name='ration_input')
+
+    op.create_index('ix_distribution_old', 'distribution', ['old'], unique=False)
+    op.drop_index('ix_distribution_old_date', table_name='distribution')
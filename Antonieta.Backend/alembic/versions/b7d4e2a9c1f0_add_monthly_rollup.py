@@ -0,0 +1,76 @@
+"""add_monthly_rollup
+
+Revision ID: b7d4e2a9c1f0
+Revises: 14ad4711b267
+Create Date: 2026-10-18 09:12:31.418204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d4e2a9c1f0'
+down_revision: Union[str, None] = '14ad4711b267'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - cria tabela de totais mensais materializados."""
+    op.create_table(
+        'monthly_rollup',
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('month', sa.Integer(), nullable=False),
+        sa.Column('ration_stock_id', sa.Integer(), nullable=False),
+        sa.Column('beneficiary_id', sa.Integer(), nullable=False),
+        sa.Column('distributed_amount', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('distribution_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('input_amount', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('input_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('year', 'month', 'ration_stock_id', 'beneficiary_id')
+    )
+    
+    # Popular a tabela com o histórico existente
+    # Entradas de ração usam beneficiary_id = 0
+    op.execute("""
+        INSERT INTO monthly_rollup (
+            year, month, ration_stock_id, beneficiary_id,
+            distributed_amount, distribution_count, input_amount, input_count
+        )
+        SELECT year, month, ration_stock_id, beneficiary_id,
+               SUM(distributed_amount), SUM(distribution_count),
+               SUM(input_amount), SUM(input_count)
+        FROM (
+            SELECT CAST(EXTRACT(YEAR FROM date) AS INTEGER) AS year,
+                   CAST(EXTRACT(MONTH FROM date) AS INTEGER) AS month,
+                   ration_id AS ration_stock_id,
+                   COALESCE(beneficiary_id, 0) AS beneficiary_id,
+                   amount AS distributed_amount,
+                   1 AS distribution_count,
+                   0 AS input_amount,
+                   0 AS input_count
+            FROM distribution
+            WHERE old = FALSE AND ration_id IS NOT NULL
+            UNION ALL
+            SELECT CAST(EXTRACT(YEAR FROM date) AS INTEGER),
+                   CAST(EXTRACT(MONTH FROM date) AS INTEGER),
+                   ration_stock_id,
+                   0,
+                   0,
+                   0,
+                   amount,
+                   1
+            FROM ration_input
+            WHERE ration_stock_id IS NOT NULL
+        ) AS movements
+        GROUP BY year, month, ration_stock_id, beneficiary_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema - remove tabela de totais mensais."""
+    op.drop_table('monthly_rollup')
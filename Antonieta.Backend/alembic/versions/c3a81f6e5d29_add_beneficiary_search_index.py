@@ -0,0 +1,57 @@
+"""add_beneficiary_search_index
+
+Revision ID: c3a81f6e5d29
+Revises: b7d4e2a9c1f0
+Create Date: 2026-10-18 10:03:47.902116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3a81f6e5d29'
+down_revision: Union[str, None] = 'b7d4e2a9c1f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - índice trigram para busca de beneficiários."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    
+    # unaccent() não é IMMUTABLE; o wrapper permite usá-la em índices
+    op.execute("""
+        CREATE OR REPLACE FUNCTION f_unaccent(text)
+        RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+    """)
+    
+    # Texto normalizado usado pela busca (mesma regra de normalize_search_text)
+    op.execute(r"""
+        CREATE OR REPLACE FUNCTION beneficiary_search_text(name text, document text, contact text, neighborhood text)
+        RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE
+        AS $$
+            SELECT btrim(regexp_replace(lower(f_unaccent(
+                coalesce(name, '') || ' ' || coalesce(document, '') || ' ' ||
+                coalesce(contact, '') || ' ' || coalesce(neighborhood, '')
+            )), '\s+', ' ', 'g'))
+        $$
+    """)
+    
+    op.execute("""
+        CREATE INDEX ix_beneficiary_search_trgm
+        ON beneficiary
+        USING gin (beneficiary_search_text(name, document, contact, neighborhood) gin_trgm_ops)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema - remove índice de busca de beneficiários."""
+    op.execute("DROP INDEX IF EXISTS ix_beneficiary_search_trgm")
+    op.execute("DROP FUNCTION IF EXISTS beneficiary_search_text(text, text, text, text)")
+    op.execute("DROP FUNCTION IF EXISTS f_unaccent(text)")
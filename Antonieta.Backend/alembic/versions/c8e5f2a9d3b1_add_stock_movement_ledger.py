@@ -0,0 +1,97 @@
+"""add_stock_movement_ledger
+
+Revision ID: c8e5f2a9d3b1
+Revises: a7c4e1f8b2d6
+Create Date: 2026-10-18 20:41:07.315862
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e5f2a9d3b1'
+down_revision: Union[str, None] = 'a7c4e1f8b2d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - cria o livro-razão de estoque (stock_movement)."""
+    op.create_table(
+        'stock_movement',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('ration_stock_id', sa.Integer(), nullable=False),
+        sa.Column('sequence', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('source_id', sa.Integer(), nullable=True),
+        sa.Column('reference_date', sa.DateTime(), nullable=True),
+        sa.Column('delta', sa.Float(), nullable=False),
+        sa.Column('balance', sa.Float(), nullable=False),
+        sa.Column('total_in', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('total_out', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('recorded_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['ration_stock_id'], ['ration_stock.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('ration_stock_id', 'sequence', name='uq_stock_movement_ration_sequence')
+    )
+    op.create_index(op.f('ix_stock_movement_id'), 'stock_movement', ['id'], unique=False)
+    op.create_index(
+        'ix_stock_movement_ration_recorded', 'stock_movement',
+        ['ration_stock_id', 'recorded_at', 'sequence'], unique=False
+    )
+
+    # Popular com o histórico existente: por ração, um movimento de abertura
+    # (saldo atual menos entradas e distribuições) seguido das entradas e
+    # distribuições na ordem em que foram registradas (created_at, a mesma
+    # linha do tempo de recorded_at nos movimentos novos), com saldo e
+    # totais acumulados; a data informada vai para reference_date
+    op.execute("""
+        WITH events AS (
+            SELECT ration_stock_id, COALESCE(created_at, date) AS recorded_at, date AS reference_date,
+                   1 AS priority, 'input' AS kind, id AS source_id, amount AS delta
+            FROM ration_input
+            WHERE ration_stock_id IS NOT NULL AND date IS NOT NULL AND amount IS NOT NULL
+            UNION ALL
+            SELECT ration_id, COALESCE(created_at, date), date, 2, 'distribution', id, -amount
+            FROM distribution
+            WHERE ration_id IS NOT NULL AND date IS NOT NULL AND amount IS NOT NULL
+        ),
+        ledger AS (
+            SELECT rs.id AS ration_stock_id,
+                   COALESCE((SELECT MIN(e.recorded_at) FROM events e WHERE e.ration_stock_id = rs.id), rs.created_at, now()) AS recorded_at,
+                   NULL AS reference_date,
+                   0 AS priority,
+                   'opening' AS kind,
+                   NULL AS source_id,
+                   COALESCE(rs.stock, 0) - COALESCE((SELECT SUM(e.delta) FROM events e WHERE e.ration_stock_id = rs.id), 0) AS delta
+            FROM ration_stock rs
+            UNION ALL
+            SELECT ration_stock_id, recorded_at, reference_date, priority, kind, source_id, delta FROM events
+        )
+        INSERT INTO stock_movement (
+            ration_stock_id, sequence, kind, source_id, reference_date,
+            delta, balance, total_in, total_out, recorded_at
+        )
+        SELECT ration_stock_id,
+               ROW_NUMBER() OVER w,
+               kind,
+               source_id,
+               reference_date,
+               delta,
+               SUM(delta) OVER w,
+               SUM(CASE WHEN delta > 0 THEN delta ELSE 0 END) OVER w,
+               SUM(CASE WHEN delta < 0 THEN -delta ELSE 0 END) OVER w,
+               recorded_at
+        FROM ledger
+        WINDOW w AS (PARTITION BY ration_stock_id ORDER BY recorded_at, priority, source_id ROWS UNBOUNDED PRECEDING)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema - remove o livro-razão de estoque."""
+    op.drop_index('ix_stock_movement_ration_recorded', table_name='stock_movement')
+    op.drop_index(op.f('ix_stock_movement_id'), table_name='stock_movement')
+    op.drop_table('stock_movement')
@@ -0,0 +1,168 @@
+"""partition_audit_logs_by_month
+
+Revision ID: d4f19a7b3e62
+Revises: c3a81f6e5d29
+Create Date: 2026-10-18 14:21:09.318245
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f19a7b3e62'
+down_revision: Union[str, None] = 'c3a81f6e5d29'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Meses futuros criados antecipadamente
+MONTHS_AHEAD = 3
+
+AUDIT_COLUMNS = """
+    id integer NOT NULL DEFAULT nextval('audit_logs_id_seq'),
+    user_id integer REFERENCES users (id),
+    user_email varchar,
+    action varchar(50) NOT NULL,
+    entity_type varchar(100) NOT NULL,
+    entity_id integer,
+    description varchar NOT NULL,
+    changes json,
+    ip_address varchar(50),
+    user_agent varchar(500),
+    created_at timestamp with time zone NOT NULL DEFAULT now()
+"""
+
+COPY_COLUMNS = "id, user_id, user_email, action, entity_type, entity_id, description, changes, ip_address, user_agent"
+
+INDEXED_COLUMNS = ("action", "created_at", "entity_id", "entity_type", "id", "user_id")
+
+
+def _detach_sequence(table: str) -> None:
+    # A sequência de id passa para a nova tabela em vez de ser removida junto com a antiga
+    op.execute(f"ALTER TABLE {table} ALTER COLUMN id DROP DEFAULT")
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY NONE")
+
+
+def _drop_indexes() -> None:
+    for column in INDEXED_COLUMNS:
+        op.execute(f"DROP INDEX IF EXISTS ix_audit_logs_{column}")
+
+
+def _create_indexes() -> None:
+    for column in INDEXED_COLUMNS:
+        op.execute(f"CREATE INDEX ix_audit_logs_{column} ON audit_logs ({column})")
+
+
+def upgrade() -> None:
+    """Upgrade schema - particiona audit_logs por mês de created_at."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_legacy")
+    op.execute("ALTER TABLE audit_logs_legacy RENAME CONSTRAINT audit_logs_pkey TO audit_logs_legacy_pkey")
+    _drop_indexes()
+    _detach_sequence("audit_logs_legacy")
+
+    # A chave primária de uma tabela particionada precisa incluir a coluna de partição
+    op.execute(f"""
+        CREATE TABLE audit_logs ({AUDIT_COLUMNS},
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id")
+
+    # Partição padrão: recebe linhas de meses ainda sem partição própria
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+
+    # Cria a partição de um mês, movendo para ela as linhas que estejam na padrão
+    op.execute("""
+        CREATE OR REPLACE FUNCTION audit_logs_create_partition(p_month date)
+        RETURNS text
+        LANGUAGE plpgsql
+        AS $$
+        DECLARE
+            start_at timestamptz := date_trunc('month', p_month::timestamp);
+            end_at timestamptz := date_trunc('month', p_month::timestamp) + interval '1 month';
+            partition_name text := 'audit_logs_' || to_char(p_month, 'YYYY_MM');
+        BEGIN
+            IF to_regclass(partition_name) IS NOT NULL THEN
+                RETURN partition_name;
+            END IF;
+
+            EXECUTE format('CREATE TABLE %I (LIKE audit_logs INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', partition_name);
+            EXECUTE format(
+                'WITH moved AS (DELETE FROM audit_logs_default WHERE created_at >= %L AND created_at < %L RETURNING *) '
+                'INSERT INTO %I SELECT * FROM moved',
+                start_at, end_at, partition_name
+            );
+            EXECUTE format(
+                'ALTER TABLE audit_logs ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                partition_name, start_at, end_at
+            );
+            RETURN partition_name;
+        END
+        $$
+    """)
+
+    # Garante as partições do mês atual e dos próximos meses
+    op.execute("""
+        CREATE OR REPLACE FUNCTION audit_logs_ensure_partitions(months_ahead integer DEFAULT 3)
+        RETURNS void
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            FOR i IN 0..months_ahead LOOP
+                PERFORM audit_logs_create_partition((date_trunc('month', now()) + make_interval(months => i))::date);
+            END LOOP;
+        END
+        $$
+    """)
+
+    # Partições para os meses que já têm registros e para os próximos meses
+    op.execute("""
+        SELECT audit_logs_create_partition(month::date)
+        FROM generate_series(
+            date_trunc('month', coalesce((SELECT min(created_at) FROM audit_logs_legacy), now())),
+            date_trunc('month', now()),
+            interval '1 month'
+        ) AS month
+    """)
+    op.execute(f"SELECT audit_logs_ensure_partitions({MONTHS_AHEAD})")
+
+    _create_indexes()
+
+    op.execute(f"""
+        INSERT INTO audit_logs ({COPY_COLUMNS}, created_at)
+        SELECT {COPY_COLUMNS}, coalesce(created_at, now())
+        FROM audit_logs_legacy
+    """)
+    op.execute("DROP TABLE audit_logs_legacy")
+
+
+def downgrade() -> None:
+    """Downgrade schema - volta audit_logs para uma tabela comum."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_partitioned")
+    op.execute("ALTER TABLE audit_logs_partitioned RENAME CONSTRAINT audit_logs_pkey TO audit_logs_partitioned_pkey")
+    _drop_indexes()
+    _detach_sequence("audit_logs_partitioned")
+
+    op.execute(f"""
+        CREATE TABLE audit_logs ({AUDIT_COLUMNS.replace('NOT NULL DEFAULT now()', 'DEFAULT now()')},
+            PRIMARY KEY (id)
+        )
+    """)
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id")
+    _create_indexes()
+
+    op.execute(f"""
+        INSERT INTO audit_logs ({COPY_COLUMNS}, created_at)
+        SELECT {COPY_COLUMNS}, created_at
+        FROM audit_logs_partitioned
+    """)
+    op.execute("DROP TABLE audit_logs_partitioned CASCADE")
+    op.execute("DROP FUNCTION IF EXISTS audit_logs_ensure_partitions(integer)")
+    op.execute("DROP FUNCTION IF EXISTS audit_logs_create_partition(date)")
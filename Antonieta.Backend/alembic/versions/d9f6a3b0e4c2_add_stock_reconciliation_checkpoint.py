@@ -0,0 +1,41 @@
+"""add_stock_reconciliation_checkpoint
+
+Revision ID: d9f6a3b0e4c2
+Revises: c8e5f2a9d3b1
+Create Date: 2026-10-18 21:37:44.902316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9f6a3b0e4c2'
+down_revision: Union[str, None] = 'c8e5f2a9d3b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - checkpoint da reconciliação incremental de estoque."""
+    op.create_table(
+        'stock_reconciliation_checkpoint',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('last_input_id', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_distribution_id', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_movement_id', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_run_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_drift_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    # Soma dos movimentos de cada entrada/distribuição
+    op.create_index('ix_stock_movement_kind_source', 'stock_movement', ['kind', 'source_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema - remove o checkpoint da reconciliação."""
+    op.drop_index('ix_stock_movement_kind_source', table_name='stock_movement')
+    op.drop_table('stock_reconciliation_checkpoint')
@@ -0,0 +1,51 @@
+"""add_audit_composite_indexes
+
+Revision ID: e5a2c8d1f4b7
+Revises: d4f19a7b3e62
+Create Date: 2026-10-18 15:02:37.550912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a2c8d1f4b7'
+down_revision: Union[str, None] = 'd4f19a7b3e62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Índices de coluna única cobertos pelos compostos (ou pela chave primária, no caso de id)
+REDUNDANT_INDEXES = ("entity_type", "entity_id", "user_id", "id")
+
+
+def upgrade() -> None:
+    """Upgrade schema - índices compostos para as consultas de auditoria."""
+    # Histórico de uma entidade: entity_type = ? AND entity_id = ? ORDER BY created_at DESC
+    op.create_index(
+        'ix_audit_logs_entity_created',
+        'audit_logs',
+        ['entity_type', 'entity_id', sa.text('created_at DESC')],
+        unique=False
+    )
+    # Atividade de um usuário: user_id = ? AND created_at >= ? ORDER BY created_at DESC
+    op.create_index(
+        'ix_audit_logs_user_created',
+        'audit_logs',
+        ['user_id', sa.text('created_at DESC')],
+        unique=False
+    )
+
+    for column in REDUNDANT_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS ix_audit_logs_{column}")
+
+
+def downgrade() -> None:
+    """Downgrade schema - volta aos índices de coluna única."""
+    for column in REDUNDANT_INDEXES:
+        op.create_index(f'ix_audit_logs_{column}', 'audit_logs', [column], unique=False)
+
+    op.drop_index('ix_audit_logs_user_created', table_name='audit_logs')
+    op.drop_index('ix_audit_logs_entity_created', table_name='audit_logs')
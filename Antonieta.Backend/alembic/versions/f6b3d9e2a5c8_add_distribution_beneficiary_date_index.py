@@ -0,0 +1,36 @@
+"""add_distribution_beneficiary_date_index
+
+Revision ID: f6b3d9e2a5c8
+Revises: e5a2c8d1f4b7
+Create Date: 2026-10-18 17:41:09.203518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6b3d9e2a5c8'
+down_revision: Union[str, None] = 'e5a2c8d1f4b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - índice composto para o histórico de distribuições do beneficiário."""
+    # beneficiary_id = ? AND old = false AND date BETWEEN ? AND ? ORDER BY date
+    op.create_index(
+        'ix_distribution_beneficiary_old_date',
+        'distribution',
+        ['beneficiary_id', 'old', 'date'],
+        unique=False
+    )
+    # Coberto pelo índice composto (beneficiary_id é a primeira coluna)
+    op.execute("DROP INDEX IF EXISTS ix_distribution_beneficiary_id")
+
+
+def downgrade() -> None:
+    """Downgrade schema - volta ao índice de coluna única."""
+    op.create_index('ix_distribution_beneficiary_id', 'distribution', ['beneficiary_id'], unique=False)
+    op.drop_index('ix_distribution_beneficiary_old_date', table_name='distribution')
@@ -0,0 +1,78 @@
+"""
+Script de retenção dos logs de auditoria (audit_logs particionada por mês).
+
+Cria as partições dos próximos meses e arquiva as partições mais antigas que
+o período de retenção: cada uma é exportada para CSV compactado (.csv.gz) e
+depois desanexada e removida do banco.
+
+Pode ser agendado (ex.: cron mensal). Requer PostgreSQL com a migração
+d4f19a7b3e62 aplicada.
+
+Uso:
+    python archive_audit_logs.py                       # arquiva além de AUDIT_RETENTION_MONTHS
+    python archive_audit_logs.py --retention-months 6 --output-dir /backups/audit
+    python archive_audit_logs.py --dry-run             # apenas lista o que seria arquivado
+    python archive_audit_logs.py --keep-table          # desanexa sem remover as tabelas
+"""
+
+import argparse
+import sys
+from database import get_db
+
+from services import audit_partition_service
+
+def main(args):
+    db = next(get_db())
+
+    try:
+        if not audit_partition_service.is_partitioned(db):
+            print("\n❌ audit_logs não é particionada (requer PostgreSQL com a migração aplicada).")
+            sys.exit(1)
+
+        print(f"\n🔄 Garantindo partições para os próximos {args.months_ahead} meses...")
+        audit_partition_service.ensure_partitions(db, months_ahead=args.months_ahead)
+        db.commit()
+
+        partitions = audit_partition_service.partitions_to_archive(db, retention_months=args.retention_months)
+        cutoff = audit_partition_service.retention_cutoff(args.retention_months)
+    finally:
+        db.close()
+
+    print(f"\n📊 Partições anteriores a {cutoff.strftime('%m/%Y')}: {len(partitions)}")
+    for partition in partitions:
+        print(f"  - {partition['name']}")
+
+    if not partitions:
+        print("\n✅ Nada a arquivar.")
+        return
+
+    if args.dry_run:
+        print("\n💡 Execução de teste: nenhuma partição foi alterada.")
+        return
+
+    for partition in partitions:
+        try:
+            path = audit_partition_service.archive_partition(partition["name"], args.output_dir, keep_table=args.keep_table)
+            print(f"  ✅ {partition['name']} → {path}")
+        except Exception as e:
+            print(f"  ❌ Erro ao arquivar {partition['name']}: {str(e)}")
+            sys.exit(1)
+
+    print("\n✅ Operação concluída com sucesso!")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Arquiva partições antigas de audit_logs")
+    parser.add_argument("--retention-months", type=int, default=audit_partition_service.AUDIT_RETENTION_MONTHS,
+                        help="Meses mantidos no banco (padrão: AUDIT_RETENTION_MONTHS)")
+    parser.add_argument("--months-ahead", type=int, default=audit_partition_service.AUDIT_PARTITION_MONTHS_AHEAD,
+                        help="Partições futuras a garantir")
+    parser.add_argument("--output-dir", default="audit_archive", help="Diretório dos arquivos .csv.gz")
+    parser.add_argument("--dry-run", action="store_true", help="Apenas lista, sem alterar dados")
+    parser.add_argument("--keep-table", action="store_true", help="Desanexa a partição sem remover a tabela")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🗄️  Script de Retenção de Logs de Auditoria")
+    print("=" * 60)
+
+    main(args)
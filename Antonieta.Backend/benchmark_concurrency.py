@@ -0,0 +1,118 @@
+"""
+Script de benchmark de carga: dispara requisições concorrentes contra a API
+e mede vazão (req/s) e latência (p50/p95/p99) por endpoint.
+
+Para comparar antes/depois de uma mudança, execute o servidor em cada versão
+e rode o script com os mesmos parâmetros, ex.:
+
+    uvicorn main:app --port 8000
+    python benchmark_concurrency.py --url http://localhost:8000 \\
+        --email admin@antonieta.com --password Admin@123 \\
+        --concurrency 50 --requests 1000
+
+Uso:
+    python benchmark_concurrency.py [--url URL] [--email EMAIL --password SENHA]
+                                    [--concurrency N] [--requests N]
+                                    [--endpoint PATH ...]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List, Optional
+import httpx
+
+DEFAULT_ENDPOINTS = [
+    "/dashboard/total-inputs-month",
+    "/dashboard/total-distributions-month",
+    "/dashboard/current-total-stock",
+    "/dashboard/beneficiaries-dashboard?limit=100",
+    "/beneficiary/",
+    "/ration-stock/",
+]
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Percentil simples (nearest-rank) de uma lista de latências"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> Optional[str]:
+    """Obtém um token de acesso para os endpoints autenticados"""
+    response = await client.post(
+        "/auth/token",
+        data={"username": email, "password": password, "grant_type": "password"}
+    )
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+async def run_endpoint(client: httpx.AsyncClient, endpoint: str, total: int, concurrency: int, headers: Dict[str, str]) -> dict:
+    """Executa `total` requisições com no máximo `concurrency` simultâneas"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one_request():
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await client.get(endpoint, headers=headers)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one_request() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "endpoint": endpoint,
+        "requests": total,
+        "errors": errors,
+        "elapsed": elapsed,
+        "throughput": total / elapsed if elapsed else 0.0,
+        "p50": percentile(latencies, 0.50) * 1000,
+        "p95": percentile(latencies, 0.95) * 1000,
+        "p99": percentile(latencies, 0.99) * 1000,
+        "mean": statistics.mean(latencies) * 1000 if latencies else 0.0,
+    }
+
+async def main(args):
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=60) as client:
+        headers = {}
+        if args.email and args.password:
+            token = await login(client, args.email, args.password)
+            headers["Authorization"] = f"Bearer {token}"
+
+        endpoints = args.endpoint or DEFAULT_ENDPOINTS
+        results = []
+        for endpoint in endpoints:
+            print(f"🚀 {endpoint} ({args.requests} requisições, concorrência {args.concurrency})")
+            results.append(await run_endpoint(client, endpoint, args.requests, args.concurrency, headers))
+
+    print("\n" + "=" * 100)
+    print(f"{'Endpoint':<48}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'erros':>10}")
+    print("=" * 100)
+    for result in results:
+        print(
+            f"{result['endpoint']:<48}{result['throughput']:>10.1f}{result['p50']:>10.1f}"
+            f"{result['p95']:>10.1f}{result['p99']:>10.1f}{result['errors']:>10}"
+        )
+    print("=" * 100)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de requisições concorrentes contra a API")
+    parser.add_argument("--url", default="http://localhost:8000", help="URL base da API")
+    parser.add_argument("--email", help="Email para autenticação")
+    parser.add_argument("--password", help="Senha para autenticação")
+    parser.add_argument("--concurrency", type=int, default=50, help="Requisições simultâneas")
+    parser.add_argument("--requests", type=int, default=500, help="Requisições por endpoint")
+    parser.add_argument("--endpoint", action="append", help="Endpoint a testar (pode repetir)")
+    asyncio.run(main(parser.parse_args()))
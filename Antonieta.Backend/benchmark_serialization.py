@@ -0,0 +1,118 @@
+"""
+Micro-benchmark da serialização de beneficiários, sem banco e sem servidor.
+
+Monta N objetos Beneficiary em memória (padrão: 1000) e mede, em várias
+repetições, o caminho de resposta antigo e o novo:
+
+    - antes:  jsonable_encoder (reflexão sobre o objeto do ORM) + json.dumps (JSONResponse)
+    - depois: response_model com from_attributes (pydantic-core) + orjson (ORJSONResponse)
+
+Mostra também o tamanho do corpo com e sem gzip.
+
+Uso:
+    python benchmark_serialization.py [--rows 1000] [--repeat 50]
+"""
+
+import argparse
+import gzip
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+# Importar todos os modelos para evitar problemas de referência circular
+import models.user_model  # noqa: F401
+import models.distribution_model  # noqa: F401
+import models.ration_stock_model  # noqa: F401
+import models.ration_input_model  # noqa: F401
+
+from models.beneficiary_model import Beneficiary
+from dtos.beneficiary_response_dto import beneficiary_response_dto
+
+NEIGHBORHOODS = ["Centro", "Araretama", "Cidade Nova", "Bosque", "Mombaça"]
+
+def build_rows(rows: int) -> List[Beneficiary]:
+    """Beneficiários com todas as colunas preenchidas, como após uma consulta"""
+    now = datetime(2026, 1, 1, 12, 0)
+    return [
+        Beneficiary(
+            id=n,
+            name=f"Beneficiário de Teste {n}",
+            document=f"{n:011d}",
+            street="Rua das Flores",
+            number=str(n % 500),
+            neighborhood=NEIGHBORHOODS[n % len(NEIGHBORHOODS)],
+            city="Pindamonhangaba",
+            state="SP",
+            zip_code="12400-000",
+            complement=None,
+            contact="(12) 99999-9999",
+            mother_name="Maria da Silva",
+            birth_date="1980-05-17",
+            qtd_dogs=n % 4,
+            qtd_castred_dogs=n % 2,
+            qtd_cats=n % 3,
+            qtd_castred_cats=0,
+            government_benefit=n % 2 == 0,
+            receives_basic_basket=n % 3 == 0,
+            receives_bpc_loas=False,
+            cadunico_code=f"{n:014d}",
+            income_range="Até 1/2 salário mínimo per capita",
+            how_did_you_hear="Indicação de vizinho",
+            observations="Observação de teste",
+            old=False,
+            created_by=1,
+            updated_by=None,
+            created_at=now - timedelta(days=n),
+            updated_at=now
+        )
+        for n in range(1, rows + 1)
+    ]
+
+def before(rows: List[Beneficiary]) -> bytes:
+    """Caminho sem response_model: jsonable_encoder + JSONResponse"""
+    content = jsonable_encoder(rows)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+adapter = TypeAdapter(List[beneficiary_response_dto])
+
+def after(rows: List[Beneficiary]) -> bytes:
+    """Caminho com response_model: validação from_attributes + dump JSON + ORJSONResponse"""
+    content = adapter.dump_python(adapter.validate_python(rows, from_attributes=True), mode="json")
+    return orjson.dumps(content)
+
+def measure(label: str, serialize: Callable[[List[Beneficiary]], bytes], rows: List[Beneficiary], repeat: int) -> float:
+    serialize(rows)  # aquecimento
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = serialize(rows)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    median = statistics.median(timings)
+    print(f"  {label:<8} mediana {median:8.2f} ms | mín {min(timings):8.2f} ms | "
+          f"{len(body) / 1024:7.1f} KiB | gzip {len(gzip.compress(body, 6)) / 1024:6.1f} KiB")
+    return median
+
+def main(rows: int, repeat: int):
+    data = build_rows(rows)
+    print(f"\n📊 Serialização de {rows} beneficiários ({repeat} repetições):")
+    old = measure("antes", before, data, repeat)
+    new = measure("depois", after, data, repeat)
+    print(f"\n✅ Ganho: {old / new:.1f}x mais rápido")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Micro-benchmark da serialização de beneficiários")
+    parser.add_argument("--rows", type=int, default=1000, help="Quantidade de beneficiários")
+    parser.add_argument("--repeat", type=int, default=50, help="Repetições por caminho")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("⏱️  Benchmark de Serialização")
+    print("=" * 60)
+
+    main(args.rows, args.repeat)
@@ -0,0 +1,59 @@
+"""
+Verificação do índice de trigramas em memória da busca de beneficiários
+(usado quando o banco não é PostgreSQL).
+
+Indexa beneficiários fictícios, sem acessar o banco, e confere que um
+termo é encontrado em qualquer posição do documento: primeira palavra,
+outra palavra, outro campo, prefixo e meio de palavra, ignorando acentos
+e maiúsculas. Sai com código 2 se alguma busca falhar.
+
+Uso:
+    python check_beneficiary_search.py
+"""
+
+import sys
+from types import SimpleNamespace
+from services.beneficiary_search_service import BeneficiarySearchIndex, normalize_search_text
+
+BENEFICIARIES = [
+    SimpleNamespace(id=1, name="Maria da Silva", document="111.222.333-44", contact="(12) 99999-0001", neighborhood="Jardim Araretama"),
+    SimpleNamespace(id=2, name="José Árvore Santos", document="555.666.777-88", contact=None, neighborhood="Centro"),
+    SimpleNamespace(id=3, name="Ana Costa", document="999.888.777-66", contact="(12) 98888-0002", neighborhood="Vila Industrial"),
+]
+
+# (termo, ids esperados em ordem de relevância)
+CASES = [
+    ("maria", [1]),           # primeira palavra
+    ("silva", [1]),           # palavra que não é a primeira
+    ("arvore", [2]),          # sem acento, no meio do nome
+    ("Araret", [1]),          # prefixo, em outro campo (bairro)
+    ("dustri", [3]),          # meio de palavra
+    ("da silva", [1]),        # mais de uma palavra
+    ("silva 111", [1]),       # atravessa campos (nome e documento)
+    ("an", [3, 2]),           # termo curto (sem trigramas): varredura
+    ("souza", []),            # inexistente
+]
+
+def main() -> int:
+    index = BeneficiarySearchIndex()
+    index.load(BENEFICIARIES)
+
+    print("=" * 60)
+    print("🔍 Busca de beneficiários (índice em memória)")
+    print("=" * 60)
+
+    failures = 0
+    for term, expected in CASES:
+        found = index.search(None, normalize_search_text(term))
+        ok = found == expected
+        failures += not ok
+        print(f"  {'✅' if ok else '❌'} {term!r}: {found} (esperado {expected})")
+
+    if failures:
+        print(f"\n❌ {failures} busca(s) com resultado inesperado.")
+        return 2
+    print("\n✅ Todas as buscas retornaram o esperado.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+Verificação das datas enviadas pelo frontend nas escritas de distribuição
+e entrada de ração.
+
+O frontend envia datas com fuso (toISOString: "...Z"), mas as colunas
+date de distribution e ration_input são DateTime sem timezone e o asyncpg
+recusa datas com fuso nelas. Em um banco SQLite temporário (que descarta
+o fuso em silêncio), envia entradas e distribuições pela API com datas
+"...Z" e "-03:00" e confere que:
+
+    - as requisições são aceitas;
+    - a data gravada chega ao banco sem fuso, convertida para UTC (o que o
+      asyncpg exige no PostgreSQL);
+    - a resposta devolve a data em UTC.
+
+Sai com código 2 se alguma verificação falhar.
+
+Uso:
+    python check_request_dates.py
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import datetime
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from database import Base, get_async_db
+
+# Importar todos os modelos para evitar problemas de referência circular
+import models.user_model  # noqa: F401
+import models.audit_log_model  # noqa: F401
+import models.monthly_rollup_model  # noqa: F401
+import models.stock_movement_model  # noqa: F401
+
+from models.beneficiary_model import Beneficiary
+from models.ration_stock_model import RationStock
+from controllers.distribution_controller import router as distribution_router
+from controllers.ration_input_controller import router as ration_input_router
+
+# Tabelas com a coluna date sem timezone
+NAIVE_DATE_TABLES = ("distribution", "ration_input")
+
+failures = 0
+
+def check(description: str, ok: bool, detail: str = "") -> None:
+    global failures
+    failures += not ok
+    print(f"  {'✅' if ok else '❌'} {description}{f' ({detail})' if detail and not ok else ''}")
+
+def main() -> int:
+    path = os.path.join(tempfile.mkdtemp(), "dates.db")
+    sync_engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(sync_engine)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    # Datas com fuso enviadas ao banco nas escritas das tabelas sem timezone
+    aware_parameters = []
+
+    @event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        head = statement.lstrip().split("(")[0].lower()
+        if head.startswith(("insert", "update")) and any(f" {table}" in head for table in NAIVE_DATE_TABLES):
+            # Valores antes da conversão do driver (o SQLite grava datas como texto)
+            aware_parameters.extend(
+                value for row in context.compiled_parameters for value in row.values()
+                if isinstance(value, datetime) and value.tzinfo is not None
+            )
+
+    with Session(sync_engine) as db:
+        ration_stock = RationStock(name="Ração teste", description="Verificação", unit="kg", stock=0)
+        beneficiary = Beneficiary(
+            name="Beneficiário teste", document="00000000", contact="00000000",
+            street="Rua de teste", neighborhood="Centro"
+        )
+        db.add_all([ration_stock, beneficiary])
+        db.commit()
+        ration_stock_id, beneficiary_id = ration_stock.id, beneficiary.id
+
+    async def get_test_db():
+        async with AsyncSession(async_engine, expire_on_commit=False) as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(distribution_router)
+    app.include_router(ration_input_router)
+    app.dependency_overrides[get_async_db] = get_test_db
+
+    print("=" * 60)
+    print("🕒 Datas com fuso nas escritas do frontend")
+    print("=" * 60)
+
+    try:
+        with TestClient(app) as client:
+            print("\n🔹 Entrada de ração")
+            response = client.post("/ration-input/", json={
+                "ration_stock_id": ration_stock_id, "amount": 100,
+                "date": "2024-05-10T03:00:00.000Z", "description": "Entrada"
+            })
+            check("POST com data '...Z' aceito", response.status_code == 200, response.text)
+            input_id = response.json().get("id")
+            check("data devolvida em UTC", response.json().get("date") == "2024-05-10T03:00:00", response.text)
+
+            response = client.put(f"/ration-input/{input_id}", json={
+                "id": input_id, "ration_stock_id": ration_stock_id, "amount": 120,
+                "date": "2024-05-11T00:00:00-03:00", "description": "Entrada corrigida"
+            })
+            check("PUT com data '-03:00' aceito", response.status_code == 200, response.text)
+            check("data convertida para UTC", response.json().get("date") == "2024-05-11T03:00:00", response.text)
+
+            print("\n🔹 Distribuição")
+            response = client.post("/distribution/", json={
+                "ration_id": ration_stock_id, "beneficiary_id": beneficiary_id, "amount": 10,
+                "date": "2024-05-12T03:00:00.000Z"
+            })
+            check("POST com data '...Z' aceito", response.status_code == 200, response.text)
+            distribution_id = response.json().get("id")
+            check("data devolvida em UTC", response.json().get("date") == "2024-05-12T03:00:00", response.text)
+
+            response = client.put("/distribution/", json={
+                "id": distribution_id, "ration_id": ration_stock_id, "beneficiary_id": beneficiary_id,
+                "amount": 15, "date": "2024-05-13T00:00:00-03:00"
+            })
+            check("PUT com data '-03:00' aceito", response.status_code == 200, response.text)
+            check("data convertida para UTC", response.json().get("date") == "2024-05-13T03:00:00", response.text)
+
+            response = client.post("/distribution/bulk", json={"items": [
+                {"ration_id": ration_stock_id, "beneficiary_id": beneficiary_id, "amount": 5,
+                 "date": "2024-05-14T03:00:00.000Z"},
+                {"ration_id": ration_stock_id, "beneficiary_id": beneficiary_id, "amount": 5,
+                 "date": "2024-05-14T12:00:00+00:00"},
+            ]})
+            check("lote com datas com fuso aceito", response.status_code == 200, response.text)
+
+        print("\n🔹 Parâmetros enviados ao banco")
+        check("nenhuma data com fuso nas colunas sem timezone", not aware_parameters, f"{aware_parameters}")
+    finally:
+        asyncio.run(async_engine.dispose())
+        sync_engine.dispose()
+        os.remove(path)
+
+    if failures:
+        print(f"\n❌ {failures} verificação(ões) falharam.")
+        return 2
+    print("\n✅ Datas com fuso normalizadas para UTC sem fuso.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
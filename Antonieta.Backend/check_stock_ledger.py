@@ -0,0 +1,158 @@
+"""
+Verificação da linha do tempo do livro-razão de estoque (stock_movement).
+
+Em um banco SQLite temporário (não usa DATABASE_URL), registra uma entrada
+e uma distribuição com datas retroativas pelos serviços da API e confere
+que:
+
+    - recorded_at é o momento do registro e reference_date a data
+      informada;
+    - o saldo em um instante (stock-as-of) só inclui o que já estava
+      registrado naquele instante, mesmo com data retroativa;
+    - rebuild_ledger (mesma consulta do preenchimento na migração) produz
+      os mesmos movimentos e saldos, na mesma linha do tempo.
+
+Sai com código 2 se alguma verificação falhar.
+
+Uso:
+    python check_stock_ledger.py
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from database import Base
+
+# Importar todos os modelos para evitar problemas de referência circular
+import models.user_model  # noqa: F401
+import models.beneficiary_model  # noqa: F401
+import models.audit_log_model  # noqa: F401
+import models.monthly_rollup_model  # noqa: F401
+
+from models.beneficiary_model import Beneficiary
+from models.distribution_model import Distribution
+from models.ration_input_model import RationInput
+from models.ration_stock_model import RationStock
+from models.stock_movement_model import StockMovement
+from dtos.create_distribution_dto import create_distribution_dto
+from dtos.create_ration_input_dto import create_ration_input_dto
+from services.distribution_services import create_distribution_service
+from services.ration_input_services import create_ration_input_service
+from services.stock_ledger_service import get_stock_as_of_service, rebuild_ledger
+
+BUSINESS_INPUT_DATE = datetime(2020, 1, 10)
+BUSINESS_DISTRIBUTION_DATE = datetime(2020, 1, 15)
+
+failures = 0
+
+def check(description: str, ok: bool, detail: str = "") -> None:
+    global failures
+    failures += not ok
+    print(f"  {'✅' if ok else '❌'} {description}{f' ({detail})' if detail and not ok else ''}")
+
+def as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+async def ledger(db: AsyncSession, ration_stock_id: int) -> list:
+    return (await db.execute(
+        select(StockMovement).where(StockMovement.ration_stock_id == ration_stock_id).order_by(StockMovement.sequence)
+    )).scalars().all()
+
+async def stock_at(db: AsyncSession, ration_stock_id: int, at: datetime) -> float:
+    return (await get_stock_as_of_service(db, ration_stock_id, at))["stock"]
+
+async def main() -> int:
+    path = os.path.join(tempfile.mkdtemp(), "ledger.db")
+    sync_engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(sync_engine)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    print("=" * 60)
+    print("📒 Linha do tempo do livro-razão de estoque")
+    print("=" * 60)
+
+    try:
+        async with AsyncSession(async_engine, expire_on_commit=False) as db:
+            ration_stock = RationStock(name="Ração teste", description="Verificação", unit="kg", stock=0)
+            beneficiary = Beneficiary(
+                name="Beneficiário teste", document="00000000", contact="00000000",
+                street="Rua de teste", neighborhood="Centro"
+            )
+            db.add_all([ration_stock, beneficiary])
+            await db.commit()
+            ration_stock_id = ration_stock.id
+
+            await create_ration_input_service(db, create_ration_input_dto(
+                ration_stock_id=ration_stock_id, amount=100, date=BUSINESS_INPUT_DATE, description="Entrada retroativa"
+            ))
+            # created_at (CURRENT_TIMESTAMP) tem resolução de segundos no SQLite
+            time.sleep(1.1)
+            between = datetime.now(timezone.utc)
+            time.sleep(1.1)
+            distribution = await create_distribution_service(db, create_distribution_dto(
+                ration_id=ration_stock_id, beneficiary_id=beneficiary.id, amount=30, date=BUSINESS_DISTRIBUTION_DATE
+            ))
+            after = datetime.now(timezone.utc)
+
+            live = await ledger(db, ration_stock_id)
+            print("\n🔹 Movimentos gravados pelo motor de estoque")
+            check("entrada e distribuição registradas", [m.kind for m in live] == ["input", "distribution"])
+            check("reference_date é a data informada",
+                  [m.reference_date for m in live] == [BUSINESS_INPUT_DATE, BUSINESS_DISTRIBUTION_DATE])
+            check("recorded_at é o momento do registro",
+                  as_utc(live[0].recorded_at) <= between <= as_utc(live[1].recorded_at))
+            check("recorded_at acompanha a sequência",
+                  all(as_utc(a.recorded_at) <= as_utc(b.recorded_at) for a, b in zip(live, live[1:])))
+            check("saldo na data retroativa ainda não inclui os lançamentos",
+                  await stock_at(db, ration_stock_id, datetime(2020, 2, 1)) == 0)
+            check("saldo entre os registros inclui só a entrada", await stock_at(db, ration_stock_id, between) == 100)
+            check("saldo após os registros inclui a distribuição", await stock_at(db, ration_stock_id, after) == 70)
+
+            live_rows = [(m.kind, m.source_id, m.delta, m.balance, m.reference_date) for m in live]
+            sources = {
+                ("input", row.id): row.created_at
+                for row in (await db.execute(select(RationInput))).scalars()
+            }
+            sources.update({
+                ("distribution", row.id): row.created_at
+                for row in (await db.execute(select(Distribution))).scalars()
+            })
+
+            print("\n🔹 Reconstrução a partir do histórico (rebuild_ledger)")
+            await db.commit()
+            with Session(sync_engine) as sync_db:
+                rebuild_ledger(sync_db)
+                sync_db.commit()
+            db.expire_all()
+
+            rebuilt = await ledger(db, ration_stock_id)
+            rebuilt_rows = [(m.kind, m.source_id, m.delta, m.balance, m.reference_date) for m in rebuilt]
+            # A ração começou com estoque 0: a abertura reconstruída tem delta 0
+            check("abertura sem saldo inicial", rebuilt_rows[0][0] == "opening" and rebuilt_rows[0][2] == 0)
+            check("mesmos movimentos e saldos", rebuilt_rows[1:] == live_rows, f"{rebuilt_rows[1:]} != {live_rows}")
+            check("recorded_at reconstruído é o created_at da origem",
+                  all(as_utc(m.recorded_at) == as_utc(sources[(m.kind, m.source_id)]) for m in rebuilt[1:]))
+            check("saldo na data retroativa continua sem os lançamentos",
+                  await stock_at(db, ration_stock_id, datetime(2020, 2, 1)) == 0)
+            check("saldo entre os registros continua 100", await stock_at(db, ration_stock_id, between) == 100)
+            check("saldo após os registros continua 70", await stock_at(db, ration_stock_id, after) == 70)
+            check("distribuição no livro-razão reconstruído", distribution["id"] == rebuilt[-1].source_id)
+    finally:
+        await async_engine.dispose()
+        sync_engine.dispose()
+        os.remove(path)
+
+    if failures:
+        print(f"\n❌ {failures} verificação(ões) falharam.")
+        return 2
+    print("\n✅ Livro-razão consistente nas duas origens.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
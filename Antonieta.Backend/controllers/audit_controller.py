@@ -1,12 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Union
 from datetime import datetime
 from database import get_db
 from models.user_model import User
 from models.audit_log_model import AuditLog
 from services.auth_service import get_current_user
 from services.audit_service import AuditService
+from services.pagination import InvalidCursorError, CountMode
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/audit", tags=["audit"])
@@ -29,6 +30,13 @@ class AuditLogResponse(BaseModel):
         from_attributes = True
 
 
+class AuditLogPageResponse(BaseModel):
+    items: List[AuditLogResponse]
+    next_cursor: Optional[str]
+    limit: int
+    total: Optional[int]
+
+
 def check_admin_permission(current_user: User):
     """Verifica se o usuário atual é administrador"""
     if current_user.role != "administrador":
@@ -38,7 +46,7 @@ def check_admin_permission(current_user: User):
         )
 
 
-@router.get("/logs", response_model=List[AuditLogResponse])
+@router.get("/logs", response_model=Union[List[AuditLogResponse], AuditLogPageResponse])
 async def get_audit_logs(
     user_id: Optional[int] = Query(None, description="Filtrar por ID do usuário"),
     entity_type: Optional[str] = Query(None, description="Filtrar por tipo de entidade (User, Beneficiary, etc.)"),
@@ -48,14 +56,34 @@ async def get_audit_logs(
     end_date: Optional[datetime] = Query(None, description="Data final (ISO format)"),
     limit: int = Query(100, ge=1, le=1000, description="Limite de registros"),
     offset: int = Query(0, ge=0, description="Offset para paginação"),
+    after: Optional[str] = Query(None, description="Cursor da página anterior; ativa a paginação por cursor (vazio para a primeira página)"),
+    count: CountMode = Query("none", description="Contagem total no modo cursor: none, exact ou estimated"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Obter logs de auditoria com filtros (apenas para administradores)
+    Obter logs de auditoria com filtros (apenas para administradores).
+    Com o parâmetro `after`, usa paginação por cursor em vez de offset.
     """
     check_admin_permission(current_user)
     
+    if after is not None:
+        try:
+            return AuditService.get_logs_page(
+                db=db,
+                user_id=user_id,
+                entity_type=entity_type,
+                entity_id=entity_id,
+                action=action,
+                start_date=start_date,
+                end_date=end_date,
+                after=after,
+                limit=limit,
+                count=count
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
     logs = AuditService.get_logs(
         db=db,
         user_id=user_id,
@@ -12,6 +12,8 @@ from services.auth_service import (
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
 from services.audit_helper import AuditHelper
+from services.password_hasher import PasswordHasherBusyError
+from services.login_limiter import login_limiter, LoginThrottledError
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -23,7 +25,25 @@ async def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid grant_type. Must be 'password'"
         )
-    user = authenticate_user(db, form_data.username, form_data.password)
+    # Limite de tentativas por IP e por usuário, antes de verificar a senha
+    client_info = AuditHelper.get_client_info(request)
+    try:
+        await login_limiter.check(client_info["ip_address"], form_data.username, client_info["user_agent"])
+    except LoginThrottledError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Muitas tentativas de login. Tente novamente mais tarde",
+            headers={"Retry-After": str(int(e.retry_after) + 1)},
+        )
+
+    try:
+        user = await authenticate_user(db, form_data.username, form_data.password)
+    except PasswordHasherBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Servidor ocupado, tente novamente em instantes",
+            headers={"Retry-After": "1"},
+        )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -31,6 +51,8 @@ async def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    await login_limiter.reset_username(form_data.username)
+
     # Registrar login bem-sucedido
     AuditHelper.log_login(db, request, user, success=True)
     
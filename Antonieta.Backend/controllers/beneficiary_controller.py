@@ -1,7 +1,13 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import List, Optional, Tuple, Union
+from datetime import date
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db
 import logging
 from services.beneficiary_services import (
     get_all_beneficiaries_service, 
+    get_beneficiaries_page_service, 
     get_beneficiary_by_id_service, 
     create_beneficiary_service, 
     update_beneficiary_service, 
@@ -9,23 +15,60 @@ from services.beneficiary_services import (
 )
 from dtos.update_beneficiary_dto import update_beneficiary_dto
 from dtos.create_beneficiary_dto import create_beneficiary_dto
+from services.beneficiary_search_service import search_beneficiaries_service
+from services.export_service import stream_beneficiaries_csv, export_filename, OldFilter
+from services.pagination import InvalidCursorError, CountMode, DEFAULT_PAGE_SIZE
 from sqlalchemy.exc import IntegrityError
+from services.etag_service import conditional_get
+from services.cache_service import TABLE_BENEFICIARY
+from dtos.beneficiary_response_dto import beneficiary_response_dto, beneficiary_page_dto, BENEFICIARY_FIELDS, BENEFICIARY_FIELD_PRESETS
+from services.field_selection import parse_fields, InvalidFieldsError
+from services.period import Period, InvalidPeriodError
+from services.distribution_services import get_beneficiary_distributions_service
+from dtos.beneficiary_history_dto import beneficiary_history_dto
 
 # Configurar logger específico para o controller
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/beneficiary", tags=["Beneficiary"])
 
-@router.get("/")
-async def get_all_beneficiaries():
+@router.get(
+    "/",
+    response_model=Union[beneficiary_page_dto, Tuple[List[beneficiary_response_dto], int]],
+    response_model_exclude_unset=True,
+    dependencies=[Depends(conditional_get(TABLE_BENEFICIARY))]
+)
+async def get_all_beneficiaries(
+    db: AsyncSession = Depends(get_async_db),
+    after: Optional[str] = Query(None, description="Cursor da página anterior; ativa a paginação por cursor (vazio para a primeira página)"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=1000, description="Itens por página (modo cursor)"),
+    count: CountMode = Query("none", description="Contagem total no modo cursor: none, exact ou estimated"),
+    fields: Optional[str] = Query(None, description="Campos separados por vírgula, ou 'list' para o resumo BeneficiaryListItem")
+):
     """
-    Retorna todos os beneficiários cadastrados
+    Retorna todos os beneficiários cadastrados.
+    Com o parâmetro `after`, retorna uma página por cursor com `next_cursor`.
+    Com `fields`, consulta e retorna apenas as colunas pedidas (o id sempre vem).
     """
     try:
+        selected = parse_fields(fields, BENEFICIARY_FIELDS, BENEFICIARY_FIELD_PRESETS)
+
+        if after is not None:
+            logger.info(f"Buscando página de beneficiários por cursor (limit={limit})")
+            page = await get_beneficiaries_page_service(db, after=after, limit=limit, count=count, fields=selected)
+            logger.info(f"Busca concluída. Encontrados {len(page['items'])} beneficiários")
+            return page
+        
         logger.info("Iniciando busca de todos os beneficiários")
-        result = await get_all_beneficiaries_service()
+        result = await get_all_beneficiaries_service(db, fields=selected)
         logger.info(f"Busca concluída. Encontrados {len(result[0])} beneficiários")
         return result
+    except (InvalidCursorError, InvalidFieldsError) as e:
+        logger.warning(f"Parâmetros inválidos na busca de beneficiários: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Erro ao buscar beneficiários: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -33,14 +76,60 @@ async def get_all_beneficiaries():
             detail="Erro interno do servidor ao buscar beneficiários"
         )
 
-@router.get("/{beneficiary_id}")
-async def get_beneficiary_by_id(beneficiary_id: int):
+@router.get("/search")
+async def search_beneficiaries(
+    db: AsyncSession = Depends(get_async_db),
+    q: str = Query(..., min_length=1, max_length=100, description="Termo de busca (nome, documento, contato ou bairro)"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100)
+):
+    """
+    Busca beneficiários por nome, documento, contato ou bairro,
+    ignorando acentos e maiúsculas/minúsculas, com resultados ordenados por relevância
+    """
+    try:
+        logger.info(f"Buscando beneficiários pelo termo: {q}")
+        result = await search_beneficiaries_service(db, q=q, skip=skip, limit=limit)
+        logger.info(f"Busca concluída. {result['total']} beneficiários encontrados")
+        return result
+    except Exception as e:
+        logger.error(f"Erro ao buscar beneficiários pelo termo {q}: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno do servidor ao buscar beneficiários"
+        )
+
+@router.get("/export")
+async def export_beneficiaries(
+    date_from: Optional[date] = Query(None, description="Data inicial (inclusiva)"),
+    date_to: Optional[date] = Query(None, description="Data final (inclusiva)"),
+    neighborhood: Optional[str] = Query(None, max_length=100, description="Bairro do beneficiário"),
+    old: OldFilter = Query("false", description="Registros antigos: false (atuais), true (antigos) ou all")
+):
+    """
+    Exporta os beneficiários em CSV, transmitido em lotes (sem limite de linhas).
+    O intervalo de datas se aplica à data de cadastro.
+    """
+    try:
+        Period.between(date_from, date_to)
+    except InvalidPeriodError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    logger.info(f"Exportando beneficiários (de={date_from}, até={date_to}, bairro={neighborhood}, old={old})")
+    return StreamingResponse(
+        stream_beneficiaries_csv(date_from=date_from, date_to=date_to, neighborhood=neighborhood, old=old),
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{export_filename("beneficiarios")}"'}
+    )
+
+@router.get("/{beneficiary_id}", response_model=Optional[beneficiary_response_dto])
+async def get_beneficiary_by_id(beneficiary_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Retorna um beneficiário específico pelo ID
     """
     try:
         logger.info(f"Buscando beneficiário com ID: {beneficiary_id}")
-        beneficiary = await get_beneficiary_by_id_service(beneficiary_id=beneficiary_id)
+        beneficiary = await get_beneficiary_by_id_service(db, beneficiary_id=beneficiary_id)
         
         if not beneficiary:
             logger.warning(f"Beneficiário com ID {beneficiary_id} não encontrado")
@@ -60,8 +149,52 @@ async def get_beneficiary_by_id(beneficiary_id: int):
             detail="Erro interno do servidor ao buscar beneficiário"
         )
 
-@router.post("/")
-async def create_beneficiary(beneficiary_dto: create_beneficiary_dto):
+@router.get("/{beneficiary_id}/distributions", response_model=beneficiary_history_dto)
+async def get_beneficiary_distributions(
+    beneficiary_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    date_from: Optional[date] = Query(None, alias="from", description="Data inicial (inclusiva)"),
+    date_to: Optional[date] = Query(None, alias="to", description="Data final (inclusiva)"),
+    cursor: Optional[str] = Query(None, description="Cursor da página anterior (next_cursor)"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=1000)
+):
+    """
+    Retorna o histórico de distribuições de um beneficiário no período,
+    com total acumulado por item, subtotais mensais e total do período
+    """
+    try:
+        beneficiary = await get_beneficiary_by_id_service(db, beneficiary_id=beneficiary_id)
+        if not beneficiary:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Beneficiário com ID {beneficiary_id} não encontrado"
+            )
+
+        return await get_beneficiary_distributions_service(
+            db,
+            beneficiary_id=beneficiary_id,
+            date_from=date_from,
+            date_to=date_to,
+            after=cursor,
+            limit=limit
+        )
+    except HTTPException:
+        raise
+    except (InvalidCursorError, InvalidPeriodError) as e:
+        logger.warning(f"Parâmetros inválidos no histórico do beneficiário ID {beneficiary_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Erro ao buscar distribuições do beneficiário ID {beneficiary_id}: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno do servidor ao buscar distribuições do beneficiário"
+        )
+
+@router.post("/", response_model=beneficiary_response_dto)
+async def create_beneficiary(beneficiary_dto: create_beneficiary_dto, db: AsyncSession = Depends(get_async_db)):
     """
     Cria um novo beneficiário
     """
@@ -69,7 +202,7 @@ async def create_beneficiary(beneficiary_dto: create_beneficiary_dto):
         logger.info(f"Iniciando criação de novo beneficiário: {beneficiary_dto.name}")
         logger.debug(f"Dados recebidos: {beneficiary_dto.model_dump_json()}")
         
-        new_beneficiary = await create_beneficiary_service(beneficiary_dto=beneficiary_dto)
+        new_beneficiary = await create_beneficiary_service(db, beneficiary_dto=beneficiary_dto)
         
         logger.info(f"Beneficiário criado com sucesso - ID: {new_beneficiary.id}, Nome: {new_beneficiary.name}")
         return new_beneficiary
@@ -99,8 +232,8 @@ async def create_beneficiary(beneficiary_dto: create_beneficiary_dto):
             detail="Erro interno do servidor ao criar beneficiário"
         )
 
-@router.put("/")
-async def update_beneficiary(beneficiary_dto: update_beneficiary_dto):
+@router.put("/", response_model=Optional[beneficiary_response_dto])
+async def update_beneficiary(beneficiary_dto: update_beneficiary_dto, db: AsyncSession = Depends(get_async_db)):
     """
     Atualiza um beneficiário existente
     """
@@ -108,7 +241,7 @@ async def update_beneficiary(beneficiary_dto: update_beneficiary_dto):
         logger.info(f"Iniciando atualização do beneficiário ID: {beneficiary_dto.id}")
         logger.debug(f"Dados recebidos: {beneficiary_dto.model_dump_json()}")
         
-        updated_beneficiary = await update_beneficiary_service(beneficiary_dto=beneficiary_dto)
+        updated_beneficiary = await update_beneficiary_service(db, beneficiary_dto=beneficiary_dto)
         
         if not updated_beneficiary:
             logger.warning(f"Beneficiário com ID {beneficiary_dto.id} não encontrado para atualização")
@@ -148,14 +281,14 @@ async def update_beneficiary(beneficiary_dto: update_beneficiary_dto):
         )
 
 @router.delete("/{beneficiary_id}")
-async def delete_beneficiary(beneficiary_id: int):
+async def delete_beneficiary(beneficiary_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Deleta um beneficiário
     """
     try:
         logger.info(f"Iniciando deleção do beneficiário ID: {beneficiary_id}")
         
-        success = await delete_beneficiary_service(beneficiary_id=beneficiary_id)
+        success = await delete_beneficiary_service(db, beneficiary_id=beneficiary_id)
         
         if not success:
             logger.warning(f"Beneficiário com ID {beneficiary_id} não encontrado para deleção")
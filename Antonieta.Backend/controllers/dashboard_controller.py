@@ -1,40 +1,69 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db
 from services.dashboard_service import DashboardService
-from typing import List
+from typing import Literal, Optional
+from datetime import date
+from services.period import PeriodKind, InvalidPeriodError, resolve_period
+from services.etag_service import conditional_get
+from services.cache_service import TABLE_BENEFICIARY, TABLE_DISTRIBUTION, TABLE_RATION_INPUT, TABLE_RATION_STOCK
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
-@router.get("/total-inputs-month")
-async def get_total_inputs_month(db: Session = Depends(get_db)):
+@router.get("/total-inputs-month", dependencies=[Depends(conditional_get(TABLE_RATION_INPUT, daily=True))])
+async def get_total_inputs_month(db: AsyncSession = Depends(get_async_db)):
     try:
         dashboard_service = DashboardService(db)
-        return dashboard_service.get_total_inputs_month()
+        return await dashboard_service.get_total_inputs_month()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/total-distributions-month")
-async def get_total_distributions_month(db: Session = Depends(get_db)):
+@router.get("/total-distributions-month", dependencies=[Depends(conditional_get(TABLE_DISTRIBUTION, daily=True))])
+async def get_total_distributions_month(db: AsyncSession = Depends(get_async_db)):
     try:
         dashboard_service = DashboardService(db)
-        return dashboard_service.get_total_distributions_month()
+        return await dashboard_service.get_total_distributions_month()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
-@router.get("/current-total-stock")
-async def get_current_total_stock(db: Session = Depends(get_db)):
+@router.get("/current-total-stock", dependencies=[Depends(conditional_get(TABLE_RATION_STOCK))])
+async def get_current_total_stock(db: AsyncSession = Depends(get_async_db)):
     try:
         dashboard_service = DashboardService(db)
-        return dashboard_service.get_current_total_stock()
+        return await dashboard_service.get_current_total_stock()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/beneficiaries-dashboard")
+@router.get("/period-totals", dependencies=[Depends(conditional_get(TABLE_DISTRIBUTION, TABLE_RATION_INPUT, daily=True))])
+async def get_period_totals(
+    db: AsyncSession = Depends(get_async_db),
+    period: PeriodKind = Query("month", description="month, quarter, last_days ou custom"),
+    days: Optional[int] = Query(None, ge=1, le=3660, description="Quantidade de dias (period=last_days)"),
+    date_from: Optional[date] = Query(None, alias="from", description="Data inicial inclusiva (period=custom)"),
+    date_to: Optional[date] = Query(None, alias="to", description="Data final inclusiva (period=custom)")
+):
+    """
+    Retorna os totais distribuídos e de entradas no período
+    (start inclusivo, end exclusivo)
+    """
+    try:
+        selected = resolve_period(period, days=days, date_from=date_from, date_to=date_to)
+    except InvalidPeriodError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        dashboard_service = DashboardService(db)
+        return await dashboard_service.get_period_totals(selected)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/beneficiaries-dashboard", dependencies=[Depends(conditional_get(TABLE_BENEFICIARY, TABLE_DISTRIBUTION, daily=True))])
 async def get_beneficiaries_dashboard(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     skip: int = 0,
-    limit: int = 10
+    limit: int = 10,
+    sort_by: Literal["id", "nome", "recebido_mes"] = "id",
+    sort_order: Literal["asc", "desc"] = "asc"
 ):
     """
     Retorna dados consolidados dos beneficiários para o dashboard
@@ -42,15 +71,24 @@ async def get_beneficiaries_dashboard(
     Args:
         skip: Número de registros para pular (offset)
         limit: Número máximo de registros para retornar
+        sort_by: Campo de ordenação (id, nome ou recebido_mes)
+        sort_order: Direção da ordenação (asc ou desc)
     """
     try:
         dashboard_service = DashboardService(db)
-        data, total = dashboard_service.get_beneficiaries_dashboard(skip=skip, limit=limit)
+        data, total = await dashboard_service.get_beneficiaries_dashboard(
+            skip=skip,
+            limit=limit,
+            sort_by=sort_by,
+            sort_order=sort_order
+        )
         return {
             "data": data,
             "total": total,
             "skip": skip,
-            "limit": limit
+            "limit": limit,
+            "sort_by": sort_by,
+            "sort_order": sort_order
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
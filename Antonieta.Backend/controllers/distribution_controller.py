@@ -1,26 +1,86 @@
-from fastapi import APIRouter
-from services.distribution_services import get_all_distribution_service, get_distribution_by_id_service, create_distribution_service, update_distribution_service, delete_distribution_service
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional, Tuple, Union
+from datetime import date
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db
+from services.distribution_services import get_all_distribution_service, get_distribution_page_service, get_distribution_by_id_service, create_distribution_service, create_distribution_bulk_service, update_distribution_service, delete_distribution_service
 from dtos.update_distribution_dto import update_distribution_dto
 from dtos.create_distribution_dto import create_distribution_dto
+from dtos.create_distribution_bulk_dto import create_distribution_bulk_dto
+from services.export_service import stream_distributions_csv, export_filename, OldFilter
+from services.pagination import InvalidCursorError, CountMode, DEFAULT_PAGE_SIZE
+from services.etag_service import conditional_get
+from services.cache_service import TABLE_BENEFICIARY, TABLE_DISTRIBUTION, TABLE_RATION_STOCK
+from dtos.distribution_response_dto import distribution_response_dto, distribution_page_dto, DISTRIBUTION_FIELDS, DISTRIBUTION_FIELD_PRESETS
+from services.field_selection import parse_fields, InvalidFieldsError
+from services.period import Period, InvalidPeriodError
 
 router = APIRouter(prefix="/distribution", tags=["distribution"])
 
-@router.get("/")
-async def get_all_distribution():
-    return await get_all_distribution_service()
+@router.get(
+    "/",
+    response_model=Union[distribution_page_dto, Tuple[List[distribution_response_dto], int]],
+    response_model_exclude_unset=True,
+    dependencies=[Depends(conditional_get(TABLE_DISTRIBUTION, TABLE_BENEFICIARY, TABLE_RATION_STOCK))]
+)
+async def get_all_distribution(
+    db: AsyncSession = Depends(get_async_db),
+    after: Optional[str] = Query(None, description="Cursor da página anterior; ativa a paginação por cursor"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=1000),
+    count: CountMode = Query("none"),
+    fields: Optional[str] = Query(None, description="Campos separados por vírgula, ou 'list' para o resumo DistributionListItem")
+):
+    try:
+        selected = parse_fields(fields, DISTRIBUTION_FIELDS, DISTRIBUTION_FIELD_PRESETS)
+        if after is not None:
+            return await get_distribution_page_service(db, after=after, limit=limit, count=count, fields=selected)
+    except (InvalidCursorError, InvalidFieldsError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return await get_all_distribution_service(db, fields=selected)
 
-@router.get("/{distribution_id}")
-async def get_distribution_by_id(distribution_id: int):
-    return await get_distribution_by_id_service(distribution_id=distribution_id)
+@router.get("/export")
+async def export_distributions(
+    date_from: Optional[date] = Query(None, description="Data inicial (inclusiva)"),
+    date_to: Optional[date] = Query(None, description="Data final (inclusiva)"),
+    neighborhood: Optional[str] = Query(None, max_length=100, description="Bairro do beneficiário"),
+    old: OldFilter = Query("false", description="Registros antigos: false (atuais), true (antigos) ou all")
+):
+    """
+    Exporta as distribuições em CSV, transmitido em lotes (sem limite de linhas).
+    O intervalo de datas se aplica à data da distribuição e o bairro ao beneficiário.
+    """
+    try:
+        Period.between(date_from, date_to)
+    except InvalidPeriodError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-@router.post("/")
-async def create_distribution(distribution_dto: create_distribution_dto):
-    return await create_distribution_service(distribution_dto=distribution_dto)
+    return StreamingResponse(
+        stream_distributions_csv(date_from=date_from, date_to=date_to, neighborhood=neighborhood, old=old),
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{export_filename("distribuicoes")}"'}
+    )
 
-@router.put("/")
-async def create_distribution(distribution_dto: update_distribution_dto):
-    return await update_distribution_service(distribution_dto=distribution_dto)
+@router.get("/{distribution_id}", response_model=Optional[distribution_response_dto])
+async def get_distribution_by_id(distribution_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await get_distribution_by_id_service(db, distribution_id=distribution_id)
+
+@router.post("/", response_model=distribution_response_dto)
+async def create_distribution(distribution_dto: create_distribution_dto, db: AsyncSession = Depends(get_async_db)):
+    return await create_distribution_service(db, distribution_dto=distribution_dto)
+
+@router.post("/bulk")
+async def create_distribution_bulk(bulk_dto: create_distribution_bulk_dto, db: AsyncSession = Depends(get_async_db)):
+    """
+    Registra várias distribuições em uma única transação.
+    No modo all_or_nothing, qualquer item inválido recusa o lote inteiro (400).
+    """
+    return await create_distribution_bulk_service(db, bulk_dto=bulk_dto)
+
+@router.put("/", response_model=Optional[distribution_response_dto])
+async def update_distribution(distribution_dto: update_distribution_dto, db: AsyncSession = Depends(get_async_db)):
+    return await update_distribution_service(db, distribution_dto=distribution_dto)
 
 @router.delete("/{distribution_id}")
-async def create_distribution(distribution_id: int):
-    return await delete_distribution_service(distribution_id=distribution_id)
\ No newline at end of file
+async def delete_distribution(distribution_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await delete_distribution_service(db, distribution_id=distribution_id)
\ No newline at end of file
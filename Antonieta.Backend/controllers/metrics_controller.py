@@ -0,0 +1,60 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from database import pool_status
+from models.user_model import User
+from services.auth_service import get_current_user
+from services.audit_writer import audit_writer
+from services.cache_service import cache_status
+from services.principal_cache import principal_cache
+from services.password_hasher import password_hasher
+from services.login_limiter import login_limiter
+
+async def require_admin(current_user: User = Depends(get_current_user)) -> User:
+    """
+    As métricas expõem a configuração e os contadores do limitador de login,
+    do pool do bcrypt e dos caches: apenas administradores
+    """
+    if current_user.role != "administrador":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Acesso negado. Apenas administradores podem acessar as métricas."
+        )
+    return current_user
+
+router = APIRouter(prefix="/metrics", tags=["metrics"], dependencies=[Depends(require_admin)])
+
+@router.get("/database")
+async def get_database_metrics():
+    """
+    Retorna o estado dos pools de conexão (em uso, ociosas, overflow)
+    e os contadores de checkout, tempo de espera e invalidações
+    """
+    return pool_status()
+
+@router.get("/audit")
+async def get_audit_metrics():
+    """
+    Retorna o estado da gravação de auditoria em lote: profundidade da fila,
+    linhas gravadas, lotes com falha e linhas enviadas ao spool
+    """
+    return audit_writer.stats()
+
+@router.get("/cache")
+async def get_cache_metrics():
+    """
+    Retorna o backend do cache de leitura do dashboard, o número de entradas
+    e os contadores de acertos, faltas e invalidações
+    """
+    return cache_status()
+
+@router.get("/auth")
+async def get_auth_metrics():
+    """
+    Retorna o estado do cache de usuários autenticados (por token), do pool
+    do bcrypt (profundidade da fila, recusas, tempos médios e rehashes) e do
+    limitador de tentativas de login
+    """
+    return {
+        "principal_cache": principal_cache.stats(),
+        "password_hasher": password_hasher.stats(),
+        "login_limiter": login_limiter.stats(),
+    }
@@ -1,6 +1,10 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional, Tuple, Union
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db
 from services.ration_input_services import (
     get_all_ration_input_service,
+    get_ration_input_page_service,
     get_ration_input_by_id_service,
     create_ration_input_service,
     update_ration_input_service,
@@ -8,52 +12,67 @@ from services.ration_input_services import (
 )
 from dtos.create_ration_input_dto import create_ration_input_dto
 from dtos.update_ration_input_dto import update_ration_input_dto
+from services.pagination import InvalidCursorError, CountMode, DEFAULT_PAGE_SIZE
+from services.etag_service import conditional_get
+from services.cache_service import TABLE_RATION_INPUT
+from dtos.ration_input_response_dto import ration_input_response_dto, ration_input_page_dto
 
 router = APIRouter(prefix="/ration-input", tags=["ration-input"])
 
-@router.get("/")
-async def get_all_ration_input():
+@router.get("/", response_model=Union[ration_input_page_dto, Tuple[List[ration_input_response_dto], int]], dependencies=[Depends(conditional_get(TABLE_RATION_INPUT))])
+async def get_all_ration_input(
+    db: AsyncSession = Depends(get_async_db),
+    after: Optional[str] = Query(None, description="Cursor da página anterior; ativa a paginação por cursor"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=1000),
+    count: CountMode = Query("none")
+):
     """
     Retorna todos os registros de entrada de ração.
+    Com o parâmetro `after`, retorna uma página por cursor com `next_cursor`.
     """
-    return await get_all_ration_input_service()
+    if after is not None:
+        try:
+            return await get_ration_input_page_service(db, after=after, limit=limit, count=count)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return await get_all_ration_input_service(db)
 
-@router.get("/{ration_input_id}")
-async def get_ration_input_by_id(ration_input_id: int):
+@router.get("/{ration_input_id}", response_model=Optional[ration_input_response_dto])
+async def get_ration_input_by_id(ration_input_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Retorna um registro específico de entrada de ração.
     """
-    ration_input = await get_ration_input_by_id_service(ration_input_id)
+    ration_input = await get_ration_input_by_id_service(db, ration_input_id)
     if not ration_input:
         raise HTTPException(status_code=404, detail="Registro de entrada não encontrado")
     return ration_input
 
-@router.post("/")
-async def create_ration_input(ration_input: create_ration_input_dto):
+@router.post("/", response_model=ration_input_response_dto)
+async def create_ration_input(ration_input: create_ration_input_dto, db: AsyncSession = Depends(get_async_db)):
     """
     Cria um novo registro de entrada de ração.
     """
-    return await create_ration_input_service(ration_input)
+    return await create_ration_input_service(db, ration_input)
 
-@router.put("/{ration_input_id}")
-async def update_ration_input(ration_input_id: int, ration_input: update_ration_input_dto):
+@router.put("/{ration_input_id}", response_model=Optional[ration_input_response_dto])
+async def update_ration_input(ration_input_id: int, ration_input: update_ration_input_dto, db: AsyncSession = Depends(get_async_db)):
     """
     Atualiza um registro existente de entrada de ração.
     """
     if ration_input_id != ration_input.id:
         raise HTTPException(status_code=400, detail="ID da rota não corresponde ao ID do corpo da requisição")
     
-    updated_input = await update_ration_input_service(ration_input)
+    updated_input = await update_ration_input_service(db, ration_input)
     if not updated_input:
         raise HTTPException(status_code=404, detail="Registro de entrada não encontrado")
     return updated_input
 
 @router.delete("/{ration_input_id}")
-async def delete_ration_input(ration_input_id: int):
+async def delete_ration_input(ration_input_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Remove um registro de entrada de ração.
     """
-    success = await delete_ration_input_service(ration_input_id)
+    success = await delete_ration_input_service(db, ration_input_id)
     if not success:
         raise HTTPException(status_code=404, detail="Registro de entrada não encontrado")
     return {"message": "Registro de entrada removido com sucesso"}
\ No newline at end of file
@@ -1,26 +1,85 @@
-from fastapi import APIRouter
-from services.ration_stock_services import get_all_ration_stock_service, get_ration_stock_by_id_service, create_ration_stock_service, update_ration_stock_service, delete_ration_stock_service
+from datetime import date, datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional, Tuple, Union
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db
+from services.ration_stock_services import get_all_ration_stock_service, get_ration_stock_page_service, get_ration_stock_by_id_service, create_ration_stock_service, update_ration_stock_service, delete_ration_stock_service
 from dtos.update_ration_stock_dto import update_ration_stock_dto
 from dtos.create_ration_stock_dto import create_ration_stock_dto
+from services.pagination import InvalidCursorError, CountMode, DEFAULT_PAGE_SIZE
+from services.etag_service import conditional_get
+from services.cache_service import TABLE_RATION_STOCK
+from dtos.ration_stock_response_dto import ration_stock_response_dto, ration_stock_page_dto
+from services.stock_ledger_service import get_stock_as_of_service, get_stock_movements_service
+from services.period import InvalidPeriodError
+from dtos.stock_ledger_dto import stock_as_of_dto, stock_movements_dto
 
 router = APIRouter(prefix="/ration-stock", tags=["ration-stock"])
 
-@router.get("/")
-async def get_all_ration_stock():
-    return await get_all_ration_stock_service()
+@router.get("/", response_model=Union[ration_stock_page_dto, Tuple[List[ration_stock_response_dto], int]], dependencies=[Depends(conditional_get(TABLE_RATION_STOCK))])
+async def get_all_ration_stock(
+    db: AsyncSession = Depends(get_async_db),
+    after: Optional[str] = Query(None, description="Cursor da página anterior; ativa a paginação por cursor"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=1000),
+    count: CountMode = Query("none")
+):
+    if after is not None:
+        try:
+            return await get_ration_stock_page_service(db, after=after, limit=limit, count=count)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return await get_all_ration_stock_service(db)
 
-@router.get("/{ration_stock_id}")
-async def get_ration_stock_by_id(ration_stock_id: int):
-    return await get_ration_stock_by_id_service(ration_stock_id=ration_stock_id)
+@router.get("/{ration_stock_id}", response_model=Optional[ration_stock_response_dto])
+async def get_ration_stock_by_id(ration_stock_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await get_ration_stock_by_id_service(db, ration_stock_id=ration_stock_id)
 
-@router.post("/")
-async def create_ration_stock(ration_stock: create_ration_stock_dto):
-    return await create_ration_stock_service(ration_stock)
+@router.get("/{ration_stock_id}/stock-as-of", response_model=stock_as_of_dto)
+async def get_ration_stock_as_of(
+    ration_stock_id: int,
+    at: datetime = Query(..., description="Instante da consulta (ISO 8601), pelo momento do registro dos movimentos"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Saldo da ração em um instante, a partir do livro-razão de estoque"""
+    if not await get_ration_stock_by_id_service(db, ration_stock_id=ration_stock_id):
+        raise HTTPException(status_code=404, detail="Estoque de ração não encontrado")
+    return await get_stock_as_of_service(db, ration_stock_id, at)
 
-@router.put("/{ration_stock_id}")
-async def update_ration_stock(ration_stock_id: int, ration_stock: update_ration_stock_dto):
-    return await update_ration_stock_service(ration_stock)
+@router.get("/{ration_stock_id}/movements", response_model=stock_movements_dto)
+async def get_ration_stock_movements(
+    ration_stock_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    date_from: Optional[date] = Query(None, alias="from", description="Data inicial do registro (inclusiva)"),
+    date_to: Optional[date] = Query(None, alias="to", description="Data final do registro (inclusiva)"),
+    cursor: Optional[str] = Query(None, description="Cursor da página anterior (next_cursor)"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=1000)
+):
+    """
+    Movimentos de estoque da ração no período, com saldos inicial e final
+    e totais de entrada e saída
+    """
+    if not await get_ration_stock_by_id_service(db, ration_stock_id=ration_stock_id):
+        raise HTTPException(status_code=404, detail="Estoque de ração não encontrado")
+    try:
+        return await get_stock_movements_service(
+            db,
+            ration_stock_id=ration_stock_id,
+            date_from=date_from,
+            date_to=date_to,
+            after=cursor,
+            limit=limit
+        )
+    except (InvalidCursorError, InvalidPeriodError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/", response_model=ration_stock_response_dto)
+async def create_ration_stock(ration_stock: create_ration_stock_dto, db: AsyncSession = Depends(get_async_db)):
+    return await create_ration_stock_service(db, ration_stock)
+
+@router.put("/{ration_stock_id}", response_model=Optional[ration_stock_response_dto])
+async def update_ration_stock(ration_stock_id: int, ration_stock: update_ration_stock_dto, db: AsyncSession = Depends(get_async_db)):
+    return await update_ration_stock_service(db, ration_stock)
 
 @router.delete("/{ration_stock_id}")
-async def delete_ration_stock(ration_stock_id: int):
-    return await delete_ration_stock_service(ration_stock_id=ration_stock_id)
\ No newline at end of file
+async def delete_ration_stock(ration_stock_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await delete_ration_stock_service(db, ration_stock_id=ration_stock_id)
\ No newline at end of file
@@ -14,9 +14,18 @@ from services.user_service import (
     get_user_by_email
 )
 from services.audit_helper import AuditHelper
+from services.password_hasher import PasswordHasherBusyError
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+def password_busy_exception() -> HTTPException:
+    """Pool do bcrypt sem capacidade: o cliente pode tentar novamente"""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Servidor ocupado, tente novamente em instantes",
+        headers={"Retry-After": "1"},
+    )
+
 @router.get("/", response_model=List[UserResponse])
 async def list_users(
     db: Session = Depends(get_db),
@@ -56,7 +65,10 @@ async def create_user(
             detail="Email já está registrado"
         )
     
-    new_user = create_new_user(db, user)
+    try:
+        new_user = await create_new_user(db, user)
+    except PasswordHasherBusyError:
+        raise password_busy_exception()
     
     # Registrar criação
     AuditHelper.log_create(
@@ -104,7 +116,10 @@ async def update_user(
                 detail="Email já está registrado"
             )
     
-    updated_user = update_user_by_id(db, user_id, user)
+    try:
+        updated_user = await update_user_by_id(db, user_id, user)
+    except PasswordHasherBusyError:
+        raise password_busy_exception()
     
     # Registrar atualização
     new_data = {
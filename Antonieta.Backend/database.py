@@ -1,5 +1,12 @@
-from sqlalchemy import create_engine
+import logging
+import threading
+import time
+import sqlalchemy
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from os import getenv
 from dotenv import load_dotenv
 from sqlalchemy.ext.declarative import declarative_base
@@ -11,14 +18,223 @@ load_dotenv()
 # Database connection URL from environment variable
 DATABASE_URL = getenv('DATABASE_URL', '')
 
+# Pool configuration (ignored for SQLite)
+DB_POOL_SIZE = int(getenv('DB_POOL_SIZE', '5'))
+DB_MAX_OVERFLOW = int(getenv('DB_MAX_OVERFLOW', '10'))
+DB_POOL_TIMEOUT = float(getenv('DB_POOL_TIMEOUT', '30'))
+DB_POOL_RECYCLE = int(getenv('DB_POOL_RECYCLE', '1800'))
+DB_POOL_PRE_PING = getenv('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes')
+# Per-statement timeout in milliseconds (0 disables)
+DB_STATEMENT_TIMEOUT_MS = int(getenv('DB_STATEMENT_TIMEOUT_MS', '0'))
+
+def to_async_url(url: str) -> str:
+    """Converte a URL síncrona para o driver assíncrono equivalente"""
+    if url.startswith('postgresql+psycopg2://'):
+        return url.replace('postgresql+psycopg2://', 'postgresql+asyncpg://', 1)
+    if url.startswith('postgresql://'):
+        return url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+    if url.startswith('postgres://'):
+        return url.replace('postgres://', 'postgresql+asyncpg://', 1)
+    if url.startswith('sqlite://'):
+        return url.replace('sqlite://', 'sqlite+aiosqlite://', 1)
+    return url
+
+# Async URL (asyncpg / aiosqlite), derived from DATABASE_URL unless set explicitly
+ASYNC_DATABASE_URL = getenv('ASYNC_DATABASE_URL') or to_async_url(DATABASE_URL)
+
+logger = logging.getLogger(__name__)
+
+# Versões do SQLAlchemy em que a medição da espera no checkout foi verificada
+# (depende de QueuePool._do_get, que é interno)
+TIMED_POOL_SQLALCHEMY_VERSIONS = ("2.0.",)
+
+
+class PoolStats:
+    """
+    Contadores de uso do pool coletados pelos eventos do SQLAlchemy
+    e pela medição do tempo de espera no checkout.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # False quando a espera no checkout não pode ser medida (ver checkout_wait_supported)
+        self.wait_tracked = True
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.checkout_timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.hold_total = 0.0
+        self.hold_max = 0.0
+
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def record_hold(self, seconds: float) -> None:
+        with self._lock:
+            self.hold_total += seconds
+            self.hold_max = max(self.hold_max, seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            checkouts = self.checkouts or 1
+            checkins = self.checkins or 1
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "checkout_wait_tracked": self.wait_tracked,
+                "checkout_timeouts": self.checkout_timeouts if self.wait_tracked else None,
+                "checkout_wait_avg_ms": round(self.wait_total / checkouts * 1000, 3) if self.wait_tracked else None,
+                "checkout_wait_max_ms": round(self.wait_max * 1000, 3) if self.wait_tracked else None,
+                "connection_hold_avg_ms": round(self.hold_total / checkins * 1000, 3),
+                "connection_hold_max_ms": round(self.hold_max * 1000, 3),
+            }
+
+
+class _TimedPoolMixin:
+    """
+    Mede o tempo de espera por uma conexão livre no pool. Os eventos
+    públicos do pool só disparam depois que a conexão foi obtida, então a
+    medição envolve QueuePool._do_get; usada apenas nas versões verificadas
+    (ver checkout_wait_supported).
+    """
+
+    stats: PoolStats
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.stats.increment("checkout_timeouts")
+            raise
+        finally:
+            self.stats.record_wait(time.perf_counter() - start)
+
+
+def checkout_wait_supported(pool_base) -> bool:
+    """Se a espera no checkout pode ser medida com a versão instalada do SQLAlchemy"""
+    return (
+        sqlalchemy.__version__.startswith(TIMED_POOL_SQLALCHEMY_VERSIONS)
+        and callable(getattr(pool_base, "_do_get", None))
+    )
+
+
+def _timed_pool_class(base, stats: PoolStats):
+    if not checkout_wait_supported(base):
+        # Versão não verificada: pool padrão, sem as métricas de espera
+        logger.warning(
+            f"SQLAlchemy {sqlalchemy.__version__}: espera no checkout de {base.__name__} não será medida"
+        )
+        stats.wait_tracked = False
+        return base
+    # A classe carrega os contadores para que pool.recreate() os preserve
+    return type(f"Timed{base.__name__}", (_TimedPoolMixin, base), {"stats": stats})
+
+
+def _register_pool_events(sync_engine, stats: PoolStats) -> None:
+    @event.listens_for(sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        stats.increment("connects")
+
+    @event.listens_for(sync_engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        stats.increment("checkouts")
+        connection_record.info["checked_out_at"] = time.perf_counter()
+
+    @event.listens_for(sync_engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        stats.increment("checkins")
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            stats.record_hold(time.perf_counter() - checked_out_at)
+
+    @event.listens_for(sync_engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        stats.increment("invalidations")
+
+
+def engine_options(url: str, pool_base, stats: PoolStats) -> dict:
+    """Opções de pool e conexão aplicadas aos engines (SQLite usa o pool padrão do driver)"""
+    if url.startswith('sqlite'):
+        return {}
+
+    options = {
+        "poolclass": _timed_pool_class(pool_base, stats),
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+    if DB_STATEMENT_TIMEOUT_MS > 0:
+        if '+asyncpg' in url:
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}}
+        elif url.startswith('postgres'):
+            options["connect_args"] = {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+
+    return options
+
+sync_pool_stats = PoolStats()
+async_pool_stats = PoolStats()
+
 # Create SQLAlchemy engine
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL, QueuePool, sync_pool_stats))
+_register_pool_events(engine, sync_pool_stats)
 
 # Create a SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine and session factory used by the async services
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    **engine_options(ASYNC_DATABASE_URL, AsyncAdaptedQueuePool, async_pool_stats)
+)
+_register_pool_events(async_engine.sync_engine, async_pool_stats)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 Base = declarative_base()
 
+def pool_status() -> dict:
+    """
+    Estado atual dos pools (conexões em uso, ociosas e em overflow)
+    mais os contadores acumulados desde o início do processo.
+    """
+    status = {}
+    for name, pool, stats in (
+        ("sync", engine.pool, sync_pool_stats),
+        ("async", async_engine.sync_engine.pool, async_pool_stats),
+    ):
+        current = {"pool_class": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            current.update({
+                "size": pool.size(),
+                "max_overflow": DB_MAX_OVERFLOW,
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+            })
+        current.update(stats.snapshot())
+        status[name] = current
+    return status
+
 # Dependency to get database session
 def get_db():
     db = SessionLocal()
@@ -26,3 +242,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Dependency to get async database session (one session and connection per request, shared by the services)
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,40 @@
+from pydantic import BaseModel
+from datetime import date, datetime
+from typing import List, Optional
+
+class beneficiary_history_item_dto(BaseModel):
+    """
+    Distribuição no histórico do beneficiário, com o total acumulado
+    no período até ela (running_total).
+    """
+    id: int
+    date: datetime
+    ration_id: Optional[int] = None
+    ration_name: Optional[str] = None
+    amount: Optional[float] = None
+    observations: Optional[str] = None
+    running_total: float
+
+class monthly_subtotal_dto(BaseModel):
+    """
+    Subtotal de um mês no período consultado.
+    """
+    year: int
+    month: int
+    amount: float
+    count: int
+
+class beneficiary_history_dto(BaseModel):
+    """
+    Histórico de distribuições de um beneficiário em um período,
+    paginado por cursor (data, id), com subtotais mensais e total do período.
+    """
+    beneficiary_id: int
+    date_from: Optional[date]
+    date_to: Optional[date]
+    items: List[beneficiary_history_item_dto]
+    next_cursor: Optional[str]
+    limit: int
+    total_amount: float
+    total_count: int
+    monthly: List[monthly_subtotal_dto]
@@ -0,0 +1,79 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+
+class beneficiary_response_dto(BaseModel):
+    """
+    Data Transfer Object (DTO) de resposta de beneficiário.
+    Serializado pelo pydantic-core a partir do objeto do ORM (from_attributes).
+    """
+    id: int
+    name: Optional[str] = None
+    document: Optional[str] = None
+
+    street: Optional[str] = None
+    number: Optional[str] = None
+    neighborhood: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    zip_code: Optional[str] = None
+    complement: Optional[str] = None
+
+    contact: Optional[str] = None
+    mother_name: Optional[str] = None
+    birth_date: Optional[str] = None
+    qtd_dogs: Optional[int] = None
+    qtd_castred_dogs: Optional[int] = None
+    qtd_cats: Optional[int] = None
+    qtd_castred_cats: Optional[int] = None
+    government_benefit: Optional[bool] = None
+    receives_basic_basket: Optional[bool] = None
+    receives_bpc_loas: Optional[bool] = None
+
+    cadunico_code: Optional[str] = None
+    income_range: Optional[str] = None
+
+    how_did_you_hear: Optional[str] = None
+    observations: Optional[str] = None
+    old: Optional[bool] = None
+
+    created_by: Optional[int] = None
+    updated_by: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class BeneficiaryListItem(BaseModel):
+    """
+    Resumo do beneficiário exibido na listagem (fields=list):
+    identificação, contato e endereço.
+    """
+    id: int
+    name: Optional[str] = None
+    document: Optional[str] = None
+    contact: Optional[str] = None
+    street: Optional[str] = None
+    number: Optional[str] = None
+    complement: Optional[str] = None
+    neighborhood: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class beneficiary_page_dto(BaseModel):
+    """
+    Página de beneficiários na paginação por cursor.
+    Com `fields`, cada item traz apenas as colunas pedidas.
+    """
+    items: List[beneficiary_response_dto]
+    next_cursor: Optional[str]
+    limit: int
+    total: Optional[int]
+
+# Campos aceitos pelo parâmetro fields e conjuntos predefinidos
+BENEFICIARY_FIELDS = list(beneficiary_response_dto.model_fields)
+BENEFICIARY_FIELD_PRESETS = {"list": list(BeneficiaryListItem.model_fields)}
@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+from typing import List, Literal
+from dtos.create_distribution_dto import create_distribution_dto
+
+class create_distribution_bulk_dto(BaseModel):
+    """
+    Data Transfer Object (DTO) para registrar várias distribuições de uma vez.
+
+    mode:
+        all_or_nothing: se algum item for inválido, nenhum é gravado.
+        best_effort: grava os itens válidos e informa os recusados.
+    """
+    items: List[create_distribution_dto] = Field(..., min_length=1, max_length=1000)
+    mode: Literal["all_or_nothing", "best_effort"] = "all_or_nothing"
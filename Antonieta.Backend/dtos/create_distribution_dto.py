@@ -1,6 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 from typing import Optional
+from dtos.datetime_fields import to_naive_utc
 
 class create_distribution_dto(BaseModel):
     """
@@ -8,6 +9,11 @@ class create_distribution_dto(BaseModel):
     """
     ration_id: int
     beneficiary_id: int
-    amount: float
+    amount: float = Field(..., gt=0, description="Quantidade distribuída")
     date: datetime
-    observations: Optional[str] = None
\ No newline at end of file
+    observations: Optional[str] = None
+
+    @field_validator("date")
+    @classmethod
+    def normalize_date(cls, value: datetime) -> datetime:
+        return to_naive_utc(value)
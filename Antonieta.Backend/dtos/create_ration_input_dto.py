@@ -1,5 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from datetime import datetime
+from dtos.datetime_fields import to_naive_utc
 
 class create_ration_input_dto(BaseModel):
     """
@@ -8,4 +9,9 @@ class create_ration_input_dto(BaseModel):
     ration_stock_id: int
     amount: float
     date: datetime
-    description: str
\ No newline at end of file
+    description: str
+
+    @field_validator("date")
+    @classmethod
+    def normalize_date(cls, value: datetime) -> datetime:
+        return to_naive_utc(value)
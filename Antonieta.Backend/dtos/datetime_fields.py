@@ -0,0 +1,13 @@
+from datetime import datetime, timezone
+
+def to_naive_utc(value: datetime) -> datetime:
+    """
+    Converte uma data com fuso (ex.: "2024-05-10T03:00:00.000Z", enviada
+    pelo frontend com toISOString) para UTC sem fuso, como as colunas
+    DateTime sem timezone de distribution e ration_input armazenam.
+    O asyncpg recusa datas com fuso nessas colunas. Datas sem fuso são
+    mantidas como recebidas.
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
@@ -0,0 +1,55 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+
+class distribution_response_dto(BaseModel):
+    """
+    Data Transfer Object (DTO) de resposta de distribuição.
+    """
+    id: int
+    ration_id: Optional[int] = None
+    beneficiary_id: Optional[int] = None
+    amount: Optional[float] = None
+    date: Optional[datetime] = None
+    observations: Optional[str] = None
+    old: Optional[bool] = None
+    # Obtidos por JOIN na listagem e no detalhe
+    beneficiary_name: Optional[str] = None
+    ration_name: Optional[str] = None
+    created_by: Optional[int] = None
+    updated_by: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class DistributionListItem(BaseModel):
+    """
+    Resumo da distribuição exibido na listagem (fields=list).
+    """
+    id: int
+    date: datetime
+    beneficiary_id: Optional[int] = None
+    ration_id: Optional[int] = None
+    amount: Optional[float] = None
+    observations: Optional[str] = None
+    beneficiary_name: Optional[str] = None
+    ration_name: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class distribution_page_dto(BaseModel):
+    """
+    Página de distribuições na paginação por cursor.
+    Com `fields`, cada item traz apenas as colunas pedidas.
+    """
+    items: List[distribution_response_dto]
+    next_cursor: Optional[str]
+    limit: int
+    total: Optional[int]
+
+# Campos aceitos pelo parâmetro fields e conjuntos predefinidos
+DISTRIBUTION_FIELDS = list(distribution_response_dto.model_fields)
+DISTRIBUTION_FIELD_PRESETS = {"list": list(DistributionListItem.model_fields)}
@@ -0,0 +1,29 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+
+class ration_input_response_dto(BaseModel):
+    """
+    Data Transfer Object (DTO) de resposta de entrada de ração.
+    """
+    id: int
+    ration_stock_id: Optional[int] = None
+    amount: Optional[float] = None
+    date: datetime
+    description: Optional[str] = None
+    created_by: Optional[int] = None
+    updated_by: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class ration_input_page_dto(BaseModel):
+    """
+    Página de entradas de ração na paginação por cursor.
+    """
+    items: List[ration_input_response_dto]
+    next_cursor: Optional[str]
+    limit: int
+    total: Optional[int]
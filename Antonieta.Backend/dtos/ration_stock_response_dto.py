@@ -0,0 +1,29 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+
+class ration_stock_response_dto(BaseModel):
+    """
+    Data Transfer Object (DTO) de resposta de estoque de ração.
+    """
+    id: int
+    name: Optional[str] = None
+    description: Optional[str] = None
+    unit: Optional[str] = None
+    stock: Optional[float] = None
+    created_by: Optional[int] = None
+    updated_by: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class ration_stock_page_dto(BaseModel):
+    """
+    Página de estoques de ração na paginação por cursor.
+    """
+    items: List[ration_stock_response_dto]
+    next_cursor: Optional[str]
+    limit: int
+    total: Optional[int]
@@ -0,0 +1,48 @@
+from pydantic import BaseModel
+from datetime import date, datetime
+from typing import List, Optional
+
+class stock_movement_dto(BaseModel):
+    """
+    Movimento do livro-razão de estoque, com o saldo e os totais
+    acumulados da ração após ele.
+    """
+    id: int
+    sequence: int
+    kind: str
+    source_id: Optional[int] = None
+    reference_date: Optional[datetime] = None
+    delta: float
+    balance: float
+    total_in: float
+    total_out: float
+    recorded_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class stock_as_of_dto(BaseModel):
+    """
+    Saldo de uma ração em um instante (último movimento até `at`).
+    """
+    ration_stock_id: int
+    at: datetime
+    stock: float
+    sequence: Optional[int]
+    recorded_at: Optional[datetime]
+
+class stock_movements_dto(BaseModel):
+    """
+    Movimentos de uma ração em um período, paginados por cursor, com os
+    saldos inicial e final e os totais de entrada e saída do período.
+    """
+    ration_stock_id: int
+    date_from: Optional[date]
+    date_to: Optional[date]
+    items: List[stock_movement_dto]
+    next_cursor: Optional[str]
+    limit: int
+    opening_balance: float
+    closing_balance: float
+    total_in: float
+    total_out: float
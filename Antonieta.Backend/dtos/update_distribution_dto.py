@@ -1,5 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
+from dtos.datetime_fields import to_naive_utc
 
 class update_distribution_dto(BaseModel):
     """
@@ -8,5 +9,10 @@ class update_distribution_dto(BaseModel):
     id: int
     ration_id: int
     beneficiary_id: int
-    amount: int
-    date: datetime
\ No newline at end of file
+    amount: float = Field(..., gt=0, description="Quantidade distribuída")
+    date: datetime
+
+    @field_validator("date")
+    @classmethod
+    def normalize_date(cls, value: datetime) -> datetime:
+        return to_naive_utc(value)
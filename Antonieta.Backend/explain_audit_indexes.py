@@ -0,0 +1,154 @@
+"""
+Verificação dos índices compostos de audit_logs via EXPLAIN (PostgreSQL).
+
+Dentro de uma transação que é desfeita ao final, insere N linhas sintéticas
+em audit_logs (padrão: 1 milhão), executa ANALYZE e confere que o planejador
+usa os índices compostos nas consultas de AuditService:
+
+    - histórico de entidade  → ix_audit_logs_entity_created
+    - atividade de usuário   → ix_audit_logs_user_created
+    - logs filtrados por entidade (get_logs) → ix_audit_logs_entity_created
+
+As consultas são montadas pelos mesmos métodos de AuditService, então uma
+mudança no serviço que deixe de usar os índices também é detectada.
+Nenhum dado é mantido.
+
+Teste de regressão: rodar após `alembic upgrade head` (CI ou antes de um
+deploy). Códigos de saída:
+
+    0 - todas as consultas usam os índices esperados
+    1 - o banco não é PostgreSQL
+    2 - algum índice não existe ou não aparece no plano
+
+Uso:
+    python explain_audit_indexes.py [--rows 1000000]
+"""
+
+import argparse
+import json
+import sys
+from sqlalchemy import text
+from database import get_db
+
+# Importar todos os modelos para evitar problemas de referência circular
+import models.user_model  # noqa: F401
+
+from models.audit_log_model import AuditLog
+from services.audit_service import AuditService
+
+def seed(db, rows: int) -> list:
+    """
+    Cria 50 usuários temporários e insere linhas distribuídas entre eles,
+    5 tipos de entidade e 5 mil entidades ao longo dos últimos 12 meses.
+
+    Returns:
+        IDs dos usuários temporários.
+    """
+    user_ids = db.execute(text("""
+        INSERT INTO users (email, hashed_password, full_name, role)
+        SELECT 'explain' || g || '@antonieta.invalid', '', 'EXPLAIN', 'comum'
+        FROM generate_series(1, 50) AS g
+        RETURNING id
+    """)).scalars().all()
+
+    db.execute(text("""
+        INSERT INTO audit_logs (user_id, user_email, action, entity_type, entity_id, description, created_at)
+        SELECT
+            (CAST(:user_ids AS integer[]))[1 + n % 50],
+            'explain' || (1 + n % 50) || '@antonieta.invalid',
+            (ARRAY['CREATE', 'UPDATE', 'DELETE', 'LOGIN_SUCCESS'])[1 + n % 4],
+            (ARRAY['User', 'Beneficiary', 'Distribution', 'RationStock', 'RationInput'])[1 + n % 5],
+            n % 5000,
+            'Linha sintética para EXPLAIN',
+            now() - (n % 525600) * interval '1 minute'
+        FROM generate_series(1, :rows) AS n
+    """), {"rows": rows, "user_ids": list(user_ids)})
+    db.execute(text("ANALYZE audit_logs"))
+    return user_ids
+
+def index_names(db, parent_index: str) -> set:
+    """Nome do índice e dos índices equivalentes em cada partição"""
+    names = {parent_index}
+    names.update(db.execute(text("""
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass(:name)
+    """), {"name": parent_index}).scalars().all())
+    return names
+
+def index_exists(db, name: str) -> bool:
+    """Se o índice existe (migração aplicada)"""
+    return db.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}).scalar()
+
+def plan_indexes(db, query) -> set:
+    """Índices usados no plano de uma consulta do ORM"""
+    compiled = query.statement.compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True})
+    plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    used = set()
+    def walk(node):
+        if "Index Name" in node:
+            used.add(node["Index Name"])
+        for child in node.get("Plans", []):
+            walk(child)
+    walk(plan[0]["Plan"])
+    return used
+
+def main(rows: int) -> int:
+    db = next(get_db())
+
+    if db.get_bind().dialect.name != "postgresql":
+        print("\n❌ Esta verificação requer PostgreSQL.")
+        return 1
+
+    try:
+        print(f"\n🌱 Inserindo {rows} linhas sintéticas (serão desfeitas ao final)...")
+        user_ids = seed(db, rows)
+
+        checks = [
+            (
+                "get_entity_history",
+                AuditService._entity_history_query(db, "Beneficiary", 42),
+                "ix_audit_logs_entity_created"
+            ),
+            (
+                "get_user_activity",
+                AuditService._user_activity_query(db, user_ids[7], days=30),
+                "ix_audit_logs_user_created"
+            ),
+            (
+                "get_logs (entidade)",
+                AuditService._filtered_query(db, entity_type="Distribution", entity_id=7)
+                    .order_by(AuditLog.created_at.desc()).limit(100),
+                "ix_audit_logs_entity_created"
+            ),
+        ]
+
+        failures = 0
+        print("\n📊 Planos:")
+        for name, query, expected in checks:
+            if not index_exists(db, expected):
+                failures += 1
+                print(f"  ❌ {name}: índice {expected} não existe (migração aplicada?)")
+                continue
+            used = plan_indexes(db, query)
+            ok = bool(used & index_names(db, expected))
+            failures += 0 if ok else 1
+            print(f"  {'✅' if ok else '❌'} {name}: esperado {expected}, usados {sorted(used) or 'nenhum (seq scan)'}")
+
+        if failures:
+            print(f"\n❌ {failures} consulta(s) sem o índice esperado.")
+            return 2
+        print("\n✅ Todas as consultas usam os índices compostos.")
+        return 0
+    finally:
+        db.rollback()
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verifica via EXPLAIN os índices compostos de audit_logs")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Linhas sintéticas a inserir")
+    sys.exit(main(parser.parse_args().rows))
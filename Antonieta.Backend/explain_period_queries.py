@@ -0,0 +1,161 @@
+"""
+Verificação via EXPLAIN dos filtros de período (PostgreSQL).
+
+Dentro de uma transação que é desfeita ao final, cria um estoque e um
+beneficiário temporários, insere N distribuições (padrão: 500 mil) e N/10
+entradas de ração espalhadas pelos últimos 3 anos, executa ANALYZE e confere
+que as consultas por período usam os índices de data:
+
+    - totais do período (distribuições)  → ix_distribution_old_date
+    - totais do período (entradas)       → ix_ration_input_date
+    - histórico do beneficiário          → ix_distribution_beneficiary_old_date
+
+As consultas são montadas pelas mesmas funções dos serviços do dashboard e
+do histórico do beneficiário, então uma mudança nelas que deixe de usar os
+índices também é detectada. Para comparação, mostra também o plano do
+filtro antigo com extract(month/year), que não usa índice. Nenhum dado é
+mantido.
+
+Teste de regressão: rodar após `alembic upgrade head` (CI ou antes de um
+deploy). Códigos de saída:
+
+    0 - todas as consultas usam os índices esperados
+    1 - o banco não é PostgreSQL
+    2 - algum índice não existe ou não aparece no plano
+
+Uso:
+    python explain_period_queries.py [--rows 500000]
+"""
+
+import argparse
+import json
+import sys
+from sqlalchemy import extract, select, text
+from database import get_db
+
+# Importar todos os modelos para evitar problemas de referência circular
+import models.user_model  # noqa: F401
+import models.beneficiary_model  # noqa: F401
+import models.ration_stock_model  # noqa: F401
+import models.ration_input_model  # noqa: F401
+
+from models.distribution_model import Distribution
+from services.dashboard_service import period_distributions_query, period_inputs_query
+from services.distribution_services import beneficiary_history_conditions
+from services.period import Period
+
+def seed(db, rows: int) -> int:
+    """
+    Insere os dados sintéticos.
+
+    Returns:
+        ID do beneficiário temporário.
+    """
+    ration_id = db.execute(text("""
+        INSERT INTO ration_stock (name, description, unit, stock)
+        VALUES ('EXPLAIN ' || gen_random_uuid(), 'Ração temporária', 'kg', 0)
+        RETURNING id
+    """)).scalar()
+    beneficiary_ids = db.execute(text("""
+        INSERT INTO beneficiary (name, document, street, neighborhood, contact, old)
+        SELECT 'EXPLAIN ' || g, 'explain-' || g, 'Rua Temporária', 'Centro', '0000', false
+        FROM generate_series(1, 2000) AS g
+        RETURNING id
+    """)).scalars().all()
+
+    db.execute(text("""
+        INSERT INTO distribution (ration_id, beneficiary_id, amount, date, old)
+        SELECT
+            :ration_id,
+            (CAST(:beneficiary_ids AS integer[]))[1 + n % 2000],
+            1 + n % 20,
+            now() - (n % 1095) * interval '1 day' - (n % 1440) * interval '1 minute',
+            n % 10 = 0
+        FROM generate_series(1, :rows) AS n
+    """), {"rows": rows, "ration_id": ration_id, "beneficiary_ids": list(beneficiary_ids)})
+    db.execute(text("""
+        INSERT INTO ration_input (ration_stock_id, amount, date, description)
+        SELECT :ration_id, 100, now() - (n % 1095) * interval '1 day', 'Entrada sintética'
+        FROM generate_series(1, :rows) AS n
+    """), {"rows": max(rows // 10, 1), "ration_id": ration_id})
+    db.execute(text("ANALYZE distribution"))
+    db.execute(text("ANALYZE ration_input"))
+    return beneficiary_ids[0]
+
+def index_exists(db, name: str) -> bool:
+    """Se o índice existe (migração aplicada)"""
+    return db.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}).scalar()
+
+def plan_indexes(db, statement) -> set:
+    """Índices usados no plano de uma consulta"""
+    compiled = statement.compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True})
+    plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    used = set()
+    def walk(node):
+        if "Index Name" in node:
+            used.add(node["Index Name"])
+        for child in node.get("Plans", []):
+            walk(child)
+    walk(plan[0]["Plan"])
+    return used
+
+def main(rows: int) -> int:
+    db = next(get_db())
+
+    if db.get_bind().dialect.name != "postgresql":
+        print("\n❌ Esta verificação requer PostgreSQL.")
+        return 1
+
+    try:
+        print(f"\n🌱 Inserindo {rows} distribuições sintéticas (serão desfeitas ao final)...")
+        beneficiary_id = seed(db, rows)
+
+        month = Period.current_month()
+        checks = [
+            ("totais do mês (distribuições)", period_distributions_query(month), "ix_distribution_old_date"),
+            ("totais dos últimos 7 dias (entradas)", period_inputs_query(Period.last_days(7)), "ix_ration_input_date"),
+            (
+                "histórico do beneficiário (trimestre)",
+                select(Distribution.id, Distribution.date, Distribution.amount)
+                .where(*beneficiary_history_conditions(beneficiary_id, Period.current_quarter()))
+                .order_by(Distribution.date, Distribution.id),
+                "ix_distribution_beneficiary_old_date"
+            ),
+        ]
+
+        failures = 0
+        print("\n📊 Planos:")
+        for name, statement, expected in checks:
+            if not index_exists(db, expected):
+                failures += 1
+                print(f"  ❌ {name}: índice {expected} não existe (migração aplicada?)")
+                continue
+            used = plan_indexes(db, statement)
+            ok = expected in used
+            failures += 0 if ok else 1
+            print(f"  {'✅' if ok else '❌'} {name}: esperado {expected}, usados {sorted(used) or 'nenhum (seq scan)'}")
+
+        legacy = select(Distribution.id).where(
+            Distribution.old == False,
+            extract('year', Distribution.date) == month.start.year,
+            extract('month', Distribution.date) == month.start.month
+        )
+        used = plan_indexes(db, legacy)
+        print(f"  ℹ️  filtro antigo com extract(): usados {sorted(used) or 'nenhum (seq scan)'}")
+
+        if failures:
+            print(f"\n❌ {failures} consulta(s) sem o índice esperado.")
+            return 2
+        print("\n✅ Todas as consultas por período usam os índices de data.")
+        return 0
+    finally:
+        db.rollback()
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verifica via EXPLAIN os índices dos filtros de período")
+    parser.add_argument("--rows", type=int, default=500_000, help="Distribuições sintéticas a inserir")
+    sys.exit(main(parser.parse_args().rows))
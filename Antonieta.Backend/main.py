@@ -1,5 +1,10 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from dotenv import load_dotenv
 from os import getenv
 import os
@@ -12,12 +17,40 @@ from controllers.ration_input_controller import router as ration_input_router
 from controllers.dashboard_controller import router as dashboard_router
 from controllers.user_controller import router as user_router
 from controllers.audit_controller import router as audit_router
+from controllers.metrics_controller import router as metrics_router
+from services.audit_writer import audit_writer, AUDIT_ASYNC
+from services.audit_partition_service import ensure_current_partitions
+from services.password_hasher import password_hasher
+from services.login_limiter import login_limiter
 
 load_dotenv()
 
 port = int(getenv('PORT', 5000))
+# Respostas menores que o limite (bytes) não são compactadas
+GZIP_MINIMUM_SIZE = int(getenv('GZIP_MINIMUM_SIZE', '1000'))
+GZIP_COMPRESS_LEVEL = int(getenv('GZIP_COMPRESS_LEVEL', '6'))
 
-app = FastAPI(title="Antonieta API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Partições mensais de audit_logs para os próximos meses
+    try:
+        await asyncio.to_thread(ensure_current_partitions)
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Não foi possível criar as partições de audit_logs: {str(e)}")
+    # Gravação de auditoria em lote: inicia com a aplicação e esvazia a fila ao encerrar
+    if AUDIT_ASYNC:
+        audit_writer.start()
+    # Bloqueios de login gravados na auditoria de forma agregada
+    login_limiter.start()
+    yield
+    await login_limiter.stop()
+    # Rehashes de senha pendentes terminam antes do encerramento
+    await password_hasher.stop()
+    # stop() aguarda a thread de gravação: fora do event loop
+    await asyncio.to_thread(audit_writer.stop)
+
+# Respostas JSON serializadas com orjson
+app = FastAPI(title="Antonieta API", version="1.0.0", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # CORS Configuration
 origins = getenv('CORS_ORIGINS').split(',')
@@ -32,6 +65,9 @@ app.add_middleware(
     max_age=600,
 )
 
+# Compactação gzip quando o cliente aceita (Accept-Encoding)
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE, compresslevel=GZIP_COMPRESS_LEVEL)
+
 app.include_router(auth_router)
 app.include_router(user_router)
 app.include_router(audit_router)
@@ -40,6 +76,7 @@ app.include_router(ration_stock_router)
 app.include_router(distribution_router)
 app.include_router(ration_input_router)
 app.include_router(dashboard_router)
+app.include_router(metrics_router)
 
 
 if __name__ == "__main__":
@@ -19,9 +19,11 @@ import models.ration_input_model
 import models.beneficiary_model
 import models.distribution_model
 import models.audit_log_model
+import models.monthly_rollup_model
 
 from models.beneficiary_model import Beneficiary
 from models.distribution_model import Distribution
+from services import monthly_rollup_service
 
 # Data de corte: 5 de janeiro de 2026
 CUTOFF_DATE = datetime(2026, 1, 5, 0, 0, 0)
@@ -64,6 +66,9 @@ def mark_old_records():
             Distribution.created_at < CUTOFF_DATE
         ).update({"old": True}, synchronize_session=False)
         
+        # Distribuições antigas não entram nos totais mensais
+        monthly_rollup_service.rebuild_rollup(db)
+        
         # Commit das alterações
         db.commit()
         
@@ -1,23 +1,31 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Index, text
 from sqlalchemy.sql import func
 from database import Base
 
 class AuditLog(Base):
     """
     Tabela de auditoria para rastrear todas as ações no sistema
+
+    No PostgreSQL a tabela é particionada por mês de created_at
+    (migração d4f19a7b3e62); as consultas continuam usando audit_logs.
     """
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        # Histórico de entidade e atividade de usuário, já na ordem de created_at
+        Index("ix_audit_logs_entity_created", "entity_type", "entity_id", text("created_at DESC")),
+        Index("ix_audit_logs_user_created", "user_id", text("created_at DESC")),
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     
     # Informações do usuário
-    user_id = Column(Integer, index=True, nullable=True)  # ID do usuário que fez a ação
+    user_id = Column(Integer, nullable=True)  # ID do usuário que fez a ação
     user_email = Column(String, index=True, nullable=True)  # Email para facilitar consultas
     
     # Informações da ação
     action = Column(String, index=True)  # CREATE, UPDATE, DELETE, LOGIN, LOGOUT, etc.
-    entity_type = Column(String, index=True)  # User, Beneficiary, Distribution, etc.
-    entity_id = Column(Integer, index=True, nullable=True)  # ID do registro afetado
+    entity_type = Column(String)  # User, Beneficiary, Distribution, etc.
+    entity_id = Column(Integer, nullable=True)  # ID do registro afetado
     
     # Detalhes da operação
     description = Column(Text)  # Descrição legível da ação
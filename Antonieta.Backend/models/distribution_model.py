@@ -1,14 +1,20 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, Float, String, Boolean
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, Float, String, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
 
 class Distribution(Base):
     __tablename__ = 'distribution'
+    __table_args__ = (
+        # Histórico do beneficiário por período (GET /beneficiary/{id}/distributions)
+        Index("ix_distribution_beneficiary_old_date", "beneficiary_id", "old", "date"),
+        # Totais por período (services/period.py)
+        Index("ix_distribution_old_date", "old", "date"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     ration_id = Column(Integer, ForeignKey('ration_stock.id'), index=True)
-    beneficiary_id = Column(Integer, ForeignKey('beneficiary.id'), index=True)
+    beneficiary_id = Column(Integer, ForeignKey('beneficiary.id'))
     amount = Column(Float, index=True)
     date = Column(DateTime, nullable=False)
     ration = relationship("RationStock", back_populates="distributions")
@@ -16,7 +22,7 @@ class Distribution(Base):
     observations = Column(String, nullable=True)
     
     # Flag para registros antigos (não visíveis para o usuário)
-    old = Column(Boolean, default=False, index=True, comment="Registros anteriores à data de corte")
+    old = Column(Boolean, default=False, comment="Registros anteriores à data de corte")
     
     # Audit fields
     created_by = Column(Integer, ForeignKey('users.id'), nullable=True)
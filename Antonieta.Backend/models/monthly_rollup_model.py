@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, Float, DateTime
+from sqlalchemy.sql import func
+from database import Base
+
+class MonthlyRollup(Base):
+    """
+    Totais mensais materializados de distribuições e entradas de ração.
+    Mantida pelos serviços de escrita na mesma transação da operação.
+    """
+    __tablename__ = 'monthly_rollup'
+
+    year = Column(Integer, primary_key=True)
+    month = Column(Integer, primary_key=True)
+    ration_stock_id = Column(Integer, primary_key=True)
+    # 0 para linhas de entrada de ração (sem beneficiário)
+    beneficiary_id = Column(Integer, primary_key=True, default=0)
+
+    distributed_amount = Column(Float, nullable=False, default=0)
+    distribution_count = Column(Integer, nullable=False, default=0)
+    input_amount = Column(Float, nullable=False, default=0)
+    input_count = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<MonthlyRollup {self.year}-{self.month:02d} ration={self.ration_stock_id} beneficiary={self.beneficiary_id}>"
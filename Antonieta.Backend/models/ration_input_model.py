@@ -9,7 +9,7 @@ class RationInput(Base):
     id = Column(Integer, primary_key=True, index=True)
     ration_stock_id = Column(Integer, ForeignKey('ration_stock.id'), index=True)
     amount = Column(Float, index=True)
-    date = Column(DateTime, nullable=False)
+    date = Column(DateTime, nullable=False, index=True)
     description = Column(String, index=True)
     ration_stock = relationship("RationStock", back_populates="inputs")
     
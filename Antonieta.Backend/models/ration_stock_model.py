@@ -10,6 +10,7 @@ class RationStock(Base):
     name = Column(String, unique=True, index=True)  # Nome/Tipo da ração
     description = Column(String, index=True)
     unit = Column(String, index=True)
+    # Projeção do último saldo do livro-razão (stock_movement), mantida pelo stock_service
     stock = Column(Float, index=True)
     distributions = relationship("Distribution", back_populates="ration")
     inputs = relationship("RationInput", back_populates="ration_stock")
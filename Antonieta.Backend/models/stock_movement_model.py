@@ -0,0 +1,47 @@
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String, UniqueConstraint
+from database import Base
+
+class StockMovement(Base):
+    """
+    Livro-razão de estoque, somente de acréscimo: uma linha por entrada,
+    distribuição ou ajuste, com o saldo e os totais acumulados da ração
+    após o movimento. RationStock.stock é a projeção do último saldo.
+
+    Cada linha funciona como um checkpoint: o saldo em uma data e os totais
+    entre duas datas saem de uma busca no índice, sem somar o histórico.
+
+    A linha do tempo é a do registro (recorded_at: quando o estoque mudou),
+    a mesma em que os saldos são acumulados; a data informada na entrada ou
+    distribuição fica em reference_date.
+    """
+    __tablename__ = 'stock_movement'
+    __table_args__ = (
+        # Sequência por ração: ordem de aplicação dos movimentos
+        UniqueConstraint("ration_stock_id", "sequence", name="uq_stock_movement_ration_sequence"),
+        # Saldo em uma data e movimentos em um período
+        Index("ix_stock_movement_ration_recorded", "ration_stock_id", "recorded_at", "sequence"),
+        # Movimentos de uma entrada/distribuição (reconciliação com as tabelas de origem)
+        Index("ix_stock_movement_kind_source", "kind", "source_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    ration_stock_id = Column(Integer, ForeignKey('ration_stock.id', ondelete="CASCADE"), nullable=False)
+    sequence = Column(Integer, nullable=False)
+    # opening, input, distribution ou adjustment
+    kind = Column(String, nullable=False)
+    # ID da entrada (input) ou da distribuição (distribution) que originou o movimento
+    source_id = Column(Integer, nullable=True)
+    # Data informada na entrada/distribuição de origem (pode ser retroativa)
+    reference_date = Column(DateTime, nullable=True)
+
+    delta = Column(Float, nullable=False)
+    balance = Column(Float, nullable=False)
+    total_in = Column(Float, nullable=False, default=0)
+    total_out = Column(Float, nullable=False, default=0)
+
+    # Momento em que o estoque mudou (base das consultas "saldo em"); na
+    # reconstrução a partir do histórico, o created_at da origem
+    recorded_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f"<StockMovement ration={self.ration_stock_id} #{self.sequence} {self.kind} {self.delta:+} = {self.balance}>"
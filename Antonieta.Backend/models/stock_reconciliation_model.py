@@ -0,0 +1,25 @@
+from sqlalchemy import Column, DateTime, Integer
+from database import Base
+
+class StockReconciliationCheckpoint(Base):
+    """
+    Ponto de parada da reconciliação de estoque (linha única, id = 1):
+    os maiores IDs de entradas, distribuições e movimentos já verificados.
+    Cada execução verifica apenas o que veio depois deles.
+    """
+    __tablename__ = 'stock_reconciliation_checkpoint'
+
+    id = Column(Integer, primary_key=True)
+    last_input_id = Column(Integer, nullable=False, default=0)
+    last_distribution_id = Column(Integer, nullable=False, default=0)
+    last_movement_id = Column(Integer, nullable=False, default=0)
+
+    last_run_at = Column(DateTime(timezone=True), nullable=True)
+    # Divergências encontradas e não corrigidas na última execução
+    last_drift_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return (
+            f"<StockReconciliationCheckpoint input={self.last_input_id} "
+            f"distribution={self.last_distribution_id} movement={self.last_movement_id}>"
+        )
@@ -0,0 +1,80 @@
+"""
+Script para reconstruir ou verificar a tabela monthly_rollup (totais mensais
+materializados de distribuições e entradas de ração).
+
+Uso:
+    python rebuild_monthly_rollup.py            # reconstrói a tabela
+    python rebuild_monthly_rollup.py --verify   # apenas compara com as tabelas de origem
+"""
+
+import argparse
+import sys
+from database import get_db
+
+# Importar todos os modelos para evitar problemas de referência circular
+import models.user_model  # noqa: F401
+import models.ration_stock_model  # noqa: F401
+import models.ration_input_model  # noqa: F401
+import models.beneficiary_model  # noqa: F401
+import models.distribution_model  # noqa: F401
+import models.audit_log_model  # noqa: F401
+import models.monthly_rollup_model  # noqa: F401
+
+from services import monthly_rollup_service
+
+def rebuild():
+    """Apaga e recalcula todos os totais mensais"""
+    
+    db = next(get_db())
+    
+    try:
+        print("\n🔄 Reconstruindo totais mensais...")
+        rows = monthly_rollup_service.rebuild_rollup(db)
+        db.commit()
+        print("\n✅ Operação concluída com sucesso!")
+        print(f"  - Linhas gravadas: {rows}")
+    except Exception as e:
+        db.rollback()
+        print(f"\n❌ Erro ao reconstruir totais mensais: {str(e)}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+def verify():
+    """Compara os totais mensais gravados com o recálculo a partir das tabelas de origem"""
+    
+    db = next(get_db())
+    
+    try:
+        print("\n🔍 Verificando totais mensais...")
+        mismatches = monthly_rollup_service.verify_rollup(db)
+        
+        if not mismatches:
+            print("\n✅ Totais mensais consistentes com as tabelas de origem.")
+            return
+        
+        print(f"\n⚠️  {len(mismatches)} divergência(s) encontrada(s):")
+        for mismatch in mismatches:
+            print(
+                f"  - {mismatch['year']}-{mismatch['month']:02d} "
+                f"ração={mismatch['ration_stock_id']} beneficiário={mismatch['beneficiary_id']} "
+                f"{mismatch['column']}: esperado={mismatch['expected']} gravado={mismatch['stored']}"
+            )
+        print("\n💡 Execute 'python rebuild_monthly_rollup.py' para corrigir.")
+        sys.exit(2)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconstrói ou verifica a tabela monthly_rollup")
+    parser.add_argument("--verify", action="store_true", help="Apenas verifica, sem alterar dados")
+    args = parser.parse_args()
+    
+    print("=" * 60)
+    print("🗄️  Script de Totais Mensais (monthly_rollup)")
+    print("=" * 60)
+    
+    if args.verify:
+        verify()
+    else:
+        rebuild()
@@ -0,0 +1,104 @@
+"""
+Reconciliação incremental do estoque: confere o saldo de cada ração contra
+o livro-razão (stock_movement) e as entradas/distribuições novas desde a
+última execução contra os seus movimentos. O ponto de parada fica na
+tabela stock_reconciliation_checkpoint, então execuções periódicas
+verificam apenas o que mudou.
+
+Uso:
+    python reconcile_stock.py [--repair] [--full]
+
+Retorna 2 se restarem divergências não corrigidas (útil em cron/CI).
+"""
+
+import argparse
+import asyncio
+import sys
+from database import AsyncSessionLocal, async_engine
+
+# Importar todos os modelos para evitar problemas de referência circular
+import models.user_model  # noqa: F401
+import models.ration_stock_model  # noqa: F401
+import models.ration_input_model  # noqa: F401
+import models.beneficiary_model  # noqa: F401
+import models.distribution_model  # noqa: F401
+import models.audit_log_model  # noqa: F401
+import models.monthly_rollup_model  # noqa: F401
+import models.stock_movement_model  # noqa: F401
+import models.stock_reconciliation_model  # noqa: F401
+
+from services import cache_service
+from services.cache_service import TABLE_RATION_STOCK
+from services.stock_reconciliation_service import DRIFT_CHAIN, DRIFT_PROJECTION, reconcile_stock
+from services.stock_service import run_stock_transaction
+
+async def reconcile(db, repair: bool, full: bool) -> dict:
+    """Uma tentativa: todas as leituras da execução sobre o mesmo snapshot"""
+    if async_engine.dialect.name == "postgresql":
+        await db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    return await reconcile_stock(db, repair=repair, full=full)
+
+async def run(repair: bool, full: bool) -> dict:
+    async with AsyncSessionLocal() as db:
+        report = await run_stock_transaction(db, reconcile, repair, full)
+    if any(item.get("repaired") for item in report["drift"]):
+        # Saldos corrigidos: invalida o cache e as ETags de ration_stock
+        # (efetivo entre processos com CACHE_BACKEND=redis)
+        await cache_service.invalidate(TABLE_RATION_STOCK)
+    return report
+
+def describe(item: dict) -> str:
+    if item["type"] == DRIFT_PROJECTION:
+        return f"saldo {item['recorded']} na ração, {item['expected']} no livro-razão"
+    if item["type"] == DRIFT_CHAIN:
+        return f"livro-razão #{item['sequence']}: {item['detail']}"
+    return (
+        f"{item['kind']} {item['source_id']}: esperado {item['expected']:+}, "
+        f"movimentado {item['recorded']:+}"
+    )
+
+async def main(args) -> int:
+    print("=" * 60)
+    print(f"🔎 Reconciliação de estoque ({'completa' if args.full else 'incremental'}"
+          f"{', com correção' if args.repair else ''})")
+    print("=" * 60)
+
+    report = await run(args.repair, args.full)
+
+    checked = report["checked"]
+    print(f"\n📊 Verificados: {checked['movements']} movimentos, "
+          f"{checked['inputs']} entradas, {checked['distributions']} distribuições "
+          f"em {report['duration_ms']} ms")
+
+    by_ration = {}
+    for item in report["drift"]:
+        by_ration.setdefault(item["ration_stock_id"], []).append(item)
+
+    for ration_stock_id, items in sorted(by_ration.items()):
+        print(f"\n⚠️  Ração {ration_stock_id}:")
+        for item in items:
+            status = ""
+            if "repaired" in item:
+                status = " ✅ corrigido" if item["repaired"] else " ❌ não corrigido"
+            print(f"  - [{item['type']}] {describe(item)}{status}")
+
+    checkpoint = report["checkpoint"]
+    print(f"\n📌 Checkpoint: entrada {checkpoint['last_input_id']}, "
+          f"distribuição {checkpoint['last_distribution_id']}, movimento {checkpoint['last_movement_id']}")
+
+    if not report["drift"]:
+        print("\n✅ Estoque consistente.")
+        return 0
+    if report["unresolved"]:
+        print(f"\n❌ {report['unresolved']} divergência(s) sem correção.")
+        if not args.repair:
+            print("💡 Execute com --repair para corrigir saldos e movimentos faltantes.")
+        return 2
+    print(f"\n✅ {len(report['drift'])} divergência(s) corrigida(s).")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconciliação incremental do estoque com o livro-razão")
+    parser.add_argument("--repair", action="store_true", help="Corrige as divergências encontradas")
+    parser.add_argument("--full", action="store_true", help="Ignora o checkpoint e verifica todo o histórico")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -12,12 +12,7 @@ import sys
 import random
 
 # Importar todos os modelos
-import models.user_model
-import models.ration_stock_model
-import models.ration_input_model
-import models.beneficiary_model
-import models.distribution_model
-import models.audit_log_model
+import models.monthly_rollup_model  # noqa: F401
 
 from models.user_model import User
 from models.ration_stock_model import RationStock
@@ -25,6 +20,9 @@ from models.ration_input_model import RationInput
 from models.beneficiary_model import Beneficiary
 from models.distribution_model import Distribution
 from models.audit_log_model import AuditLog
+from models.stock_movement_model import StockMovement
+from services import monthly_rollup_service
+from services import stock_ledger_service
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=12)
 
@@ -36,6 +34,7 @@ def clear_database(db):
     db.query(AuditLog).delete()  # Primeiro deletar audit_logs
     db.query(Distribution).delete()
     db.query(RationInput).delete()
+    db.query(StockMovement).delete()
     db.query(Beneficiary).delete()
     db.query(RationStock).delete()
     db.query(User).delete()
@@ -301,6 +300,12 @@ def main():
             db, rations, old_beneficiaries, new_beneficiaries, admin_user
         )
         
+        # Recalcular totais mensais a partir dos dados criados
+        monthly_rollup_service.rebuild_rollup(db)
+        # Livro-razão de estoque a partir das entradas e distribuições criadas
+        stock_ledger_service.rebuild_ledger(db)
+        db.commit()
+        
         print("\n" + "=" * 60)
         print("✅ BANCO DE DADOS POPULADO COM SUCESSO!")
         print("=" * 60)
@@ -1,4 +1,5 @@
-from typing import Dict, Any, Optional
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
 from sqlalchemy.orm import Session
 from models.user_model import User
 from services.audit_service import AuditService
@@ -141,3 +142,35 @@ class AuditHelper:
             ip_address=client_info["ip_address"],
             user_agent=client_info["user_agent"]
         )
+    
+    @staticmethod
+    def log_login_throttled(
+        db: Session,
+        email: str,
+        attempts: int,
+        scopes: List[str],
+        window: float,
+        first_at: float,
+        last_at: float,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None
+    ):
+        """
+        Registra, de forma agregada, as tentativas de login recusadas pelo
+        limitador para um IP e usuário (uma linha por intervalo de gravação)
+        """
+        AuditService.log_action(
+            db=db,
+            action="LOGIN_THROTTLED",
+            entity_type="User",
+            description=f"{attempts} tentativa(s) de login bloqueada(s) para {email}",
+            changes={
+                "attempts": attempts,
+                "limited_by": scopes,
+                "window_seconds": window,
+                "first_at": datetime.fromtimestamp(first_at, timezone.utc).isoformat(),
+                "last_at": datetime.fromtimestamp(last_at, timezone.utc).isoformat(),
+            },
+            ip_address=ip_address,
+            user_agent=user_agent
+        )
@@ -0,0 +1,115 @@
+import gzip
+import logging
+import os
+import re
+from datetime import date
+from typing import List, Optional
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from database import engine, SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Meses futuros com partição criada antecipadamente
+AUDIT_PARTITION_MONTHS_AHEAD = int(os.getenv('AUDIT_PARTITION_MONTHS_AHEAD', '3'))
+# Meses de logs mantidos no banco antes de arquivar
+AUDIT_RETENTION_MONTHS = int(os.getenv('AUDIT_RETENTION_MONTHS', '12'))
+
+PARTITION_NAME = re.compile(r"^audit_logs_(\d{4})_(\d{2})$")
+
+
+def is_partitioned(db: Session) -> bool:
+    """Indica se audit_logs é uma tabela particionada (PostgreSQL com a migração aplicada)"""
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return bool(db.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('audit_logs'))"
+    )).scalar())
+
+
+def ensure_partitions(db: Session, months_ahead: int = AUDIT_PARTITION_MONTHS_AHEAD) -> None:
+    """Cria as partições do mês atual e dos próximos meses, se ainda não existirem. Não faz commit."""
+    db.execute(text("SELECT audit_logs_ensure_partitions(:months_ahead)"), {"months_ahead": months_ahead})
+
+
+def ensure_current_partitions() -> bool:
+    """
+    Usada na inicialização da aplicação: garante as partições dos próximos
+    meses quando audit_logs é particionada.
+
+    Returns:
+        True se audit_logs é particionada.
+    """
+    db = SessionLocal()
+    try:
+        if not is_partitioned(db):
+            return False
+        ensure_partitions(db)
+        db.commit()
+        return True
+    finally:
+        db.close()
+
+
+def list_partitions(db: Session) -> List[dict]:
+    """Partições mensais ligadas a audit_logs, da mais antiga para a mais recente"""
+    names = db.execute(text("""
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'audit_logs'::regclass
+    """)).scalars().all()
+
+    partitions = []
+    for name in names:
+        match = PARTITION_NAME.match(name)
+        if match:
+            partitions.append({"name": name, "month": date(int(match.group(1)), int(match.group(2)), 1)})
+    return sorted(partitions, key=lambda partition: partition["month"])
+
+
+def retention_cutoff(retention_months: int, today: Optional[date] = None) -> date:
+    """Primeiro dia do mês mais antigo mantido no banco"""
+    today = today or date.today()
+    months = today.year * 12 + (today.month - 1) - retention_months
+    return date(months // 12, months % 12 + 1, 1)
+
+
+def partitions_to_archive(db: Session, retention_months: int = AUDIT_RETENTION_MONTHS) -> List[dict]:
+    cutoff = retention_cutoff(retention_months)
+    return [partition for partition in list_partitions(db) if partition["month"] < cutoff]
+
+
+def archive_partition(partition_name: str, output_dir: str, keep_table: bool = False) -> str:
+    """
+    Exporta uma partição para CSV compactado (gzip) e depois a desanexa de
+    audit_logs e a remove (ou mantém como tabela avulsa com keep_table).
+    A exportação acontece antes de qualquer alteração: se falhar, nada muda.
+
+    Returns:
+        Caminho do arquivo gerado.
+    """
+    if not PARTITION_NAME.match(partition_name):
+        raise ValueError(f"Nome de partição inválido: {partition_name}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"{partition_name}.csv.gz")
+    temporary_path = f"{path}.partial"
+
+    raw_connection = engine.raw_connection()
+    try:
+        cursor = raw_connection.cursor()
+        with gzip.open(temporary_path, "wb") as archive:
+            cursor.copy_expert(f'COPY "{partition_name}" TO STDOUT WITH (FORMAT csv, HEADER true)', archive)
+        raw_connection.commit()
+    finally:
+        raw_connection.close()
+    os.replace(temporary_path, path)
+
+    with engine.begin() as connection:
+        connection.execute(text(f'ALTER TABLE audit_logs DETACH PARTITION "{partition_name}"'))
+        if not keep_table:
+            connection.execute(text(f'DROP TABLE "{partition_name}"'))
+
+    logger.info(f"Partição {partition_name} arquivada em {path}")
+    return path
@@ -3,6 +3,8 @@ from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
 from models.audit_log_model import AuditLog
 from models.user_model import User
+from services.pagination import keyset_paginate, COUNT_NONE
+from services.audit_writer import audit_writer, AUDIT_ASYNC
 import json
 
 class AuditService:
@@ -21,10 +23,14 @@ class AuditService:
         changes: Optional[Dict[str, Any]] = None,
         ip_address: Optional[str] = None,
         user_agent: Optional[str] = None
-    ) -> AuditLog:
+    ) -> None:
         """
         Registra uma ação no log de auditoria
         
+        Com a gravação em lote ativa, a linha é apenas enfileirada e gravada
+        em segundo plano, sem commit na sessão do chamador. Caso contrário
+        (scripts, AUDIT_ASYNC=false), é gravada na hora.
+        
         Args:
             action: Tipo de ação (CREATE, UPDATE, DELETE, LOGIN, etc.)
             entity_type: Tipo de entidade (User, Beneficiary, Distribution, etc.)
@@ -35,38 +41,37 @@ class AuditService:
             ip_address: IP de origem
             user_agent: Informações do cliente
         """
-        audit_log = AuditLog(
-            user_id=user.id if user else None,
-            user_email=user.email if user else None,
-            action=action,
-            entity_type=entity_type,
-            entity_id=entity_id,
-            description=description,
-            changes=changes,
-            ip_address=ip_address,
-            user_agent=user_agent
-        )
-        
-        db.add(audit_log)
+        row = {
+            "user_id": user.id if user else None,
+            "user_email": user.email if user else None,
+            "action": action,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "description": description,
+            "changes": changes,
+            "ip_address": ip_address,
+            "user_agent": user_agent
+        }
+        
+        if AUDIT_ASYNC and audit_writer.running:
+            audit_writer.enqueue(row)
+            return
+        
+        db.add(AuditLog(**row))
         db.commit()
-        db.refresh(audit_log)
-        
-        return audit_log
     
     @staticmethod
-    def get_logs(
+    def _filtered_query(
         db: Session,
         user_id: Optional[int] = None,
         entity_type: Optional[str] = None,
         entity_id: Optional[int] = None,
         action: Optional[str] = None,
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None,
-        limit: int = 100,
-        offset: int = 0
-    ) -> List[AuditLog]:
+        end_date: Optional[datetime] = None
+    ):
         """
-        Busca logs de auditoria com filtros
+        Monta a consulta de logs com os filtros informados
         """
         query = db.query(AuditLog)
         
@@ -88,11 +93,97 @@ class AuditService:
         if end_date:
             query = query.filter(AuditLog.created_at <= end_date)
         
+        return query
+    
+    @staticmethod
+    def _entity_history_query(db: Session, entity_type: str, entity_id: int):
+        """
+        Consulta do histórico de uma entidade (índice ix_audit_logs_entity_created)
+        """
+        return db.query(AuditLog).filter(
+            AuditLog.entity_type == entity_type,
+            AuditLog.entity_id == entity_id
+        ).order_by(AuditLog.created_at.desc())
+    
+    @staticmethod
+    def _user_activity_query(db: Session, user_id: int, days: int = 30):
+        """
+        Consulta da atividade de um usuário nos últimos N dias (índice ix_audit_logs_user_created)
+        """
+        start_date = datetime.utcnow() - timedelta(days=days)
+        
+        return db.query(AuditLog).filter(
+            AuditLog.user_id == user_id,
+            AuditLog.created_at >= start_date
+        ).order_by(AuditLog.created_at.desc())
+    
+    @staticmethod
+    def get_logs(
+        db: Session,
+        user_id: Optional[int] = None,
+        entity_type: Optional[str] = None,
+        entity_id: Optional[int] = None,
+        action: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> List[AuditLog]:
+        """
+        Busca logs de auditoria com filtros
+        """
+        query = AuditService._filtered_query(
+            db,
+            user_id=user_id,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            action=action,
+            start_date=start_date,
+            end_date=end_date
+        )
+        
         query = query.order_by(AuditLog.created_at.desc())
         query = query.offset(offset).limit(limit)
         
         return query.all()
     
+    @staticmethod
+    def get_logs_page(
+        db: Session,
+        user_id: Optional[int] = None,
+        entity_type: Optional[str] = None,
+        entity_id: Optional[int] = None,
+        action: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        after: Optional[str] = None,
+        limit: int = 100,
+        count: str = COUNT_NONE
+    ) -> Dict[str, Any]:
+        """
+        Busca logs de auditoria com paginação por cursor, do mais recente
+        para o mais antigo, ordenando por (created_at, id)
+        """
+        query = AuditService._filtered_query(
+            db,
+            user_id=user_id,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            action=action,
+            start_date=start_date,
+            end_date=end_date
+        )
+        
+        return keyset_paginate(
+            query,
+            order_columns=(AuditLog.created_at, AuditLog.id),
+            after=after,
+            limit=limit,
+            descending=True,
+            count=count,
+            table_name="audit_logs"
+        )
+    
     @staticmethod
     def get_entity_history(
         db: Session,
@@ -102,10 +193,7 @@ class AuditService:
         """
         Obtém todo o histórico de uma entidade específica
         """
-        return db.query(AuditLog).filter(
-            AuditLog.entity_type == entity_type,
-            AuditLog.entity_id == entity_id
-        ).order_by(AuditLog.created_at.desc()).all()
+        return AuditService._entity_history_query(db, entity_type, entity_id).all()
     
     @staticmethod
     def get_user_activity(
@@ -116,12 +204,7 @@ class AuditService:
         """
         Obtém a atividade de um usuário nos últimos N dias
         """
-        start_date = datetime.utcnow() - timedelta(days=days)
-        
-        return db.query(AuditLog).filter(
-            AuditLog.user_id == user_id,
-            AuditLog.created_at >= start_date
-        ).order_by(AuditLog.created_at.desc()).all()
+        return AuditService._user_activity_query(db, user_id, days).all()
     
     @staticmethod
     def count_logs(
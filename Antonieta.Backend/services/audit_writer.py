@@ -0,0 +1,291 @@
+import glob
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from os import getenv
+from typing import Any, Dict, Iterator, List, Optional
+from sqlalchemy import insert
+from database import engine
+from models.audit_log_model import AuditLog
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem lock entre processos
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Configuração da gravação em lote dos logs de auditoria
+AUDIT_ASYNC = getenv('AUDIT_ASYNC', 'true').lower() in ('1', 'true', 'yes')
+AUDIT_QUEUE_SIZE = int(getenv('AUDIT_QUEUE_SIZE', '10000'))
+AUDIT_BATCH_SIZE = int(getenv('AUDIT_BATCH_SIZE', '200'))
+AUDIT_FLUSH_INTERVAL = float(getenv('AUDIT_FLUSH_INTERVAL', '1.0'))
+AUDIT_SPOOL_PATH = getenv('AUDIT_SPOOL_PATH', 'audit_spool.jsonl')
+
+
+class AuditWriter:
+    """
+    Grava os logs de auditoria em segundo plano: as requisições apenas
+    enfileiram a linha e uma thread grava lotes com INSERT de várias linhas,
+    quando o lote enche ou a cada intervalo.
+
+    Se o banco estiver indisponível (ou a fila cheia), as linhas vão para um
+    arquivo local somente de acréscimo (spool), reaplicado no próximo lote
+    gravado com sucesso. No encerramento, a fila é esvaziada antes de sair.
+
+    O spool é compartilhado pelos workers do servidor: acréscimos e
+    reaplicações são serializados por um lock de arquivo (fcntl) em
+    `<spool>.lock`. Para reaplicar, o worker renomeia o spool para um
+    arquivo próprio (`<spool>.replaying.<pid>.<id>`) sob o lock e grava
+    esse arquivo fora dele; novos acréscimos vão para um spool novo.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = AUDIT_QUEUE_SIZE,
+        batch_size: int = AUDIT_BATCH_SIZE,
+        flush_interval: float = AUDIT_FLUSH_INTERVAL,
+        spool_path: str = AUDIT_SPOOL_PATH
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spool_path = spool_path
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._spool_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "enqueued": 0,
+            "written": 0,
+            "batches": 0,
+            "failed_batches": 0,
+            "spooled": 0,
+            "replayed": 0,
+            "queue_full": 0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[counter] += amount
+
+    def start(self) -> None:
+        """Inicia a thread de gravação (idempotente)"""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+        logger.info("Gravação de auditoria em lote iniciada")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Esvazia a fila, grava o que restou e encerra a thread"""
+        if not self.running:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        # Qualquer linha que ainda esteja na fila vai para o spool
+        leftover = self._drain_queue()
+        if leftover:
+            self._spool(leftover)
+        logger.info("Gravação de auditoria em lote encerrada")
+
+    def enqueue(self, row: Dict[str, Any]) -> None:
+        """
+        Enfileira uma linha de AuditLog. Não bloqueia: com a fila cheia,
+        a linha é gravada direto no spool.
+        """
+        row.setdefault("created_at", datetime.now(timezone.utc))
+        try:
+            self._queue.put_nowait(row)
+            self._count("enqueued")
+        except queue.Full:
+            self._count("queue_full")
+            self._spool([row])
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats.update({
+            "running": self.running,
+            "queue_depth": self._queue.qsize(),
+            "queue_size": self._queue.maxsize,
+            "batch_size": self.batch_size,
+            "flush_interval": self.flush_interval,
+            "spool_pending": os.path.exists(self.spool_path) and os.path.getsize(self.spool_path) > 0,
+        })
+        return stats
+
+    def _drain_queue(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        rows = []
+        while limit is None or len(rows) < limit:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+
+    def _run(self) -> None:
+        # Linhas que ficaram no spool de uma execução anterior
+        self._replay_spool()
+        while not self._stop.is_set():
+            batch = self._collect_batch()
+            if batch:
+                self._flush(batch)
+        # Encerramento: gravar tudo o que ainda está na fila
+        while True:
+            batch = self._drain_queue(self.batch_size)
+            if not batch:
+                break
+            self._flush(batch)
+
+    def _collect_batch(self) -> List[Dict[str, Any]]:
+        """Aguarda até encher um lote ou vencer o intervalo de gravação"""
+        batch: List[Dict[str, Any]] = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size and not self._stop.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _insert(self, rows: List[Dict[str, Any]]) -> None:
+        with engine.begin() as connection:
+            connection.execute(insert(AuditLog), rows)
+
+    def _flush(self, rows: List[Dict[str, Any]]) -> None:
+        try:
+            self._insert(rows)
+        except Exception as e:
+            logger.error(f"Falha ao gravar {len(rows)} logs de auditoria, enviando ao spool: {str(e)}")
+            self._count("failed_batches")
+            self._spool(rows)
+            return
+        self._count("batches")
+        self._count("written", len(rows))
+        self._replay_spool()
+
+    @contextmanager
+    def _locked_spool(self) -> Iterator[None]:
+        """Lock do spool entre threads e, com fcntl, entre processos"""
+        with self._spool_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(f"{self.spool_path}.lock", "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _spool(self, rows: List[Dict[str, Any]]) -> None:
+        with self._locked_spool():
+            with open(self.spool_path, "a", encoding="utf-8") as spool:
+                for row in rows:
+                    spool.write(json.dumps(row, default=_json_default, ensure_ascii=False) + "\n")
+                spool.flush()
+                os.fsync(spool.fileno())
+        self._count("spooled", len(rows))
+
+    def _is_orphan(self, claimed_path: str) -> bool:
+        """Arquivo em reaplicação cujo processo já não existe"""
+        if fcntl is None:
+            # Sem lock entre processos o spool pressupõe um único processo
+            return True
+        try:
+            pid = int(claimed_path[len(f"{self.spool_path}.replaying."):].split(".")[0])
+        except ValueError:
+            return True
+        # Só esta thread reaplica neste processo: arquivos com o próprio PID
+        # são de uma execução anterior
+        return pid == os.getpid() or not _pid_alive(pid)
+
+    def _claim_spool(self) -> List[str]:
+        """
+        Move, sob o lock, o spool pendente e os arquivos de reaplicações
+        interrompidas (processo encerrado) para arquivos deste processo.
+        """
+        claimed = []
+        with self._locked_spool():
+            candidates = [
+                path for path in glob.glob(glob.escape(self.spool_path) + ".replaying.*")
+                if self._is_orphan(path)
+            ]
+            if os.path.exists(self.spool_path) and os.path.getsize(self.spool_path) > 0:
+                candidates.append(self.spool_path)
+            for path in candidates:
+                target = f"{self.spool_path}.replaying.{os.getpid()}.{uuid.uuid4().hex[:8]}"
+                try:
+                    os.replace(path, target)
+                except FileNotFoundError:
+                    continue
+                claimed.append(target)
+        return claimed
+
+    def _replay_spool(self) -> None:
+        """Regrava no banco as linhas pendentes no spool"""
+        for path in self._claim_spool():
+            self._replay_file(path)
+
+    def _replay_file(self, path: str) -> None:
+        with open(path, encoding="utf-8") as spool:
+            lines = [line for line in spool if line.strip()]
+        try:
+            rows = [_from_spool(json.loads(line)) for line in lines]
+            # Uma única transação: ou o arquivo inteiro entra, ou nada
+            with engine.begin() as connection:
+                for start in range(0, len(rows), self.batch_size):
+                    connection.execute(insert(AuditLog), rows[start:start + self.batch_size])
+        except Exception as e:
+            logger.warning(f"Spool de auditoria mantido para nova tentativa: {str(e)}")
+            # Devolve as linhas ao spool compartilhado
+            with self._locked_spool():
+                with open(self.spool_path, "a", encoding="utf-8") as spool:
+                    spool.writelines(lines)
+                    spool.flush()
+                    os.fsync(spool.fileno())
+                os.remove(path)
+            return
+        os.remove(path)
+        self._count("replayed", len(rows))
+        logger.info(f"{len(rows)} logs de auditoria do spool gravados no banco")
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _from_spool(row: Dict[str, Any]) -> Dict[str, Any]:
+    if isinstance(row.get("created_at"), str):
+        row["created_at"] = datetime.fromisoformat(row["created_at"])
+    return row
+
+
+audit_writer = AuditWriter()
@@ -3,11 +3,12 @@ from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 from database import get_db
 from models.user_model import User
 from dtos.user_dto import UserCreate, TokenData
+from services.principal_cache import principal_cache
+from services.password_hasher import pwd_context, password_hasher
 from os import getenv
 from dotenv import load_dotenv
 
@@ -17,9 +18,11 @@ SECRET_KEY = getenv('SECRET_KEY', '')
 ALGORITHM = getenv('ALGORITHM', '')
 ACCESS_TOKEN_EXPIRE_MINUTES = int(getenv('ACCESS_TOKEN_EXPIRE_MINUTES', '30'))
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=12)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+# Colunas que não ficam no cache de autenticação (nada após get_current_user as usa)
+PRINCIPAL_EXCLUDED_COLUMNS = {"hashed_password"}
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -29,10 +32,16 @@ def get_password_hash(password: str) -> str:
 def get_user(db: Session, email: str) -> Optional[User]:
     return db.query(User).filter(User.email == email).first()
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
+async def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
+    """
+    Verifica a senha no pool do bcrypt, fora do loop de eventos. Hashes com
+    custo diferente do configurado são refeitos em segundo plano.
+    """
     user = get_user(db, email)
-    if not user or not verify_password(password, user.hashed_password):
+    if not user or not await password_hasher.verify(password, user.hashed_password):
         return None
+    if password_hasher.needs_rehash(user.hashed_password):
+        password_hasher.schedule_rehash(user.id, user.hashed_password, password)
     return user
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -46,6 +55,13 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 async def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
+    """
+    Usuário autenticado pelo token. Em um acerto do principal_cache, o
+    retorno é um User transitório montado a partir do cache: não pertence a
+    nenhuma sessão, não traz hashed_password (None) e não carrega
+    relacionamentos (acesso lazy falha). Para alterar o usuário ou ler outros
+    dados, buscar pelo id na sessão da requisição.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Credenciais inválidas",
@@ -60,11 +76,25 @@ async def get_current_user(db: Session = Depends(get_db), token: str = Depends(o
     except JWTError:
         raise credentials_exception
 
+    # Usuário já resolvido para este token: nenhuma consulta ao banco
+    cached_principal = principal_cache.get(token)
+    if cached_principal is not None:
+        return User(**cached_principal)
+
     user = get_user(db, email=token_data.email)
     if user is None:
         raise credentials_exception
+    principal_cache.put(token, principal_snapshot(user), token_exp=payload.get("exp"))
     return user
 
+def principal_snapshot(user: User) -> dict:
+    """Valores das colunas do usuário guardados no cache de autenticação, sem o hash da senha"""
+    return {
+        column.key: getattr(user, column.key)
+        for column in User.__table__.columns
+        if column.key not in PRINCIPAL_EXCLUDED_COLUMNS
+    }
+
 def create_user(db: Session, user: UserCreate) -> User:
     hashed_password = get_password_hash(user.password)
     db_user = User(
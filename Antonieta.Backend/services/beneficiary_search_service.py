@@ -0,0 +1,199 @@
+import threading
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import func, or_, literal
+from sqlalchemy.orm import Session
+from models.beneficiary_model import Beneficiary
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Campos indexados para a busca textual de beneficiários
+SEARCH_FIELDS = ("name", "document", "contact", "neighborhood")
+
+# Similaridade mínima (pg_trgm word_similarity) para aceitar um resultado aproximado
+MIN_WORD_SIMILARITY = 0.4
+
+
+def normalize_search_text(value: Optional[str]) -> str:
+    """
+    Normaliza texto para busca: remove acentos, converte para minúsculas
+    e colapsa espaços. Deve produzir o mesmo resultado que a função SQL
+    beneficiary_search_text criada na migração.
+    """
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", value)
+    without_accents = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(without_accents.lower().split())
+
+
+def _trigrams(value: str) -> Set[str]:
+    """Trigramas de um documento indexado, com as bordas do texto"""
+    padded = f"  {value} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _query_trigrams(value: str) -> Set[str]:
+    """
+    Trigramas de um termo de busca, sem bordas: o termo pode aparecer em
+    qualquer posição do documento (outra palavra, prefixo ou meio de
+    palavra), então apenas os trigramas internos são exigidos.
+    """
+    return {value[i:i + 3] for i in range(len(value) - 2)}
+
+
+class BeneficiarySearchIndex:
+    """
+    Índice de trigramas em memória usado quando o banco não é PostgreSQL
+    (ex.: SQLite nos testes). É construído sob demanda a partir da tabela
+    beneficiary e invalidado pelos serviços de escrita.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._documents: Dict[int, Tuple[str, str]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._loaded = False
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._documents = {}
+            self._postings = {}
+            self._loaded = False
+
+    def _ensure_loaded(self, db: Session) -> None:
+        if self._loaded:
+            return
+        rows = db.query(
+            Beneficiary.id,
+            *[getattr(Beneficiary, field) for field in SEARCH_FIELDS]
+        ).filter(Beneficiary.old == False).all()
+        self.load(rows)
+
+    def load(self, rows: Iterable[Any]) -> None:
+        """
+        Indexa as linhas informadas (id e os campos de SEARCH_FIELDS),
+        substituindo o conteúdo atual. Chamado sob o lock do índice por
+        search; chamadas diretas (ex.: check_beneficiary_search.py) não
+        podem concorrer com buscas.
+        """
+        documents = {}
+        postings: Dict[str, Set[int]] = {}
+        for row in rows:
+            name = normalize_search_text(row.name)
+            text = normalize_search_text(" ".join(getattr(row, field) or "" for field in SEARCH_FIELDS))
+            documents[row.id] = (name, text)
+            for trigram in _trigrams(text):
+                postings.setdefault(trigram, set()).add(row.id)
+
+        self._documents = documents
+        self._postings = postings
+        self._loaded = True
+
+    def search(self, db: Session, query: str) -> List[int]:
+        """
+        Retorna os ids que contêm o termo normalizado, do mais relevante
+        para o menos relevante (nome começando pelo termo, depois nome
+        contendo o termo, depois demais campos).
+        """
+        with self._lock:
+            self._ensure_loaded(db)
+
+            trigrams = _query_trigrams(query)
+            if trigrams:
+                candidate_sets = sorted(
+                    (self._postings.get(trigram, set()) for trigram in trigrams),
+                    key=len
+                )
+                candidates = set.intersection(*candidate_sets) if candidate_sets else set()
+            else:
+                candidates = set(self._documents)
+
+            ranked = []
+            for beneficiary_id in candidates:
+                name, text = self._documents[beneficiary_id]
+                if query not in text:
+                    continue
+                if name.startswith(query):
+                    rank = 0
+                elif query in name:
+                    rank = 1
+                else:
+                    rank = 2
+                ranked.append((rank, name, beneficiary_id))
+
+        ranked.sort()
+        return [beneficiary_id for _, _, beneficiary_id in ranked]
+
+
+search_index = BeneficiarySearchIndex()
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _search_postgres(db: Session, query: str, skip: int, limit: int) -> Tuple[List[Beneficiary], int]:
+    """
+    Busca usando o índice GIN pg_trgm sobre beneficiary_search_text(...).
+    Aceita correspondência por substring ou por similaridade de palavra,
+    ordenando pela similaridade.
+    """
+    document = func.beneficiary_search_text(
+        *[getattr(Beneficiary, field) for field in SEARCH_FIELDS]
+    )
+    term = literal(query)
+    name_prefix = func.beneficiary_search_text(Beneficiary.name, None, None, None).like(
+        _escape_like(query) + "%", escape="\\"
+    )
+
+    filtered = db.query(Beneficiary).filter(
+        Beneficiary.old == False,
+        or_(
+            document.like("%" + _escape_like(query) + "%", escape="\\"),
+            term.op("<%")(document)
+        )
+    )
+
+    total = filtered.order_by(None).count()
+    beneficiaries = filtered.order_by(
+        name_prefix.desc(),
+        func.word_similarity(term, document).desc(),
+        Beneficiary.name,
+        Beneficiary.id
+    ).offset(skip).limit(limit).all()
+    return beneficiaries, total
+
+
+def _search_in_process(db: Session, query: str, skip: int, limit: int) -> Tuple[List[Beneficiary], int]:
+    ids = search_index.search(db, query)
+    page_ids = ids[skip:skip + limit]
+    if not page_ids:
+        return [], len(ids)
+
+    rows = db.query(Beneficiary).filter(Beneficiary.id.in_(page_ids)).all()
+    by_id = {row.id: row for row in rows}
+    return [by_id[beneficiary_id] for beneficiary_id in page_ids if beneficiary_id in by_id], len(ids)
+
+
+async def search_beneficiaries_service(db: AsyncSession, q: str, skip: int = 0, limit: int = 20) -> Dict[str, Any]:
+    """
+    Busca beneficiários por nome, documento, contato ou bairro,
+    sem diferenciar maiúsculas/minúsculas nem acentos.
+
+    Args:
+        q: Termo de busca.
+        skip: Número de resultados para pular.
+        limit: Número máximo de resultados.
+
+    Returns:
+        Dicionário com items (ordenados por relevância), total, skip e limit.
+    """
+    query = normalize_search_text(q)
+    if not query:
+        return {"items": [], "total": 0, "skip": skip, "limit": limit}
+
+    if db.get_bind().dialect.name == "postgresql":
+        items, total = await db.run_sync(_search_postgres, query, skip, limit)
+    else:
+        items, total = await db.run_sync(_search_in_process, query, skip, limit)
+    return {"items": items, "total": total, "skip": skip, "limit": limit}
@@ -1,29 +1,70 @@
-from typing import Dict, Any, List, Optional, Tuple
-from sqlalchemy import func
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from sqlalchemy import func, select
 from models.beneficiary_model import Beneficiary
-from sqlalchemy.orm import Session
-from database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from services.pagination import keyset_paginate, COUNT_NONE
+from services.field_selection import columns_for, rows_to_dicts
+from services.beneficiary_search_service import search_index
+from services import cache_service
+from services.cache_service import TABLE_BENEFICIARY
 from dtos.create_beneficiary_dto import create_beneficiary_dto
 from dtos.update_beneficiary_dto import update_beneficiary_dto
 
-async def get_all_beneficiaries_service(skip: int = 0, limit: int = 1000) -> Tuple[List[Beneficiary], int]:
+async def get_all_beneficiaries_service(db: AsyncSession, skip: int = 0, limit: int = 1000, fields: Optional[Sequence[str]] = None) -> Tuple[List[Any], int]:
     """
     Retorna todos os beneficiários do banco de dados.
-    Obtém a sessão do DB internamente.
+    Usa a sessão da requisição (injetada pelo controller).
 
     Returns:
-        Uma lista de objetos Beneficiary.
+        Uma lista de objetos Beneficiary ou, com `fields`, de dicionários
+        apenas com as colunas pedidas.
     """
-    db = next(get_db())
-    try:
-        query = db.query(Beneficiary).filter(Beneficiary.old == False)
-        beneficiaries = query.offset(skip).limit(limit).all()
-        total_beneficiaries = db.query(func.count(Beneficiary.id)).filter(Beneficiary.old == False).scalar()
-        return beneficiaries, total_beneficiaries
-    finally:
-        db.close()
-
-async def get_beneficiary_by_id_service(beneficiary_id: int) -> Optional[Beneficiary]:
+    if fields:
+        # Projeção: apenas as colunas pedidas, retornadas como dicionários
+        result = await db.execute(
+            select(*columns_for(Beneficiary, fields)).where(Beneficiary.old == False).offset(skip).limit(limit)
+        )
+        beneficiaries = rows_to_dicts(result)
+    else:
+        result = await db.execute(
+            select(Beneficiary).where(Beneficiary.old == False).offset(skip).limit(limit)
+        )
+        beneficiaries = result.scalars().all()
+    total_beneficiaries = await db.scalar(
+        select(func.count(Beneficiary.id)).where(Beneficiary.old == False)
+    )
+    return beneficiaries, total_beneficiaries
+
+async def get_beneficiaries_page_service(db: AsyncSession, after: Optional[str] = None, limit: int = 100, count: str = COUNT_NONE, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """
+    Retorna uma página de beneficiários usando paginação por cursor (keyset),
+    ordenada por id. Evita OFFSET e, por padrão, a contagem total.
+
+    Args:
+        after: Cursor opaco retornado na página anterior (vazio para a primeira página).
+        limit: Número máximo de registros da página.
+        count: "none", "exact" ou "estimated".
+        fields: Colunas a retornar (projeção); None retorna o objeto completo.
+
+    Returns:
+        Dicionário com items, next_cursor, limit e total.
+    """
+    entities = columns_for(Beneficiary, fields) if fields else (Beneficiary,)
+    page = await db.run_sync(
+        lambda session: keyset_paginate(
+            session.query(*entities).filter(Beneficiary.old == False),
+            order_columns=(Beneficiary.id,),
+            after=after,
+            limit=limit,
+            count=count,
+            table_name="beneficiary"
+        )
+    )
+    if fields:
+        page["items"] = rows_to_dicts(page["items"])
+    return page
+
+async def get_beneficiary_by_id_service(db: AsyncSession, beneficiary_id: int) -> Optional[Beneficiary]:
     """
     Retorna um beneficiário específico do banco de dados.
 
@@ -33,17 +74,14 @@ async def get_beneficiary_by_id_service(beneficiary_id: int) -> Optional[Benefic
     Returns:
         Um objeto Beneficiary ou None se não encontrado.
     """
-    db = next(get_db())
-    try:
-        beneficiary = db.query(Beneficiary).filter(
+    return await db.scalar(
+        select(Beneficiary).where(
             Beneficiary.id == beneficiary_id,
             Beneficiary.old == False
-        ).first()
-        return beneficiary
-    finally:
-        db.close()
+        )
+    )
 
-async def create_beneficiary_service(beneficiary_dto: create_beneficiary_dto) -> Beneficiary:
+async def create_beneficiary_service(db: AsyncSession, beneficiary_dto: create_beneficiary_dto) -> Beneficiary:
     """
     Cria um novo beneficiário no banco de dados.
 
@@ -56,16 +94,14 @@ async def create_beneficiary_service(beneficiary_dto: create_beneficiary_dto) ->
 
     db_beneficiary = Beneficiary(**beneficiary_dto.model_dump())
 
-    db = next(get_db())
-    try:
-        db.add(db_beneficiary)
-        db.commit()
-        db.refresh(db_beneficiary)
-        return db_beneficiary
-    finally:
-        db.close()
+    db.add(db_beneficiary)
+    await db.commit()
+    await db.refresh(db_beneficiary)
+    search_index.invalidate()
+    await cache_service.invalidate(TABLE_BENEFICIARY)
+    return db_beneficiary
 
-async def update_beneficiary_service(beneficiary_dto: update_beneficiary_dto) -> Optional[Beneficiary]:
+async def update_beneficiary_service(db: AsyncSession, beneficiary_dto: update_beneficiary_dto) -> Optional[Beneficiary]:
     """
     Atualiza um beneficiário existente no banco de dados.
 
@@ -75,24 +111,24 @@ async def update_beneficiary_service(beneficiary_dto: update_beneficiary_dto) ->
     Returns:
         O objeto Beneficiary atualizado ou None se não encontrado.
     """
-    db = next(get_db())
-    try:
-        beneficiary = db.query(Beneficiary).filter(
+    beneficiary = await db.scalar(
+        select(Beneficiary).where(
             Beneficiary.id == beneficiary_dto.id,
             Beneficiary.old == False
-        ).first()
-        if beneficiary:
-            update_data = beneficiary_dto.model_dump(exclude={'id'}, exclude_unset=True)
-
-            for key, value in update_data.items():
-                setattr(beneficiary, key, value)
-            db.commit()
-            db.refresh(beneficiary)
-        return beneficiary
-    finally:
-        db.close()
-
-async def delete_beneficiary_service(beneficiary_id: int) -> bool:
+        )
+    )
+    if beneficiary:
+        update_data = beneficiary_dto.model_dump(exclude={'id'}, exclude_unset=True)
+
+        for key, value in update_data.items():
+            setattr(beneficiary, key, value)
+        await db.commit()
+        await db.refresh(beneficiary)
+        search_index.invalidate()
+        await cache_service.invalidate(TABLE_BENEFICIARY)
+    return beneficiary
+
+async def delete_beneficiary_service(db: AsyncSession, beneficiary_id: int) -> bool:
     """
     Deleta um beneficiário do banco de dados.
 
@@ -102,16 +138,16 @@ async def delete_beneficiary_service(beneficiary_id: int) -> bool:
     Returns:
         True se o beneficiário foi deletado, False caso contrário.
     """
-    db = next(get_db())
-    try:
-        beneficiary = db.query(Beneficiary).filter(
+    beneficiary = await db.scalar(
+        select(Beneficiary).where(
             Beneficiary.id == beneficiary_id,
             Beneficiary.old == False
-        ).first()
-        if not beneficiary:
-            return False
-        db.delete(beneficiary)
-        db.commit()
-        return True
-    finally:
-        db.close()
\ No newline at end of file
+        )
+    )
+    if not beneficiary:
+        return False
+    await db.delete(beneficiary)
+    await db.commit()
+    search_index.invalidate()
+    await cache_service.invalidate(TABLE_BENEFICIARY)
+    return True
@@ -0,0 +1,224 @@
+import functools
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from os import getenv
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Backend do cache: memory (LRU em processo), redis ou none (desativado)
+CACHE_BACKEND = getenv('CACHE_BACKEND', 'memory').lower()
+CACHE_TTL = float(getenv('CACHE_TTL', '30'))
+CACHE_MAX_ENTRIES = int(getenv('CACHE_MAX_ENTRIES', '1024'))
+CACHE_REDIS_URL = getenv('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+CACHE_KEY_PREFIX = getenv('CACHE_KEY_PREFIX', 'antonieta:cache')
+
+# Tabelas usadas como etiquetas de invalidação
+TABLE_BENEFICIARY = "beneficiary"
+TABLE_DISTRIBUTION = "distribution"
+TABLE_RATION_INPUT = "ration_input"
+TABLE_RATION_STOCK = "ration_stock"
+
+
+class CacheStats:
+    """Contadores de acertos, faltas e invalidações do cache"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "errors": self.errors,
+            }
+
+
+class MemoryCache:
+    """
+    Cache LRU em processo com TTL. As etiquetas (tabelas) têm um número de
+    versão que entra na chave: invalidar uma tabela incrementa a versão e
+    as entradas antigas deixam de ser encontradas (e saem pelo LRU).
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def versions(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        with self._lock:
+            return tuple(self._versions.get(tag, 0) for tag in tags)
+
+    async def bump(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+
+    def info(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "max_entries": self.max_entries}
+
+
+class RedisCache:
+    """
+    Cache em Redis (ou compatível), compartilhado entre processos.
+    Requer o pacote redis, instalado à parte.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str = CACHE_REDIS_URL, prefix: str = CACHE_KEY_PREFIX):
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis requer o pacote redis (pip install redis)") from e
+        self.client = redis_asyncio.from_url(url)
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Tuple[bool, Any]:
+        raw = await self.client.get(f"{self.prefix}:{key}")
+        if raw is None:
+            return False, None
+        return True, json.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        await self.client.set(f"{self.prefix}:{key}", json.dumps(value, default=_json_default), px=int(ttl * 1000))
+
+    async def versions(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        tags = list(tags)
+        if not tags:
+            return ()
+        values = await self.client.mget([f"{self.prefix}:version:{tag}" for tag in tags])
+        return tuple(int(value or 0) for value in values)
+
+    async def bump(self, tags: Iterable[str]) -> None:
+        pipeline = self.client.pipeline()
+        for tag in tags:
+            pipeline.incr(f"{self.prefix}:version:{tag}")
+        await pipeline.execute()
+
+    def info(self) -> dict:
+        return {"prefix": self.prefix}
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _build_backend():
+    if CACHE_BACKEND == "none":
+        return None
+    if CACHE_BACKEND == "redis":
+        return RedisCache()
+    return MemoryCache()
+
+
+backend = _build_backend()
+stats = CacheStats()
+
+
+def _make_key(name: str, args: tuple, kwargs: dict, tags: Tuple[str, ...], versions: Tuple[int, ...]) -> str:
+    arguments = json.dumps([args, sorted(kwargs.items())], default=_json_default, separators=(",", ":"))
+    version = ",".join(f"{tag}={number}" for tag, number in zip(tags, versions))
+    return f"{name}:{arguments}:{version}"
+
+
+def cached(*tags: str, ttl: Optional[float] = None):
+    """
+    Decorador de leitura com cache para métodos assíncronos de serviço.
+    A chave cobre o nome do método, seus argumentos (exceto self) e a versão
+    de cada tabela em `tags`, invalidadas por invalidate().
+
+    Falhas do backend não interrompem a leitura: o valor é recalculado.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            if backend is None:
+                return await method(self, *args, **kwargs)
+
+            try:
+                versions = await backend.versions(tags)
+                key = _make_key(method.__qualname__, args, kwargs, tags, versions)
+                found, value = await backend.get(key)
+            except Exception as e:
+                logger.warning(f"Falha ao ler do cache ({method.__qualname__}): {str(e)}")
+                stats.increment("errors")
+                return await method(self, *args, **kwargs)
+
+            if found:
+                stats.increment("hits")
+                return value
+
+            stats.increment("misses")
+            value = await method(self, *args, **kwargs)
+            try:
+                await backend.set(key, value, CACHE_TTL if ttl is None else ttl)
+            except Exception as e:
+                logger.warning(f"Falha ao gravar no cache ({method.__qualname__}): {str(e)}")
+                stats.increment("errors")
+            return value
+        return wrapper
+    return decorator
+
+
+async def invalidate(*tags: str) -> None:
+    """Invalida as entradas que dependem das tabelas informadas. Chamar após o commit."""
+    if backend is None:
+        return
+    try:
+        await backend.bump(tags)
+        stats.increment("invalidations")
+    except Exception as e:
+        logger.warning(f"Falha ao invalidar o cache ({', '.join(tags)}): {str(e)}")
+        stats.increment("errors")
+
+
+def cache_status() -> dict:
+    """Backend em uso, configuração e contadores"""
+    status = {"backend": backend.name if backend else "none", "ttl": CACHE_TTL}
+    if backend:
+        status.update(backend.info())
+    status.update(stats.snapshot())
+    return status
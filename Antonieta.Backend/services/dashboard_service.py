@@ -1,5 +1,5 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func, extract
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, and_, select
 from datetime import datetime
 from typing import List, Tuple
 
@@ -7,109 +7,177 @@ from models.ration_input_model import RationInput
 from models.distribution_model import Distribution
 from models.ration_stock_model import RationStock
 from models.beneficiary_model import Beneficiary
+from models.monthly_rollup_model import MonthlyRollup
+from services.period import Period
+from services.cache_service import cached, TABLE_BENEFICIARY, TABLE_DISTRIBUTION, TABLE_RATION_INPUT, TABLE_RATION_STOCK
+
+def period_distributions_query(period: Period):
+    """Soma e quantidade das distribuições atuais no período"""
+    return select(
+        func.coalesce(func.sum(Distribution.amount), 0),
+        func.count(Distribution.id)
+    ).where(
+        Distribution.old == False,
+        period.filter(Distribution.date)
+    )
+
+def period_inputs_query(period: Period):
+    """Soma e quantidade das entradas de ração no período"""
+    return select(
+        func.coalesce(func.sum(RationInput.amount), 0),
+        func.count(RationInput.id)
+    ).where(
+        period.filter(RationInput.date)
+    )
 
 class DashboardService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def get_total_inputs_month(self) -> dict:
-        current_date = datetime.now()
+    @cached(TABLE_RATION_INPUT)
+    async def get_total_inputs_month(self) -> dict:
+        month = Period.current_month()
         
-        total_amount = self.db.query(
-            func.sum(RationInput.amount).label('total_amount')
-        ).filter(
-            extract('month', RationInput.date) == current_date.month,
-            extract('year', RationInput.date) == current_date.year
-        ).scalar()
+        total_amount = await self.db.scalar(
+            select(func.sum(MonthlyRollup.input_amount).label('total_amount')).where(
+                month.month_filter(MonthlyRollup.year, MonthlyRollup.month)
+            )
+        )
 
         return {
             "total_amount": total_amount or 0,
-            "month": current_date.month,
-            "year": current_date.year
+            "month": month.start.month,
+            "year": month.start.year
         }
     
-    def get_total_distributions_month(self) -> dict:
-        current_date = datetime.now()
+    @cached(TABLE_DISTRIBUTION)
+    async def get_total_distributions_month(self) -> dict:
+        month = Period.current_month()
         
-        total_amount = self.db.query(
-            func.sum(Distribution.amount).label('total_amount')
-        ).filter(
-            Distribution.old == False,
-            extract('month', Distribution.date) == current_date.month,
-            extract('year', Distribution.date) == current_date.year
-        ).scalar()
+        total_amount = await self.db.scalar(
+            select(func.sum(MonthlyRollup.distributed_amount).label('total_amount')).where(
+                month.month_filter(MonthlyRollup.year, MonthlyRollup.month)
+            )
+        )
 
         return {
             "total_amount": total_amount or 0,
-            "month": current_date.month,
-            "year": current_date.year
+            "month": month.start.month,
+            "year": month.start.year
         }
     
-    def get_current_total_stock(self) -> dict:
-        total_inputs = self.db.query(
-            func.sum(RationInput.amount).label('total_inputs')
-        ).scalar()
-
-        total_distributions = self.db.query(
-            func.sum(Distribution.amount).label('total_distributions')
-        ).filter(Distribution.old == False).scalar()
-
-        current_stock = (total_inputs or 0) - (total_distributions or 0)
+    @cached(TABLE_RATION_STOCK)
+    async def get_current_total_stock(self) -> dict:
+        """
+        Estoque atual somado nas rações (projeção do livro-razão). A
+        consistência com entradas e distribuições é verificada por
+        reconcile_stock.py.
+        """
+        total_stock = await self.db.scalar(
+            select(func.sum(RationStock.stock).label('total_stock'))
+        )
 
         return {
-            "current_stock": current_stock,
-            "total_inputs": total_inputs or 0,
-            "total_distributions": total_distributions or 0,
+            "current_stock": total_stock or 0,
             "last_updated": datetime.now()
         }
     
-    def get_current_total_stock(self) -> dict:
-        total_stock = self.db.query(
-            func.sum(RationStock.stock).label('total_stock')
-        ).scalar()
+    @cached(TABLE_DISTRIBUTION, TABLE_RATION_INPUT)
+    async def get_period_totals(self, period: Period) -> dict:
+        """
+        Totais distribuídos e de entradas em um período qualquer (mês,
+        trimestre, últimos N dias ou intervalo), somados nas tabelas de origem
+        com filtro de intervalo sobre date, que usa os índices
+        ix_distribution_old_date e ix_ration_input_date.
+        """
+        distributed = (await self.db.execute(period_distributions_query(period))).one()
+        inputs = (await self.db.execute(period_inputs_query(period))).one()
 
         return {
-            "current_stock": total_stock or 0,
-            "last_updated": datetime.now()
+            **period.as_dict(),
+            "distributed_amount": distributed[0],
+            "distribution_count": distributed[1],
+            "input_amount": inputs[0],
+            "input_count": inputs[1]
         }
-    
-    def get_beneficiaries_dashboard(self, skip: int = 0, limit: int = 10) -> Tuple[List[dict], int]:
+
+    @cached(TABLE_BENEFICIARY, TABLE_DISTRIBUTION)
+    async def get_beneficiaries_dashboard(
+        self,
+        skip: int = 0,
+        limit: int = 10,
+        sort_by: str = "id",
+        sort_order: str = "asc"
+    ) -> Tuple[List[dict], int]:
         """
         Retorna dados consolidados dos beneficiários para o dashboard
         contendo total recebido no mês para cada beneficiário.
 
+        A página e os totais mensais são obtidos em uma única consulta
+        agrupada (LEFT JOIN com monthly_rollup do mês corrente), e o total
+        de registros vem de uma função de janela sobre o mesmo resultado.
+
         Args:
             skip: Número de registros para pular
             limit: Número máximo de registros para retornar
+            sort_by: Campo de ordenação ("id", "nome" ou "recebido_mes")
+            sort_order: Direção da ordenação ("asc" ou "desc")
 
         Returns:
             Tupla contendo a lista de beneficiários e o total de registros
         """
-        current_date = datetime.now()
-
-        # Busca total de beneficiários ativos
-        total = self.db.query(func.count(Beneficiary.id)).filter(Beneficiary.old == False).scalar()
-
-        # Busca beneficiários com paginação
-        beneficiaries = self.db.query(Beneficiary).filter(Beneficiary.old == False).offset(skip).limit(limit).all()
-
-        dashboard_data = []
-
-        for beneficiary in beneficiaries:
-            # Calcula total recebido no mês
-            received_amount = self.db.query(
-                func.sum(Distribution.amount).label('total_received')
-            ).filter(
-                Distribution.old == False,
-                Distribution.beneficiary_id == beneficiary.id,
-                extract('month', Distribution.date) == current_date.month,
-                extract('year', Distribution.date) == current_date.year
-            ).scalar() or 0
-
-            dashboard_data.append({
-                "id": beneficiary.id,
-                "nome": beneficiary.name,
-                "recebido_mes": received_amount
-            })
+        month = Period.current_month()
+
+        received = func.coalesce(func.sum(MonthlyRollup.distributed_amount), 0).label('recebido_mes')
+        total_over = func.count().over().label('total')
+
+        sort_columns = {
+            "id": Beneficiary.id,
+            "nome": Beneficiary.name,
+            "recebido_mes": received
+        }
+        sort_column = sort_columns.get(sort_by, Beneficiary.id)
+        sort_column = sort_column.desc() if sort_order == "desc" else sort_column.asc()
+
+        result = await self.db.execute(
+            select(
+                Beneficiary.id,
+                Beneficiary.name,
+                received,
+                total_over
+            ).outerjoin(
+                MonthlyRollup,
+                and_(
+                    MonthlyRollup.beneficiary_id == Beneficiary.id,
+                    month.month_filter(MonthlyRollup.year, MonthlyRollup.month)
+                )
+            ).where(
+                Beneficiary.old == False
+            ).group_by(
+                Beneficiary.id,
+                Beneficiary.name
+            ).order_by(
+                sort_column,
+                Beneficiary.id
+            ).offset(skip).limit(limit)
+        )
+        rows = result.all()
+
+        if rows:
+            total = rows[0].total
+        else:
+            # Página além do fim: a função de janela não retorna linhas
+            total = await self.db.scalar(
+                select(func.count(Beneficiary.id)).where(Beneficiary.old == False)
+            )
+
+        dashboard_data = [
+            {
+                "id": row.id,
+                "nome": row.name,
+                "recebido_mes": row.recebido_mes
+            }
+            for row in rows
+        ]
 
         return dashboard_data, total
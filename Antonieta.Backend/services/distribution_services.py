@@ -1,146 +1,459 @@
-from typing import Dict, Any, List, Optional, Tuple
-from sqlalchemy import func
+from datetime import date
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from fastapi import HTTPException
+from sqlalchemy import extract, func, insert, select
 from models.distribution_model import Distribution
-from sqlalchemy.orm import Session
-from database import get_db
+from models.beneficiary_model import Beneficiary
+from models.ration_stock_model import RationStock
+from sqlalchemy.ext.asyncio import AsyncSession
+from services.pagination import keyset_paginate, COUNT_NONE
+from services.field_selection import rows_to_dicts
+from services.period import Period
 from dtos.create_distribution_dto import create_distribution_dto
 from dtos.update_distribution_dto import update_distribution_dto
-from models.ration_stock_model import RationStock
+from dtos.create_distribution_bulk_dto import create_distribution_bulk_dto
+from services import monthly_rollup_service
+from services import cache_service
+from services.cache_service import TABLE_DISTRIBUTION, TABLE_RATION_STOCK
+from services.stock_service import (
+    StockNotFoundError,
+    InsufficientStockError,
+    KIND_DISTRIBUTION,
+    movement,
+    update_stock_balance,
+    record_movements,
+    withdraw_stock,
+    deposit_stock,
+    run_stock_transaction
+)
+
+# Nomes do beneficiário e da ração, obtidos por JOIN na mesma consulta da listagem
+JOINED_NAME_COLUMNS = {
+    "beneficiary_name": Beneficiary.name.label("beneficiary_name"),
+    "ration_name": RationStock.name.label("ration_name"),
+}
+
+def _listing_columns(fields: Optional[Sequence[str]] = None) -> List[Any]:
+    """Colunas da listagem: as pedidas em `fields` ou todas, com os nomes do JOIN"""
+    names = fields or [column.key for column in Distribution.__table__.columns] + list(JOINED_NAME_COLUMNS)
+    return [JOINED_NAME_COLUMNS[name] if name in JOINED_NAME_COLUMNS else getattr(Distribution, name) for name in names]
+
+def _join_names(statement):
+    """Acrescenta os JOINs de beneficiário e ração (select ou Query do ORM)"""
+    return (
+        statement
+        .select_from(Distribution)
+        .outerjoin(Beneficiary, Beneficiary.id == Distribution.beneficiary_id)
+        .outerjoin(RationStock, RationStock.id == Distribution.ration_id)
+    )
 
-async def get_all_distribution_service(skip: int = 0, limit: int = 1000) -> Tuple[List[Distribution], int]:
+def _listing_select(fields: Optional[Sequence[str]] = None):
+    return _join_names(select(*_listing_columns(fields))).where(Distribution.old == False)
+
+async def get_all_distribution_service(db: AsyncSession, skip: int = 0, limit: int = 1000, fields: Optional[Sequence[str]] = None) -> Tuple[List[Dict[str, Any]], int]:
     """
-    Retorna todos os raçãos do banco de dados.
-    Obtém a sessão do DB internamente.
+    Retorna todas as distribuições com os nomes do beneficiário e da ração
+    (beneficiary_name, ration_name), em uma única consulta com JOIN.
+    Usa a sessão da requisição (injetada pelo controller).
 
     Returns:
-        Uma lista de objetos distribution.
+        Uma lista de dicionários; com `fields`, apenas com as colunas pedidas.
     """
-    db = next(get_db())
-    try:
-        query = db.query(Distribution).filter(Distribution.old == False)
-        distribution = query.offset(skip).limit(limit).all()
-        total_distribution = db.query(func.count(Distribution.id)).filter(Distribution.old == False).scalar()
-        return distribution, total_distribution
-    finally:
-        db.close()
+    result = await db.execute(_listing_select(fields).offset(skip).limit(limit))
+    distribution = rows_to_dicts(result)
+    total_distribution = await db.scalar(
+        select(func.count(Distribution.id)).where(Distribution.old == False)
+    )
+    return distribution, total_distribution
 
-async def get_distribution_by_id_service(distribution_id: int) -> Optional[Distribution]:
+async def get_distribution_page_service(db: AsyncSession, after: Optional[str] = None, limit: int = 100, count: str = COUNT_NONE, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
     """
-    Retorna um ração específico do banco de dados.
+    Retorna uma página de distribuições usando paginação por cursor (keyset),
+    ordenada por id. Evita OFFSET e, por padrão, a contagem total.
+    Cada item traz beneficiary_name e ration_name (JOIN).
 
     Args:
-        distribution_id: ID do ração a ser retornado.
+        after: Cursor opaco retornado na página anterior (vazio para a primeira página).
+        limit: Número máximo de registros da página.
+        count: "none", "exact" ou "estimated".
+        fields: Colunas a retornar (projeção); None retorna todas.
 
     Returns:
-        Um objeto distribution ou None se não encontrado.
+        Dicionário com items, next_cursor, limit e total.
     """
-    db = next(get_db())
-    try:
-        distribution = db.query(Distribution).filter(
-            Distribution.id == distribution_id,
-            Distribution.old == False
-        ).first()
-        return distribution
-    finally:
-        db.close()
+    columns = _listing_columns(fields)
+    page = await db.run_sync(
+        lambda session: keyset_paginate(
+            _join_names(session.query(*columns)).filter(Distribution.old == False),
+            order_columns=(Distribution.id,),
+            after=after,
+            limit=limit,
+            count=count,
+            table_name="distribution"
+        )
+    )
+    page["items"] = rows_to_dicts(page["items"])
+    return page
+
+async def get_distribution_by_id_service(db: AsyncSession, distribution_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Retorna uma distribuição específica, com os nomes do beneficiário e da ração.
+
+    Args:
+        distribution_id: ID da distribuição a ser retornada.
+
+    Returns:
+        Um dicionário com as colunas da distribuição ou None se não encontrada.
+    """
+    row = (await db.execute(_listing_select().where(Distribution.id == distribution_id))).first()
+    return dict(row._mapping) if row else None
 
-async def create_distribution_service(distribution_dto: create_distribution_dto) -> Distribution:
+def beneficiary_history_conditions(beneficiary_id: int, period: Period) -> List[Any]:
+    """
+    Filtro do histórico de um beneficiário: distribuições atuais no período,
+    sargável sobre o índice ix_distribution_beneficiary_old_date.
+    """
+    return [
+        Distribution.beneficiary_id == beneficiary_id,
+        Distribution.old == False,
+        *period.conditions(Distribution.date)
+    ]
+
+async def get_beneficiary_distributions_service(
+    db: AsyncSession,
+    beneficiary_id: int,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    after: Optional[str] = None,
+    limit: int = 100
+) -> Dict[str, Any]:
+    """
+    Histórico de distribuições de um beneficiário no período [date_from, date_to]
+    (date_to inclusivo), em ordem de data, paginado por cursor (data, id).
+    Levanta InvalidPeriodError se date_from for posterior a date_to.
+    Usa o índice ix_distribution_beneficiary_old_date.
+
+    O total acumulado de cada item (running_total) é uma função de janela
+    calculada sobre o período inteiro, antes da paginação; os subtotais
+    mensais também vêm do banco (GROUP BY ano/mês).
+
+    Returns:
+        Dicionário com items, next_cursor, limit, total_amount, total_count e monthly.
+    """
+    conditions = beneficiary_history_conditions(beneficiary_id, Period.between(date_from, date_to))
+
+    history = (
+        select(
+            Distribution.id,
+            Distribution.date,
+            Distribution.ration_id,
+            RationStock.name.label("ration_name"),
+            Distribution.amount,
+            Distribution.observations,
+            func.sum(Distribution.amount).over(order_by=(Distribution.date, Distribution.id)).label("running_total")
+        )
+        .outerjoin(RationStock, RationStock.id == Distribution.ration_id)
+        .where(*conditions)
+        .subquery("history")
+    )
+    page = await db.run_sync(
+        lambda session: keyset_paginate(
+            session.query(history),
+            order_columns=(history.c.date, history.c.id),
+            after=after,
+            limit=limit
+        )
+    )
+
+    distribution_year = extract('year', Distribution.date)
+    distribution_month = extract('month', Distribution.date)
+    monthly = (await db.execute(
+        select(
+            distribution_year.label("year"),
+            distribution_month.label("month"),
+            func.coalesce(func.sum(Distribution.amount), 0).label("amount"),
+            func.count(Distribution.id).label("count")
+        )
+        .where(*conditions)
+        .group_by(distribution_year, distribution_month)
+        .order_by(distribution_year, distribution_month)
+    )).all()
+
+    return {
+        "beneficiary_id": beneficiary_id,
+        "date_from": date_from,
+        "date_to": date_to,
+        "items": rows_to_dicts(page["items"]),
+        "next_cursor": page["next_cursor"],
+        "limit": limit,
+        "total_amount": sum(row.amount for row in monthly),
+        "total_count": sum(row.count for row in monthly),
+        "monthly": [
+            {"year": int(row.year), "month": int(row.month), "amount": row.amount, "count": row.count}
+            for row in monthly
+        ]
+    }
+
+def _stock_http_error(error: Exception) -> HTTPException:
+    """Converte os erros do motor de estoque nas respostas HTTP da API"""
+    if isinstance(error, StockNotFoundError):
+        return HTTPException(status_code=404, detail="Ração não encontrada")
+    return HTTPException(status_code=400, detail="Estoque insuficiente")
+
+async def _create_distribution(db: AsyncSession, distribution_dto: create_distribution_dto) -> Distribution:
+    # Criar a distribuição (flush para obter o ID usado no livro-razão)
+    db_distribution = Distribution(**distribution_dto.model_dump())
+    db.add(db_distribution)
+    await db.flush()
+    
+    # Deduzir do estoque de forma atômica (falha se não houver saldo)
+    await withdraw_stock(
+        db, distribution_dto.ration_id, distribution_dto.amount,
+        kind=KIND_DISTRIBUTION, source_id=db_distribution.id, reference_date=distribution_dto.date
+    )
+    
+    # Atualizar totais mensais na mesma transação
+    await db.run_sync(
+        monthly_rollup_service.apply_distribution,
+        date=distribution_dto.date,
+        ration_id=distribution_dto.ration_id,
+        beneficiary_id=distribution_dto.beneficiary_id,
+        amount=distribution_dto.amount
+    )
+    return db_distribution
+
+async def create_distribution_service(db: AsyncSession, distribution_dto: create_distribution_dto) -> Dict[str, Any]:
     """
     Cria uma nova distribuição e atualiza o estoque.
+
+    Returns:
+        A distribuição criada, com os nomes do beneficiário e da ração
+        (ver get_distribution_by_id_service).
     """
-    db = next(get_db())
     try:
-        # Verificar e atualizar o estoque
-        ration_stock = db.query(RationStock).filter(
-            RationStock.id == distribution_dto.ration_id
-        ).first()
-        
-        if not ration_stock:
-            raise HTTPException(
-                status_code=404,
-                detail="Ração não encontrada"
-            )
-            
-        if ration_stock.stock < distribution_dto.amount:
-            raise HTTPException(
-                status_code=400,
-                detail="Estoque insuficiente"
+        db_distribution = await run_stock_transaction(db, _create_distribution, distribution_dto)
+    except (StockNotFoundError, InsufficientStockError) as e:
+        raise _stock_http_error(e)
+    await cache_service.invalidate(TABLE_DISTRIBUTION, TABLE_RATION_STOCK)
+    return await get_distribution_by_id_service(db, db_distribution.id)
+
+def _bulk_rejected(results: List[Dict[str, Any]]) -> HTTPException:
+    """Resposta do modo all_or_nothing quando algum item é recusado"""
+    for result in results:
+        if result["status"] == "created":
+            result.update(status="skipped", id=None)
+    return HTTPException(
+        status_code=400,
+        detail={"message": "Nenhuma distribuição foi registrada", "results": results}
+    )
+
+async def _create_distribution_bulk(db: AsyncSession, bulk_dto: create_distribution_bulk_dto) -> List[Dict[str, Any]]:
+    items = bulk_dto.items
+    all_or_nothing = bulk_dto.mode == "all_or_nothing"
+    results = [{"index": index, "status": "created", "id": None, "error": None} for index in range(len(items))]
+
+    # Carregar de uma vez os estoques e beneficiários envolvidos
+    stock = dict((await db.execute(
+        select(RationStock.id, RationStock.stock).where(RationStock.id.in_({item.ration_id for item in items}))
+    )).all())
+    beneficiary_ids = set((await db.scalars(
+        select(Beneficiary.id).where(
+            Beneficiary.id.in_({item.beneficiary_id for item in items}),
+            Beneficiary.old == False
+        )
+    )).all())
+
+    # Validar os itens em ordem, consumindo o saldo de cada ração (saldo nulo conta como zero)
+    available = {ration_id: amount or 0 for ration_id, amount in stock.items()}
+    for index, item in enumerate(items):
+        error = None
+        if item.ration_id not in stock:
+            error = "Ração não encontrada"
+        elif item.beneficiary_id not in beneficiary_ids:
+            error = "Beneficiário não encontrado"
+        elif available[item.ration_id] < item.amount:
+            error = "Estoque insuficiente"
+
+        if error:
+            results[index].update(status="failed", error=error)
+        else:
+            available[item.ration_id] -= item.amount
+
+    if all_or_nothing and any(result["status"] == "failed" for result in results):
+        raise _bulk_rejected(results)
+
+    # Deduzir o total de cada ração com um único UPDATE condicional
+    totals: Dict[int, float] = {}
+    for index, item in enumerate(items):
+        if results[index]["status"] == "created":
+            totals[item.ration_id] = totals.get(item.ration_id, 0) + item.amount
+
+    balances: Dict[int, float] = {}
+    for ration_id, total in totals.items():
+        try:
+            balances[ration_id] = await update_stock_balance(db, ration_id, -total)
+        except InsufficientStockError:
+            # O saldo mudou desde a leitura (escrita concorrente)
+            for index, item in enumerate(items):
+                if item.ration_id == ration_id and results[index]["status"] == "created":
+                    results[index].update(status="failed", error="Estoque insuficiente")
+            if all_or_nothing:
+                raise _bulk_rejected(results)
+
+    # Inserir as distribuições aceitas em um único INSERT de várias linhas
+    accepted = [index for index, result in enumerate(results) if result["status"] == "created"]
+    rows = [items[index].model_dump() for index in accepted]
+    if rows:
+        ids = (await db.scalars(
+            insert(Distribution).returning(Distribution.id, sort_by_parameter_order=True),
+            rows
+        )).all()
+        for index, distribution_id in zip(accepted, ids):
+            results[index]["id"] = distribution_id
+
+        # Um movimento por distribuição no livro-razão de cada ração
+        movements: Dict[int, List[Dict[str, Any]]] = {}
+        for index in accepted:
+            item = items[index]
+            movements.setdefault(item.ration_id, []).append(
+                movement(-item.amount, KIND_DISTRIBUTION, results[index]["id"], item.date)
             )
-            
-        # Deduzir do estoque
-        ration_stock.stock -= distribution_dto.amount
-        
-        # Criar a distribuição
-        db_distribution = Distribution(**distribution_dto.model_dump())
-        db.add(db_distribution)
-        db.commit()
-        db.refresh(db_distribution)
-        return db_distribution
-    finally:
-        db.close()
-
-async def update_distribution_service(distribution_dto: update_distribution_dto) -> Optional[Distribution]:
+        for ration_id, ration_movements in movements.items():
+            await record_movements(db, ration_id, balances[ration_id], ration_movements)
+
+        # Atualizar totais mensais na mesma transação
+        await db.run_sync(monthly_rollup_service.apply_distributions, distributions=rows)
+
+    return results
+
+async def create_distribution_bulk_service(db: AsyncSession, bulk_dto: create_distribution_bulk_dto) -> Dict[str, Any]:
     """
-    Atualiza uma distribuição e ajusta o estoque.
+    Registra várias distribuições em uma única transação: valida o estoque de
+    cada ração pelo total solicitado, insere tudo em um único comando e faz
+    um só commit.
+
+    Args:
+        bulk_dto: Itens a registrar e o modo (all_or_nothing ou best_effort).
+
+    Returns:
+        Dicionário com o modo, os totais de criados/recusados e o resultado de cada item.
     """
-    db = next(get_db())
-    try:
-        # Buscar distribuição atual
-        current_distribution = db.query(Distribution).filter(
+    results = await run_stock_transaction(db, _create_distribution_bulk, bulk_dto)
+    await cache_service.invalidate(TABLE_DISTRIBUTION, TABLE_RATION_STOCK)
+    created = sum(1 for result in results if result["status"] == "created")
+    return {
+        "mode": bulk_dto.mode,
+        "created": created,
+        "failed": len(results) - created,
+        "results": results
+    }
+
+async def _update_distribution(db: AsyncSession, distribution_dto: update_distribution_dto) -> Optional[Distribution]:
+    # Buscar distribuição atual
+    current_distribution = await db.scalar(
+        select(Distribution).where(
             Distribution.id == distribution_dto.id,
             Distribution.old == False
-        ).first()
-        
-        if not current_distribution:
-            return None
-            
-        # Calcular diferença na quantidade
-        amount_difference = distribution_dto.amount - current_distribution.amount
-        
-        # Verificar e atualizar estoque
-        ration_stock = db.query(RationStock).filter(
-            RationStock.id == current_distribution.ration_id
-        ).first()
-        
-        if ration_stock.stock < amount_difference:
-            raise HTTPException(
-                status_code=400,
-                detail="Estoque insuficiente"
-            )
-            
-        # Atualizar estoque
-        ration_stock.stock -= amount_difference
-        
-        # Atualizar distribuição
-        for key, value in distribution_dto.model_dump(exclude={'id'}).items():
-            setattr(current_distribution, key, value)
-            
-        db.commit()
-        db.refresh(current_distribution)
-        return current_distribution
-    finally:
-        db.close()
-
-async def delete_distribution_service(distribution_id: int) -> bool:
-    """
-    Deleta um ração do banco de dados.
+        )
+    )
+    
+    if not current_distribution:
+        return None
+    
+    # Devolver a quantidade antiga e retirar a nova (a ração pode ter mudado)
+    await deposit_stock(
+        db, current_distribution.ration_id, current_distribution.amount,
+        kind=KIND_DISTRIBUTION, source_id=current_distribution.id, reference_date=current_distribution.date
+    )
+    await withdraw_stock(
+        db, distribution_dto.ration_id, distribution_dto.amount,
+        kind=KIND_DISTRIBUTION, source_id=current_distribution.id, reference_date=distribution_dto.date
+    )
+    
+    # Retirar valores antigos dos totais mensais
+    await db.run_sync(
+        monthly_rollup_service.apply_distribution,
+        date=current_distribution.date,
+        ration_id=current_distribution.ration_id,
+        beneficiary_id=current_distribution.beneficiary_id,
+        amount=current_distribution.amount,
+        sign=-1
+    )
+    
+    # Atualizar distribuição
+    for key, value in distribution_dto.model_dump(exclude={'id'}).items():
+        setattr(current_distribution, key, value)
+    
+    # Aplicar novos valores aos totais mensais
+    await db.run_sync(
+        monthly_rollup_service.apply_distribution,
+        date=current_distribution.date,
+        ration_id=current_distribution.ration_id,
+        beneficiary_id=current_distribution.beneficiary_id,
+        amount=current_distribution.amount
+    )
+    return current_distribution
 
-    Args:
-        distribution_id: ID do ração a ser deletado.
+async def update_distribution_service(db: AsyncSession, distribution_dto: update_distribution_dto) -> Optional[Dict[str, Any]]:
+    """
+    Atualiza uma distribuição e ajusta o estoque.
 
     Returns:
-        True se o ração foi deletado, False caso contrário.
+        A distribuição atualizada, com os nomes do beneficiário e da ração,
+        ou None se não encontrada.
     """
-    db = next(get_db())
     try:
-        distribution = db.query(Distribution).filter(
+        current_distribution = await run_stock_transaction(db, _update_distribution, distribution_dto)
+    except (StockNotFoundError, InsufficientStockError) as e:
+        raise _stock_http_error(e)
+    if not current_distribution:
+        return None
+    await cache_service.invalidate(TABLE_DISTRIBUTION, TABLE_RATION_STOCK)
+    return await get_distribution_by_id_service(db, current_distribution.id)
+
+async def _delete_distribution(db: AsyncSession, distribution_id: int) -> bool:
+    distribution = await db.scalar(
+        select(Distribution).where(
             Distribution.id == distribution_id,
             Distribution.old == False
-        ).first()
-        if not distribution:
-            return False
-        db.delete(Distribution)
-        db.commit()
-        return True
-    finally:
-        db.close()
\ No newline at end of file
+        )
+    )
+    if not distribution:
+        return False
+    
+    # Devolver a quantidade ao estoque
+    await deposit_stock(
+        db, distribution.ration_id, distribution.amount,
+        kind=KIND_DISTRIBUTION, source_id=distribution.id, reference_date=distribution.date
+    )
+    
+    # Retirar a distribuição dos totais mensais
+    await db.run_sync(
+        monthly_rollup_service.apply_distribution,
+        date=distribution.date,
+        ration_id=distribution.ration_id,
+        beneficiary_id=distribution.beneficiary_id,
+        amount=distribution.amount,
+        sign=-1
+    )
+    
+    await db.delete(distribution)
+    return True
+
+async def delete_distribution_service(db: AsyncSession, distribution_id: int) -> bool:
+    """
+    Deleta uma distribuição e devolve a quantidade ao estoque.
+
+    Args:
+        distribution_id: ID da distribuição a ser deletada.
+
+    Returns:
+        True se a distribuição foi deletada, False caso contrário.
+    """
+    try:
+        deleted = await run_stock_transaction(db, _delete_distribution, distribution_id)
+    except StockNotFoundError as e:
+        raise _stock_http_error(e)
+    if deleted:
+        await cache_service.invalidate(TABLE_DISTRIBUTION, TABLE_RATION_STOCK)
+    return deleted
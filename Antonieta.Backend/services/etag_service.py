@@ -0,0 +1,97 @@
+import hashlib
+import logging
+import time
+import uuid
+from datetime import date
+from os import getenv
+from typing import List, Optional
+from fastapi import HTTPException, Request, Response
+from services import cache_service
+
+logger = logging.getLogger(__name__)
+
+# Cache-Control das leituras condicionais: o navegador guarda a resposta,
+# mas revalida a cada uso (If-None-Match), recebendo 304 se nada mudou
+ETAG_CACHE_CONTROL = getenv('ETAG_CACHE_CONTROL', 'private, no-cache')
+
+# Identifica o processo: versões em memória recomeçam do zero a cada início
+_PROCESS_EPOCH = uuid.uuid4().hex
+
+
+async def tables_version(tags: List[str]) -> Optional[str]:
+    """
+    Versão das tabelas em `tags`: os contadores de invalidação do
+    cache_service, incrementados pelos serviços de escrita após o commit.
+    Não consulta o banco.
+
+    Com o backend redis os contadores são compartilhados pelos workers.
+    Com o backend memory são do processo: a versão inclui o processo e a
+    janela de CACHE_TTL, então escritas feitas em outro worker aparecem em
+    até CACHE_TTL segundos, como no cache de leitura.
+
+    Returns:
+        A versão, ou None se o cache está desativado ou indisponível (sem ETag).
+    """
+    backend = cache_service.backend
+    if backend is None:
+        return None
+    try:
+        versions = await backend.versions(tags)
+    except Exception as e:
+        logger.warning(f"Falha ao ler versões para ETag ({', '.join(tags)}): {str(e)}")
+        return None
+
+    parts = [f"{tag}={number}" for tag, number in zip(tags, versions)]
+    if backend.name == "memory":
+        parts.append(_PROCESS_EPOCH)
+        parts.append(str(int(time.time() // max(cache_service.CACHE_TTL, 1))))
+    return ",".join(parts)
+
+
+def parse_if_none_match(header: str) -> List[str]:
+    """ETags de If-None-Match, sem o prefixo de ETag fraca (comparação fraca)"""
+    tags = []
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag:
+            tags.append(tag)
+    return tags
+
+
+def conditional_get(*tables: str, daily: bool = False):
+    """
+    Dependência para leituras GET com ETag. A ETag combina a URL da
+    requisição (caminho e parâmetros) com a versão das tabelas em `tables`
+    (etiquetas TABLE_* do cache_service); `daily` acrescenta a data atual,
+    para respostas que dependem do mês corrente (dashboard).
+
+    Se a ETag coincide com If-None-Match, a requisição termina com 304 sem
+    executar a consulta da rota. Caso contrário, ETag e Cache-Control são
+    adicionados à resposta. Sem versão disponível, a resposta sai sem ETag.
+
+    Uso:
+        @router.get("/", dependencies=[Depends(conditional_get(TABLE_BENEFICIARY))])
+    """
+    async def dependency(request: Request, response: Response) -> None:
+        version = await tables_version(list(tables))
+        if version is None:
+            return
+
+        parts: List[str] = [request.url.path, request.url.query, version]
+        if daily:
+            parts.append(date.today().isoformat())
+
+        digest = hashlib.sha1("\n".join(parts).encode()).hexdigest()
+        etag = f'W/"{digest}"'
+        headers = {"ETag": etag, "Cache-Control": ETAG_CACHE_CONTROL}
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            tags = parse_if_none_match(if_none_match)
+            if "*" in tags or f'"{digest}"' in tags:
+                raise HTTPException(status_code=304, headers=headers)
+
+        response.headers.update(headers)
+    return dependency
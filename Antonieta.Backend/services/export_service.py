@@ -0,0 +1,138 @@
+import csv
+import io
+from datetime import date
+from typing import AsyncIterator, Callable, Iterable, List, Literal, Optional, Sequence
+from sqlalchemy import Select, func, select
+from database import AsyncSessionLocal
+from services.period import Period
+from models.beneficiary_model import Beneficiary
+from models.distribution_model import Distribution
+from models.ration_stock_model import RationStock
+
+# Linhas buscadas por lote no cursor do servidor
+EXPORT_BATCH_SIZE = 1000
+
+# Separador aceito pelo Excel em pt-BR
+CSV_DELIMITER = ";"
+
+# Filtro do flag old: apenas atuais, apenas antigos ou todos
+OldFilter = Literal["false", "true", "all"]
+
+NOT_INFORMED = "Não informado"
+
+BENEFICIARY_HEADER = ["Telefone", "Documento", "Adicional 1", "Código Familiar CadÚnico", "Faixa de Renda"]
+
+DISTRIBUTION_HEADER = ["ID", "Data", "Beneficiário", "Documento", "Bairro", "Ração", "Quantidade", "Unidade", "Observações"]
+
+
+def _csv_line(values: Iterable) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer, delimiter=CSV_DELIMITER).writerow(values)
+    return buffer.getvalue()
+
+
+def _filter_conditions(
+    date_column,
+    old_column,
+    date_from: Optional[date],
+    date_to: Optional[date],
+    neighborhood: Optional[str],
+    old: OldFilter
+) -> List:
+    """Filtros comuns às exportações (intervalo de datas inclusivo em date_to)"""
+    conditions = Period.between(date_from, date_to).conditions(date_column)
+    if neighborhood:
+        conditions.append(func.lower(Beneficiary.neighborhood) == neighborhood.strip().lower())
+    if old != "all":
+        conditions.append(old_column == (old == "true"))
+    return conditions
+
+
+async def _stream_csv(statement: Select, header: Sequence[str], to_row: Callable) -> AsyncIterator[str]:
+    """
+    Gera o CSV lote a lote a partir de um cursor no servidor (yield_per),
+    mantendo o uso de memória constante independente do total de linhas.
+
+    Usa uma sessão própria: o corpo da resposta é consumido depois que o
+    handler (e a sessão injetada na requisição) já terminou.
+    """
+    # BOM para o Excel reconhecer UTF-8
+    yield "\ufeff" + _csv_line(header)
+
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for partition in result.partitions():
+            yield "".join(_csv_line(to_row(row)) for row in partition)
+
+
+def stream_beneficiaries_csv(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    neighborhood: Optional[str] = None,
+    old: OldFilter = "false"
+) -> AsyncIterator[str]:
+    """
+    Exporta beneficiários em CSV, no mesmo formato da exportação da página.
+    O intervalo de datas se aplica à data de cadastro.
+    """
+    statement = (
+        select(
+            Beneficiary.contact,
+            Beneficiary.document,
+            Beneficiary.name,
+            Beneficiary.cadunico_code,
+            Beneficiary.income_range
+        )
+        .where(*_filter_conditions(Beneficiary.created_at, Beneficiary.old, date_from, date_to, neighborhood, old))
+        .order_by(Beneficiary.id)
+    )
+    return _stream_csv(
+        statement,
+        BENEFICIARY_HEADER,
+        lambda row: [value or NOT_INFORMED for value in row]
+    )
+
+
+def stream_distributions_csv(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    neighborhood: Optional[str] = None,
+    old: OldFilter = "false"
+) -> AsyncIterator[str]:
+    """
+    Exporta distribuições em CSV com o nome do beneficiário e da ração.
+    O intervalo de datas se aplica à data da distribuição e o bairro ao beneficiário.
+    """
+    statement = (
+        select(
+            Distribution.id,
+            Distribution.date,
+            Beneficiary.name,
+            Beneficiary.document,
+            Beneficiary.neighborhood,
+            RationStock.name,
+            Distribution.amount,
+            RationStock.unit,
+            Distribution.observations
+        )
+        .outerjoin(Beneficiary, Beneficiary.id == Distribution.beneficiary_id)
+        .outerjoin(RationStock, RationStock.id == Distribution.ration_id)
+        .where(*_filter_conditions(Distribution.date, Distribution.old, date_from, date_to, neighborhood, old))
+        .order_by(Distribution.date, Distribution.id)
+    )
+    return _stream_csv(
+        statement,
+        DISTRIBUTION_HEADER,
+        lambda row: [
+            row[0],
+            row[1].strftime("%d/%m/%Y %H:%M") if row[1] else "",
+            *(value or "" for value in row[2:6]),
+            row[6],
+            *(value or "" for value in row[7:])
+        ]
+    )
+
+
+def export_filename(prefix: str) -> str:
+    """Nome do arquivo com a data atual, ex.: beneficiarios_2026-01-31.csv"""
+    return f"{prefix}_{date.today().isoformat()}.csv"
@@ -0,0 +1,50 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+# Campo sempre incluído (chave do cursor e identificação do item)
+ID_FIELD = "id"
+
+
+class InvalidFieldsError(ValueError):
+    """Parâmetro fields com campo desconhecido"""
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str], presets: Optional[Dict[str, Sequence[str]]] = None) -> Optional[List[str]]:
+    """
+    Interpreta o parâmetro `fields` das listagens (sparse fieldset).
+
+    Aceita nomes separados por vírgula (ex.: "name,document") ou o nome de
+    um conjunto predefinido (ex.: "list"). O id é sempre incluído.
+
+    Returns:
+        Lista de campos na ordem informada, ou None quando `fields` não foi
+        informado (todas as colunas).
+    """
+    if fields is None or not fields.strip():
+        return None
+
+    presets = presets or {}
+    if fields.strip() in presets:
+        names = list(presets[fields.strip()])
+    else:
+        names = [name.strip() for name in fields.split(",") if name.strip()]
+
+    allowed = set(allowed)
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise InvalidFieldsError(f"Campos desconhecidos: {', '.join(unknown)}")
+
+    selected = [ID_FIELD]
+    for name in names:
+        if name not in selected:
+            selected.append(name)
+    return selected
+
+
+def columns_for(model, fields: Sequence[str]) -> List[Any]:
+    """Colunas do modelo correspondentes aos campos selecionados"""
+    return [getattr(model, name) for name in fields]
+
+
+def rows_to_dicts(rows: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Linhas de uma consulta por colunas convertidas em dicionários"""
+    return [dict(row._mapping) for row in rows]
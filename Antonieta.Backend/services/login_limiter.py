@@ -0,0 +1,307 @@
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from os import getenv
+from typing import Deque, Dict, List, Optional, Tuple
+from database import SessionLocal
+from services.audit_helper import AuditHelper
+
+logger = logging.getLogger(__name__)
+
+# Backend do limitador: memory (por processo), redis (compartilhado) ou none (desativado)
+LOGIN_LIMIT_BACKEND = getenv('LOGIN_LIMIT_BACKEND', 'memory').lower()
+LOGIN_LIMIT_REDIS_URL = getenv('LOGIN_LIMIT_REDIS_URL', 'redis://localhost:6379/0')
+LOGIN_LIMIT_KEY_PREFIX = getenv('LOGIN_LIMIT_KEY_PREFIX', 'antonieta:login')
+# Janela deslizante (segundos) e tentativas permitidas por IP e por usuário
+LOGIN_LIMIT_WINDOW = float(getenv('LOGIN_LIMIT_WINDOW', '300'))
+LOGIN_LIMIT_PER_IP = int(getenv('LOGIN_LIMIT_PER_IP', '30'))
+LOGIN_LIMIT_PER_USERNAME = int(getenv('LOGIN_LIMIT_PER_USERNAME', '5'))
+LOGIN_LIMIT_MAX_KEYS = int(getenv('LOGIN_LIMIT_MAX_KEYS', '10000'))
+# Intervalo (segundos) entre as gravações agregadas de bloqueios na auditoria
+LOGIN_THROTTLE_AUDIT_INTERVAL = float(getenv('LOGIN_THROTTLE_AUDIT_INTERVAL', '60'))
+
+SCOPE_IP = "ip"
+SCOPE_USERNAME = "username"
+
+
+class LoginThrottledError(Exception):
+    """Tentativa de login recusada pelo limitador, antes de verificar a senha"""
+
+    def __init__(self, scope: str, retry_after: float):
+        super().__init__(f"Limite de tentativas de login excedido ({scope})")
+        self.scope = scope
+        self.retry_after = retry_after
+
+
+class MemoryLimiter:
+    """
+    Janela deslizante em processo: para cada chave guarda os instantes das
+    tentativas dentro da janela (no máximo `limit`). O número de chaves é
+    limitado por LRU.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_keys: int = LOGIN_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._attempts: "OrderedDict[str, Deque[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _window(self, key: str, now: float, window: float) -> Deque[float]:
+        attempts = self._attempts.get(key)
+        if attempts is None:
+            attempts = self._attempts[key] = deque()
+        self._attempts.move_to_end(key)
+        while attempts and attempts[0] <= now - window:
+            attempts.popleft()
+        return attempts
+
+    async def hit(self, checks: List[Tuple[str, str, int]], window: float) -> Optional[Tuple[str, float]]:
+        now = time.monotonic()
+        with self._lock:
+            windows = [(scope, self._window(key, now, window), limit) for scope, key, limit in checks]
+            for scope, attempts, limit in windows:
+                if len(attempts) >= limit:
+                    return scope, attempts[0] + window - now
+            for _, attempts, _ in windows:
+                attempts.append(now)
+            while len(self._attempts) > self.max_keys:
+                self._attempts.popitem(last=False)
+        return None
+
+    async def reset(self, key: str) -> None:
+        with self._lock:
+            self._attempts.pop(key, None)
+
+    def info(self) -> dict:
+        with self._lock:
+            return {"keys": len(self._attempts), "max_keys": self.max_keys}
+
+
+# Verifica todas as chaves e só registra a tentativa se nenhuma excedeu o limite
+# KEYS: chaves; ARGV: agora, janela, identificador, limite de cada chave
+_REDIS_HIT_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+for i, key in ipairs(KEYS) do
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+    if redis.call('ZCARD', key) >= tonumber(ARGV[3 + i]) then
+        local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+        return {i, tostring(tonumber(oldest[2]) + window - now)}
+    end
+end
+for _, key in ipairs(KEYS) do
+    redis.call('ZADD', key, now, ARGV[3])
+    redis.call('PEXPIRE', key, math.ceil(window * 1000))
+end
+return {0, '0'}
+"""
+
+
+class RedisLimiter:
+    """
+    Janela deslizante em Redis (sorted set por chave), compartilhada entre
+    processos. A verificação e o registro são atômicos (script Lua).
+    Requer o pacote redis, instalado à parte.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str = LOGIN_LIMIT_REDIS_URL, prefix: str = LOGIN_LIMIT_KEY_PREFIX):
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError("LOGIN_LIMIT_BACKEND=redis requer o pacote redis (pip install redis)") from e
+        self.client = redis_asyncio.from_url(url)
+        self.prefix = prefix
+
+    async def hit(self, checks: List[Tuple[str, str, int]], window: float) -> Optional[Tuple[str, float]]:
+        keys = [f"{self.prefix}:{key}" for _, key, _ in checks]
+        limits = [limit for _, _, limit in checks]
+        exceeded, retry_after = await self.client.eval(
+            _REDIS_HIT_SCRIPT, len(keys), *keys, time.time(), window, uuid.uuid4().hex, *limits
+        )
+        if int(exceeded) == 0:
+            return None
+        return checks[int(exceeded) - 1][0], float(retry_after)
+
+    async def reset(self, key: str) -> None:
+        await self.client.delete(f"{self.prefix}:{key}")
+
+    def info(self) -> dict:
+        return {"prefix": self.prefix}
+
+
+def _build_backend():
+    if LOGIN_LIMIT_BACKEND == "none":
+        return None
+    if LOGIN_LIMIT_BACKEND == "redis":
+        return RedisLimiter()
+    return MemoryLimiter()
+
+
+def _username_key(username: str) -> str:
+    return f"{SCOPE_USERNAME}:{username.strip().lower()}"
+
+
+class LoginLimiter:
+    """
+    Limita as tentativas de login por IP e por usuário (email) em uma janela
+    deslizante, antes de qualquer verificação de senha: rajadas de senhas
+    erradas são recusadas sem custo de bcrypt. Um login bem-sucedido zera
+    o contador do usuário.
+
+    Os bloqueios são agregados por IP e usuário e gravados na auditoria a
+    cada LOGIN_THROTTLE_AUDIT_INTERVAL segundos, uma linha por par, em vez
+    de uma linha por requisição recusada.
+
+    Falhas do backend compartilhado não impedem o login (o limite deixa de
+    valer enquanto durar a falha).
+    """
+
+    def __init__(
+        self,
+        window: float = LOGIN_LIMIT_WINDOW,
+        per_ip: int = LOGIN_LIMIT_PER_IP,
+        per_username: int = LOGIN_LIMIT_PER_USERNAME,
+        audit_interval: float = LOGIN_THROTTLE_AUDIT_INTERVAL
+    ):
+        self.backend = _build_backend()
+        self.window = window
+        self.per_ip = per_ip
+        self.per_username = per_username
+        self.audit_interval = audit_interval
+        self._lock = threading.Lock()
+        self._pending_audit: Dict[Tuple[Optional[str], str], dict] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"allowed": 0, "throttled": 0, "errors": 0, "audit_rows": 0}
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[counter] += amount
+
+    async def check(self, ip_address: Optional[str], username: str, user_agent: Optional[str] = None) -> None:
+        """
+        Registra a tentativa e levanta LoginThrottledError se o IP ou o
+        usuário excederam o limite da janela.
+        """
+        if self.backend is None:
+            return
+        checks = [(SCOPE_USERNAME, _username_key(username), self.per_username)]
+        if ip_address:
+            checks.insert(0, (SCOPE_IP, f"{SCOPE_IP}:{ip_address}", self.per_ip))
+
+        try:
+            exceeded = await self.backend.hit(checks, self.window)
+        except Exception as e:
+            logger.warning(f"Falha no limitador de login: {str(e)}")
+            self._count("errors")
+            return
+
+        if exceeded is None:
+            self._count("allowed")
+            return
+
+        scope, retry_after = exceeded
+        self._count("throttled")
+        self._record_throttle(ip_address, username, user_agent, scope)
+        raise LoginThrottledError(scope, max(retry_after, 1.0))
+
+    async def reset_username(self, username: str) -> None:
+        """Zera as tentativas do usuário após um login bem-sucedido"""
+        if self.backend is None:
+            return
+        try:
+            await self.backend.reset(_username_key(username))
+        except Exception as e:
+            logger.warning(f"Falha ao zerar o limitador de login: {str(e)}")
+            self._count("errors")
+
+    def _record_throttle(self, ip_address: Optional[str], username: str, user_agent: Optional[str], scope: str) -> None:
+        now = time.time()
+        with self._lock:
+            key = (ip_address, username.strip().lower())
+            entry = self._pending_audit.get(key)
+            if entry is None:
+                entry = self._pending_audit[key] = {
+                    "ip_address": ip_address,
+                    "username": key[1],
+                    "scopes": set(),
+                    "attempts": 0,
+                    "first_at": now,
+                }
+            entry["attempts"] += 1
+            entry["scopes"].add(scope)
+            entry["last_at"] = now
+            entry["user_agent"] = user_agent
+
+    def flush_audit(self) -> int:
+        """Grava na auditoria os bloqueios acumulados desde a última gravação"""
+        with self._lock:
+            entries, self._pending_audit = list(self._pending_audit.values()), {}
+        if not entries:
+            return 0
+
+        db = SessionLocal()
+        try:
+            for entry in entries:
+                AuditHelper.log_login_throttled(
+                    db=db,
+                    email=entry["username"],
+                    attempts=entry["attempts"],
+                    scopes=sorted(entry["scopes"]),
+                    window=self.window,
+                    first_at=entry["first_at"],
+                    last_at=entry["last_at"],
+                    ip_address=entry["ip_address"],
+                    user_agent=entry["user_agent"]
+                )
+        finally:
+            db.close()
+        self._count("audit_rows", len(entries))
+        return len(entries)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.audit_interval)
+            try:
+                await asyncio.to_thread(self.flush_audit)
+            except Exception as e:
+                logger.warning(f"Falha ao gravar bloqueios de login na auditoria: {str(e)}")
+
+    def start(self) -> None:
+        """Inicia a gravação periódica dos bloqueios (idempotente)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Encerra a gravação periódica e grava o que restou"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await asyncio.to_thread(self.flush_audit)
+        except Exception as e:
+            logger.warning(f"Falha ao gravar bloqueios de login na auditoria: {str(e)}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": self.backend.name if self.backend else "none",
+                "window": self.window,
+                "per_ip": self.per_ip,
+                "per_username": self.per_username,
+                "pending_audit": len(self._pending_audit),
+                **self._stats,
+                **(self.backend.info() if self.backend else {}),
+            }
+
+
+login_limiter = LoginLimiter()
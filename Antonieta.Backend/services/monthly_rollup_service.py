@@ -0,0 +1,205 @@
+from datetime import datetime
+from typing import Dict, List, Tuple
+from sqlalchemy import func, extract
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from models.monthly_rollup_model import MonthlyRollup
+from models.distribution_model import Distribution
+from models.ration_input_model import RationInput
+
+# beneficiary_id usado nas linhas que acumulam entradas de ração
+NO_BENEFICIARY = 0
+
+RollupKey = Tuple[int, int, int, int]
+
+
+def _upsert(db: Session, key: RollupKey, values: Dict[str, float]) -> None:
+    """
+    Soma os valores informados à linha do rollup identificada por key,
+    criando a linha caso ainda não exista (INSERT ... ON CONFLICT DO UPDATE).
+    """
+    year, month, ration_stock_id, beneficiary_id = key
+    row = {
+        "year": year,
+        "month": month,
+        "ration_stock_id": ration_stock_id,
+        "beneficiary_id": beneficiary_id,
+        "distributed_amount": 0,
+        "distribution_count": 0,
+        "input_amount": 0,
+        "input_count": 0,
+    }
+    row.update(values)
+
+    dialect = db.get_bind().dialect.name
+    insert = sqlite_insert if dialect == "sqlite" else pg_insert
+
+    stmt = insert(MonthlyRollup).values(**row)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["year", "month", "ration_stock_id", "beneficiary_id"],
+        set_={
+            column: getattr(MonthlyRollup, column) + getattr(stmt.excluded, column)
+            for column in values
+        }
+    )
+    db.execute(stmt)
+
+
+def apply_distribution(db: Session, date: datetime, ration_id: int, beneficiary_id: int, amount: float, sign: int = 1) -> None:
+    """
+    Aplica uma distribuição ao rollup (sign=1) ou a remove (sign=-1).
+    Não faz commit: deve ser chamada antes do commit da operação de escrita.
+    """
+    _upsert(db, (date.year, date.month, ration_id, beneficiary_id), {
+        "distributed_amount": sign * amount,
+        "distribution_count": sign,
+    })
+
+
+def apply_distributions(db: Session, distributions: List[Dict]) -> None:
+    """
+    Aplica várias distribuições novas ao rollup, agrupando-as por
+    (ano, mês, ração, beneficiário) para gravar uma única vez cada linha.
+    Cada item deve ter date, ration_id, beneficiary_id e amount. Não faz commit.
+    """
+    totals: Dict[RollupKey, Dict[str, float]] = {}
+    for distribution in distributions:
+        date = distribution["date"]
+        key = (date.year, date.month, distribution["ration_id"], distribution["beneficiary_id"])
+        values = totals.setdefault(key, {"distributed_amount": 0, "distribution_count": 0})
+        values["distributed_amount"] += distribution["amount"]
+        values["distribution_count"] += 1
+
+    for key, values in totals.items():
+        _upsert(db, key, values)
+
+
+def apply_input(db: Session, date: datetime, ration_stock_id: int, amount: float, sign: int = 1) -> None:
+    """
+    Aplica uma entrada de ração ao rollup (sign=1) ou a remove (sign=-1).
+    Não faz commit: deve ser chamada antes do commit da operação de escrita.
+    """
+    _upsert(db, (date.year, date.month, ration_stock_id, NO_BENEFICIARY), {
+        "input_amount": sign * amount,
+        "input_count": sign,
+    })
+
+
+def compute_rollup(db: Session) -> Dict[RollupKey, Dict[str, float]]:
+    """
+    Recalcula o rollup completo a partir das tabelas de origem.
+    Distribuições marcadas como old não entram nos totais.
+    """
+    rollup: Dict[RollupKey, Dict[str, float]] = {}
+
+    def bucket(key: RollupKey) -> Dict[str, float]:
+        return rollup.setdefault(key, {
+            "distributed_amount": 0,
+            "distribution_count": 0,
+            "input_amount": 0,
+            "input_count": 0,
+        })
+
+    distribution_year = extract('year', Distribution.date)
+    distribution_month = extract('month', Distribution.date)
+    distribution_beneficiary = func.coalesce(Distribution.beneficiary_id, NO_BENEFICIARY)
+    distributions = db.query(
+        distribution_year,
+        distribution_month,
+        Distribution.ration_id,
+        distribution_beneficiary,
+        func.sum(Distribution.amount),
+        func.count(Distribution.id)
+    ).filter(
+        Distribution.old == False,
+        Distribution.ration_id.isnot(None)
+    ).group_by(
+        distribution_year,
+        distribution_month,
+        Distribution.ration_id,
+        distribution_beneficiary
+    ).all()
+
+    for year, month, ration_id, beneficiary_id, amount, count in distributions:
+        values = bucket((int(year), int(month), ration_id, beneficiary_id))
+        values["distributed_amount"] += amount or 0
+        values["distribution_count"] += count
+
+    input_year = extract('year', RationInput.date)
+    input_month = extract('month', RationInput.date)
+    inputs = db.query(
+        input_year,
+        input_month,
+        RationInput.ration_stock_id,
+        func.sum(RationInput.amount),
+        func.count(RationInput.id)
+    ).filter(
+        RationInput.ration_stock_id.isnot(None)
+    ).group_by(
+        input_year,
+        input_month,
+        RationInput.ration_stock_id
+    ).all()
+
+    for year, month, ration_stock_id, amount, count in inputs:
+        values = bucket((int(year), int(month), ration_stock_id, NO_BENEFICIARY))
+        values["input_amount"] += amount or 0
+        values["input_count"] += count
+
+    return rollup
+
+
+def rebuild_rollup(db: Session) -> int:
+    """
+    Apaga e reconstrói a tabela monthly_rollup. Não faz commit.
+
+    Returns:
+        Número de linhas gravadas.
+    """
+    rollup = compute_rollup(db)
+    db.query(MonthlyRollup).delete(synchronize_session=False)
+    db.bulk_insert_mappings(MonthlyRollup, [
+        {
+            "year": year,
+            "month": month,
+            "ration_stock_id": ration_stock_id,
+            "beneficiary_id": beneficiary_id,
+            **values
+        }
+        for (year, month, ration_stock_id, beneficiary_id), values in rollup.items()
+    ])
+    return len(rollup)
+
+
+def verify_rollup(db: Session, tolerance: float = 1e-6) -> List[dict]:
+    """
+    Compara a tabela monthly_rollup com o recálculo a partir das tabelas de origem.
+
+    Returns:
+        Lista de divergências (vazia se o rollup estiver consistente).
+    """
+    expected = compute_rollup(db)
+    stored = {
+        (row.year, row.month, row.ration_stock_id, row.beneficiary_id): row
+        for row in db.query(MonthlyRollup).all()
+    }
+
+    mismatches = []
+    for key in set(expected) | set(stored):
+        expected_values = expected.get(key, {})
+        row = stored.get(key)
+        for column in ("distributed_amount", "distribution_count", "input_amount", "input_count"):
+            expected_value = expected_values.get(column, 0) or 0
+            stored_value = (getattr(row, column) if row else 0) or 0
+            if abs(expected_value - stored_value) > tolerance:
+                mismatches.append({
+                    "year": key[0],
+                    "month": key[1],
+                    "ration_stock_id": key[2],
+                    "beneficiary_id": key[3],
+                    "column": column,
+                    "expected": expected_value,
+                    "stored": stored_value,
+                })
+    return mismatches
@@ -0,0 +1,123 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional, Sequence
+from sqlalchemy import DateTime, text, tuple_
+from sqlalchemy.orm import Query
+
+# Modos de contagem aceitos no modo cursor
+COUNT_NONE = "none"
+COUNT_EXACT = "exact"
+COUNT_ESTIMATED = "estimated"
+CountMode = Literal["none", "exact", "estimated"]
+
+DEFAULT_PAGE_SIZE = 100
+
+
+class InvalidCursorError(ValueError):
+    """Cursor de paginação malformado ou incompatível com a ordenação"""
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Codifica os valores da chave de ordenação do último item em um cursor opaco.
+    """
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, order_columns: Sequence[Any]) -> List[Any]:
+    """
+    Decodifica um cursor gerado por encode_cursor, convertendo os valores
+    de acordo com o tipo das colunas de ordenação.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise InvalidCursorError("Cursor de paginação inválido") from e
+
+    if not isinstance(values, list) or len(values) != len(order_columns):
+        raise InvalidCursorError("Cursor de paginação inválido")
+
+    decoded = []
+    for column, value in zip(order_columns, values):
+        if value is not None and isinstance(column.type, DateTime):
+            try:
+                value = datetime.fromisoformat(value)
+            except (TypeError, ValueError) as e:
+                raise InvalidCursorError("Cursor de paginação inválido") from e
+        decoded.append(value)
+    return decoded
+
+
+def estimate_count(query: Query, table_name: str) -> int:
+    """
+    Estimativa barata do número de linhas da tabela (pg_class.reltuples).
+    Ignora filtros; em bancos que não são PostgreSQL faz a contagem exata.
+    """
+    session = query.session
+    if session.get_bind().dialect.name == "postgresql":
+        estimate = session.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE relname = :table"),
+            {"table": table_name}
+        ).scalar()
+        if estimate is not None and estimate >= 0:
+            return int(estimate)
+    return query.order_by(None).count()
+
+
+def keyset_paginate(
+    query: Query,
+    order_columns: Sequence[Any],
+    after: Optional[str],
+    limit: int,
+    descending: bool = False,
+    count: str = COUNT_NONE,
+    table_name: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Pagina uma consulta por chave (keyset) em vez de OFFSET/LIMIT.
+
+    Args:
+        query: Consulta já filtrada, sem ordenação nem paginação
+        order_columns: Colunas que formam a chave única de ordenação, ex.: (Model.id,)
+            ou (Model.created_at, Model.id)
+        after: Cursor opaco retornado na página anterior (vazio/None para a primeira página)
+        limit: Número máximo de itens por página
+        descending: Ordena do mais recente para o mais antigo
+        count: "none" (padrão), "exact" ou "estimated"
+        table_name: Tabela usada para a estimativa de contagem
+
+    Returns:
+        Dicionário com items, next_cursor, limit e total (None quando count="none").
+    """
+    total = None
+    if count == COUNT_EXACT:
+        total = query.order_by(None).count()
+    elif count == COUNT_ESTIMATED:
+        total = estimate_count(query, table_name) if table_name else query.order_by(None).count()
+
+    if after:
+        values = decode_cursor(after, order_columns)
+        key = tuple_(*order_columns) if len(order_columns) > 1 else order_columns[0]
+        bound = tuple_(*values) if len(values) > 1 else values[0]
+        query = query.filter(key < bound if descending else key > bound)
+
+    ordering = [column.desc() if descending else column.asc() for column in order_columns]
+    # Busca um item a mais para saber se existe próxima página
+    rows = query.order_by(*ordering).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column in order_columns])
+
+    return {
+        "items": rows,
+        "next_cursor": next_cursor,
+        "limit": limit,
+        "total": total
+    }
@@ -0,0 +1,182 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from os import getenv
+from typing import Callable, Optional, Set
+from passlib.context import CryptContext
+from sqlalchemy import update
+from database import AsyncSessionLocal
+from models.user_model import User
+from services.principal_cache import principal_cache
+
+logger = logging.getLogger(__name__)
+
+# Custo do bcrypt: hashes com outro custo são refeitos no próximo login
+BCRYPT_ROUNDS = int(getenv('BCRYPT_ROUNDS', '12'))
+# Threads dedicadas ao bcrypt e limite de operações pendentes (em execução + na fila)
+PASSWORD_HASH_WORKERS = int(getenv('PASSWORD_HASH_WORKERS', str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_PENDING = int(getenv('PASSWORD_HASH_MAX_PENDING', '64'))
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS
+)
+
+
+class PasswordHasherBusyError(RuntimeError):
+    """Fila do bcrypt cheia: a operação foi recusada sem ser executada"""
+
+
+class PasswordHasher:
+    """
+    Executa o bcrypt em um pool de threads próprio e limitado, fora do loop
+    de eventos (o bcrypt libera o GIL durante o cálculo). Com mais de
+    max_pending operações pendentes, novas chamadas são recusadas com
+    PasswordHasherBusyError em vez de acumular espera.
+
+    Também refaz em segundo plano, após um login bem-sucedido, os hashes
+    gerados com um custo diferente do configurado.
+    """
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, max_pending: int = PASSWORD_HASH_MAX_PENDING):
+        self.workers = max(workers, 1)
+        self.max_pending = max(max_pending, self.workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._background: Set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "rejected": 0,
+            "peak_pending": 0,
+            "wait_seconds": 0.0,
+            "run_seconds": 0.0,
+            "rehash_scheduled": 0,
+            "rehashed": 0,
+            "rehash_failed": 0,
+        }
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+            return self._executor
+
+    def _count(self, counter: str, amount=1) -> None:
+        with self._lock:
+            self._stats[counter] += amount
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def _submit(self, function: Callable, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._stats["rejected"] += 1
+                raise PasswordHasherBusyError("Muitas operações de senha em andamento")
+            self._pending += 1
+            self._stats["submitted"] += 1
+            self._stats["peak_pending"] = max(self._stats["peak_pending"], self._pending)
+        queued_at = time.perf_counter()
+
+        def run():
+            started = time.perf_counter()
+            with self._lock:
+                self._running += 1
+                self._stats["wait_seconds"] += started - queued_at
+            try:
+                return function(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._stats["completed"] += 1
+                    self._stats["run_seconds"] += time.perf_counter() - started
+
+        try:
+            future = self._get_executor().submit(run)
+        except RuntimeError:
+            self._release(None)
+            raise
+        # Libera a vaga ao concluir ou ao ser cancelada antes de executar
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(pwd_context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._submit(pwd_context.verify, password, hashed_password)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Hash com custo ou esquema diferente do configurado (sem calcular bcrypt)"""
+        return pwd_context.needs_update(hashed_password)
+
+    def schedule_rehash(self, user_id: int, old_hash: str, password: str) -> None:
+        """Refaz o hash do usuário em segundo plano, sem atrasar o login"""
+        task = asyncio.get_running_loop().create_task(self._rehash(user_id, old_hash, password))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        self._count("rehash_scheduled")
+
+    async def _rehash(self, user_id: int, old_hash: str, password: str) -> None:
+        try:
+            new_hash = await self.hash(password)
+            async with AsyncSessionLocal() as session:
+                # Só substitui se a senha não foi alterada nesse meio-tempo
+                result = await session.execute(
+                    update(User)
+                    .where(User.id == user_id, User.hashed_password == old_hash)
+                    .values(hashed_password=new_hash)
+                )
+                await session.commit()
+            if result.rowcount:
+                principal_cache.invalidate_user(user_id)
+                self._count("rehashed")
+        except PasswordHasherBusyError:
+            # Sem capacidade agora: tenta de novo no próximo login
+            self._count("rehash_failed")
+        except Exception as e:
+            self._count("rehash_failed")
+            logger.warning(f"Falha ao refazer o hash da senha do usuário {user_id}: {str(e)}")
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Aguarda os rehashes pendentes e encerra o pool"""
+        if self._background:
+            await asyncio.wait(list(self._background), timeout=timeout)
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            completed = self._stats["completed"]
+            return {
+                "rounds": BCRYPT_ROUNDS,
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "running": self._running,
+                "queue_depth": max(self._pending - self._running, 0),
+                "peak_pending": self._stats["peak_pending"],
+                "submitted": self._stats["submitted"],
+                "completed": completed,
+                "rejected": self._stats["rejected"],
+                "avg_wait_ms": round(self._stats["wait_seconds"] / completed * 1000, 2) if completed else 0.0,
+                "avg_run_ms": round(self._stats["run_seconds"] / completed * 1000, 2) if completed else 0.0,
+                "rehash_scheduled": self._stats["rehash_scheduled"],
+                "rehashed": self._stats["rehashed"],
+                "rehash_failed": self._stats["rehash_failed"],
+            }
+
+
+password_hasher = PasswordHasher()
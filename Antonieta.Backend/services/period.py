@@ -0,0 +1,143 @@
+from datetime import date, datetime, time, timedelta
+from typing import List, Literal, Optional, Tuple
+from sqlalchemy import and_, true, tuple_
+
+PeriodKind = Literal["month", "quarter", "last_days", "custom"]
+
+
+class InvalidPeriodError(ValueError):
+    """Período malformado (datas invertidas, parâmetros ausentes)"""
+
+
+def _first_of_month(year: int, month: int) -> date:
+    """Primeiro dia do mês, aceitando meses fora de 1..12 (ex.: 13 = janeiro do ano seguinte)"""
+    months = year * 12 + (month - 1)
+    return date(months // 12, months % 12 + 1, 1)
+
+
+class Period:
+    """
+    Intervalo semiaberto [start, end) de datas. As consultas comparam a
+    coluna diretamente com os limites (col >= start AND col < end), o que
+    permite usar índices sobre a coluna, ao contrário de extract(month/year).
+
+    start ou end None deixam o intervalo aberto naquele lado.
+    """
+
+    def __init__(self, start: Optional[date], end: Optional[date]):
+        self.start = start
+        self.end = end
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Period) and (self.start, self.end) == (other.start, other.end)
+
+    def __hash__(self) -> int:
+        return hash((self.start, self.end))
+
+    def __repr__(self) -> str:
+        return f"Period({self.start}, {self.end})"
+
+    @classmethod
+    def month(cls, year: int, month: int) -> "Period":
+        return cls(_first_of_month(year, month), _first_of_month(year, month + 1))
+
+    @classmethod
+    def quarter(cls, year: int, quarter: int) -> "Period":
+        if quarter not in (1, 2, 3, 4):
+            raise InvalidPeriodError("Trimestre deve estar entre 1 e 4")
+        first_month = (quarter - 1) * 3 + 1
+        return cls(_first_of_month(year, first_month), _first_of_month(year, first_month + 3))
+
+    @classmethod
+    def last_days(cls, days: int, today: Optional[date] = None) -> "Period":
+        """Últimos N dias, incluindo hoje"""
+        if days < 1:
+            raise InvalidPeriodError("O número de dias deve ser maior que zero")
+        today = today or date.today()
+        return cls(today - timedelta(days=days - 1), today + timedelta(days=1))
+
+    @classmethod
+    def between(cls, date_from: Optional[date] = None, date_to: Optional[date] = None) -> "Period":
+        """Intervalo com as duas datas inclusivas (como nos filtros da interface)"""
+        if date_from and date_to and date_from > date_to:
+            raise InvalidPeriodError("A data inicial deve ser anterior ou igual à data final")
+        return cls(date_from, date_to + timedelta(days=1) if date_to else None)
+
+    @classmethod
+    def current_month(cls, today: Optional[date] = None) -> "Period":
+        today = today or date.today()
+        return cls.month(today.year, today.month)
+
+    @classmethod
+    def current_quarter(cls, today: Optional[date] = None) -> "Period":
+        today = today or date.today()
+        return cls.quarter(today.year, (today.month - 1) // 3 + 1)
+
+    @property
+    def start_at(self) -> Optional[datetime]:
+        return datetime.combine(self.start, time.min) if self.start else None
+
+    @property
+    def end_at(self) -> Optional[datetime]:
+        return datetime.combine(self.end, time.min) if self.end else None
+
+    def conditions(self, column) -> List:
+        """Condições sargáveis sobre uma coluna de data/hora"""
+        conditions = []
+        if self.start:
+            conditions.append(column >= self.start_at)
+        if self.end:
+            conditions.append(column < self.end_at)
+        return conditions
+
+    def filter(self, column):
+        """Condição única (AND) para uso em where/join"""
+        conditions = self.conditions(column)
+        return and_(*conditions) if conditions else true()
+
+    def is_month_aligned(self) -> bool:
+        return all(bound is not None and bound.day == 1 for bound in (self.start, self.end))
+
+    def month_key_range(self) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        """Limites (ano, mês) semiabertos do período, para tabelas mensais"""
+        if not self.is_month_aligned():
+            raise InvalidPeriodError("O período não começa e termina em início de mês")
+        return (self.start.year, self.start.month), (self.end.year, self.end.month)
+
+    def month_filter(self, year_column, month_column):
+        """
+        Condição sobre colunas (ano, mês), como as de monthly_rollup,
+        comparadas como tupla para aproveitar a chave primária.
+        """
+        (start_year, start_month), (end_year, end_month) = self.month_key_range()
+        key = tuple_(year_column, month_column)
+        return and_(key >= tuple_(start_year, start_month), key < tuple_(end_year, end_month))
+
+    def as_dict(self) -> dict:
+        """Limites para as respostas da API (end exclusivo)"""
+        return {"start": self.start, "end": self.end}
+
+
+def resolve_period(
+    kind: PeriodKind = "month",
+    days: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    today: Optional[date] = None
+) -> Period:
+    """
+    Converte os parâmetros de consulta em um Period:
+    month (mês corrente), quarter (trimestre corrente), last_days (exige days)
+    ou custom (date_from/date_to inclusivos).
+    """
+    if kind == "month":
+        return Period.current_month(today)
+    if kind == "quarter":
+        return Period.current_quarter(today)
+    if kind == "last_days":
+        if days is None:
+            raise InvalidPeriodError("Informe days para o período last_days")
+        return Period.last_days(days, today)
+    if kind == "custom":
+        return Period.between(date_from, date_to)
+    raise InvalidPeriodError(f"Período desconhecido: {kind}")
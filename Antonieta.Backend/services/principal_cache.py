@@ -0,0 +1,104 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from os import getenv
+from typing import Any, Dict, Optional, Tuple
+
+# Tempo máximo (segundos) que um usuário autenticado fica em cache;
+# nunca ultrapassa o exp do token
+PRINCIPAL_CACHE_TTL = float(getenv('PRINCIPAL_CACHE_TTL', '60'))
+PRINCIPAL_CACHE_MAX_ENTRIES = int(getenv('PRINCIPAL_CACHE_MAX_ENTRIES', '1024'))
+
+
+def token_key(token: str) -> str:
+    """Chave do cache: hash do token (o token em si não fica em memória)"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class PrincipalCache:
+    """
+    Cache LRU em processo dos usuários resolvidos em get_current_user,
+    por hash do token. Guarda apenas os valores das colunas do usuário, sem
+    o hash da senha (ver principal_snapshot); cada acerto devolve um objeto
+    novo, sem vínculo com sessões.
+
+    Cada processo (worker) tem o seu cache: a invalidação por usuário vale
+    para o processo atual e os demais expiram pelo TTL.
+    """
+
+    def __init__(self, ttl: float = PRINCIPAL_CACHE_TTL, max_entries: int = PRINCIPAL_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        key = token_key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, token: str, principal: Dict[str, Any], token_exp: Optional[float] = None) -> None:
+        """
+        Guarda o usuário até o menor entre o TTL e o exp do token
+        (timestamp Unix do payload JWT).
+        """
+        if not self.enabled:
+            return
+        lifetime = self.ttl
+        if token_exp is not None:
+            lifetime = min(lifetime, token_exp - time.time())
+        if lifetime <= 0:
+            return
+        key = token_key(token)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + lifetime, principal)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Remove todos os tokens em cache do usuário (alteração ou exclusão)"""
+        with self._lock:
+            keys = [key for key, (_, principal) in self._entries.items() if principal.get("id") == user_id]
+            for key in keys:
+                del self._entries[key]
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+            }
+
+
+principal_cache = PrincipalCache()
@@ -1,113 +1,197 @@
-from typing import List, Optional, Tuple
-from sqlalchemy import func
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import func, select
 from models.ration_input_model import RationInput
-from models.ration_stock_model import RationStock
-from database import get_db
+from services import monthly_rollup_service
+from services import cache_service
+from services.cache_service import TABLE_RATION_INPUT, TABLE_RATION_STOCK
+from services.stock_service import (
+    StockNotFoundError,
+    InsufficientStockError,
+    KIND_INPUT,
+    adjust_stock,
+    withdraw_stock,
+    deposit_stock,
+    run_stock_transaction
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from services.pagination import keyset_paginate, COUNT_NONE
 from dtos.create_ration_input_dto import create_ration_input_dto
 from dtos.update_ration_input_dto import update_ration_input_dto
 
-async def get_all_ration_input_service(skip: int = 0, limit: int = 1000) -> Tuple[List[RationInput], int]:
+async def get_all_ration_input_service(db: AsyncSession, skip: int = 0, limit: int = 1000) -> Tuple[List[RationInput], int]:
     """
     Retorna todos os registros de entrada de ração do banco de dados.
     """
-    db = next(get_db())
-    try:
-        query = db.query(RationInput)
-        ration_inputs = query.offset(skip).limit(limit).all()
-        total_ration_inputs = db.query(func.count(RationInput.id)).scalar()
-        return ration_inputs, total_ration_inputs
-    finally:
-        db.close()
-
-async def get_ration_input_by_id_service(ration_input_id: int) -> Optional[RationInput]:
+    result = await db.execute(select(RationInput).offset(skip).limit(limit))
+    ration_inputs = result.scalars().all()
+    total_ration_inputs = await db.scalar(select(func.count(RationInput.id)))
+    return ration_inputs, total_ration_inputs
+
+async def get_ration_input_page_service(db: AsyncSession, after: Optional[str] = None, limit: int = 100, count: str = COUNT_NONE) -> Dict[str, Any]:
+    """
+    Retorna uma página de entradas de ração usando paginação por cursor (keyset),
+    ordenada por id. Evita OFFSET e, por padrão, a contagem total.
+
+    Args:
+        after: Cursor opaco retornado na página anterior (vazio para a primeira página).
+        limit: Número máximo de registros da página.
+        count: "none", "exact" ou "estimated".
+
+    Returns:
+        Dicionário com items, next_cursor, limit e total.
+    """
+    return await db.run_sync(
+        lambda session: keyset_paginate(
+            session.query(RationInput),
+            order_columns=(RationInput.id,),
+            after=after,
+            limit=limit,
+            count=count,
+            table_name="ration_input"
+        )
+    )
+
+async def get_ration_input_by_id_service(db: AsyncSession, ration_input_id: int) -> Optional[RationInput]:
     """
     Retorna um registro de entrada de ração específico.
     """
-    db = next(get_db())
-    try:
-        return db.query(RationInput).filter(RationInput.id == ration_input_id).first()
-    finally:
-        db.close()
+    return await db.scalar(select(RationInput).where(RationInput.id == ration_input_id))
+
+def _stock_http_error(error: Exception) -> HTTPException:
+    """Converte os erros do motor de estoque nas respostas HTTP da API"""
+    if isinstance(error, StockNotFoundError):
+        return HTTPException(status_code=404, detail="Estoque de ração não encontrado")
+    return HTTPException(status_code=400, detail="Estoque insuficiente")
+
+async def _create_ration_input(db: AsyncSession, ration_input_dto: create_ration_input_dto) -> RationInput:
+    # Criar o registro de entrada (flush para obter o ID usado no livro-razão)
+    db_ration_input = RationInput(**ration_input_dto.model_dump())
+    db.add(db_ration_input)
+    await db.flush()
 
-async def create_ration_input_service(ration_input_dto: create_ration_input_dto) -> RationInput:
+    # Atualizar o estoque
+    await deposit_stock(
+        db, ration_input_dto.ration_stock_id, ration_input_dto.amount,
+        kind=KIND_INPUT, source_id=db_ration_input.id, reference_date=ration_input_dto.date
+    )
+
+    # Atualizar totais mensais na mesma transação
+    await db.run_sync(
+        monthly_rollup_service.apply_input,
+        date=ration_input_dto.date,
+        ration_stock_id=ration_input_dto.ration_stock_id,
+        amount=ration_input_dto.amount
+    )
+    return db_ration_input
+
+async def create_ration_input_service(db: AsyncSession, ration_input_dto: create_ration_input_dto) -> RationInput:
     """
     Cria um novo registro de entrada de ração e atualiza o estoque.
     """
-    db = next(get_db())
     try:
-        # Criar o registro de entrada
-        db_ration_input = RationInput(**ration_input_dto.model_dump())
-        db.add(db_ration_input)
-        
-        # Atualizar o estoque
-        ration_stock = db.query(RationStock).filter(
-            RationStock.id == ration_input_dto.ration_stock_id
-        ).first()
-        if ration_stock:
-            ration_stock.stock += ration_input_dto.amount
-        
-        db.commit()
-        db.refresh(db_ration_input)
-        return db_ration_input
-    finally:
-        db.close()
-
-async def update_ration_input_service(ration_input_dto: update_ration_input_dto) -> Optional[RationInput]:
+        db_ration_input = await run_stock_transaction(db, _create_ration_input, ration_input_dto)
+    except StockNotFoundError as e:
+        raise _stock_http_error(e)
+    await cache_service.invalidate(TABLE_RATION_INPUT, TABLE_RATION_STOCK)
+    await db.refresh(db_ration_input)
+    return db_ration_input
+
+async def _update_ration_input(db: AsyncSession, ration_input_dto: update_ration_input_dto) -> Optional[RationInput]:
+    # Buscar o registro atual
+    current_input = await db.scalar(
+        select(RationInput).where(RationInput.id == ration_input_dto.id)
+    )
+
+    if not current_input:
+        return None
+
+    # Atualizar o estoque: só a diferença se a ração é a mesma, senão
+    # retirar do estoque antigo e somar ao novo
+    if current_input.ration_stock_id == ration_input_dto.ration_stock_id:
+        await adjust_stock(
+            db, current_input.ration_stock_id, ration_input_dto.amount - current_input.amount,
+            kind=KIND_INPUT, source_id=current_input.id, reference_date=ration_input_dto.date
+        )
+    else:
+        await withdraw_stock(
+            db, current_input.ration_stock_id, current_input.amount,
+            kind=KIND_INPUT, source_id=current_input.id, reference_date=current_input.date
+        )
+        await deposit_stock(
+            db, ration_input_dto.ration_stock_id, ration_input_dto.amount,
+            kind=KIND_INPUT, source_id=current_input.id, reference_date=ration_input_dto.date
+        )
+
+    # Retirar valores antigos dos totais mensais
+    await db.run_sync(
+        monthly_rollup_service.apply_input,
+        date=current_input.date,
+        ration_stock_id=current_input.ration_stock_id,
+        amount=current_input.amount,
+        sign=-1
+    )
+
+    # Atualizar o registro
+    for key, value in ration_input_dto.model_dump(exclude={'id'}).items():
+        setattr(current_input, key, value)
+
+    # Aplicar novos valores aos totais mensais
+    await db.run_sync(
+        monthly_rollup_service.apply_input,
+        date=current_input.date,
+        ration_stock_id=current_input.ration_stock_id,
+        amount=current_input.amount
+    )
+    return current_input
+
+async def update_ration_input_service(db: AsyncSession, ration_input_dto: update_ration_input_dto) -> Optional[RationInput]:
     """
     Atualiza um registro de entrada de ração e ajusta o estoque.
     """
-    db = next(get_db())
     try:
-        # Buscar o registro atual
-        current_input = db.query(RationInput).filter(
-            RationInput.id == ration_input_dto.id
-        ).first()
-        
-        if not current_input:
-            return None
-            
-        # Calcular a diferença na quantidade
-        amount_difference = ration_input_dto.amount - current_input.amount
-        
-        # Atualizar o registro
-        for key, value in ration_input_dto.model_dump(exclude={'id'}).items():
-            setattr(current_input, key, value)
-        
-        # Atualizar o estoque
-        ration_stock = db.query(RationStock).filter(
-            RationStock.id == current_input.ration_stock_id
-        ).first()
-        if ration_stock:
-            ration_stock.stock += amount_difference
-        
-        db.commit()
-        db.refresh(current_input)
-        return current_input
-    finally:
-        db.close()
-
-async def delete_ration_input_service(ration_input_id: int) -> bool:
+        current_input = await run_stock_transaction(db, _update_ration_input, ration_input_dto)
+    except (StockNotFoundError, InsufficientStockError) as e:
+        raise _stock_http_error(e)
+    if current_input:
+        await cache_service.invalidate(TABLE_RATION_INPUT, TABLE_RATION_STOCK)
+        await db.refresh(current_input)
+    return current_input
+
+async def _delete_ration_input(db: AsyncSession, ration_input_id: int) -> bool:
+    ration_input = await db.scalar(
+        select(RationInput).where(RationInput.id == ration_input_id)
+    )
+
+    if not ration_input:
+        return False
+
+    # Retirar a entrada do estoque (falha se o saldo já foi distribuído)
+    await withdraw_stock(
+        db, ration_input.ration_stock_id, ration_input.amount,
+        kind=KIND_INPUT, source_id=ration_input.id, reference_date=ration_input.date
+    )
+
+    # Retirar a entrada dos totais mensais
+    await db.run_sync(
+        monthly_rollup_service.apply_input,
+        date=ration_input.date,
+        ration_stock_id=ration_input.ration_stock_id,
+        amount=ration_input.amount,
+        sign=-1
+    )
+
+    await db.delete(ration_input)
+    return True
+
+async def delete_ration_input_service(db: AsyncSession, ration_input_id: int) -> bool:
     """
     Deleta um registro de entrada de ração e ajusta o estoque.
     """
-    db = next(get_db())
     try:
-        ration_input = db.query(RationInput).filter(
-            RationInput.id == ration_input_id
-        ).first()
-        
-        if not ration_input:
-            return False
-            
-        # Atualizar o estoque antes de deletar
-        ration_stock = db.query(RationStock).filter(
-            RationStock.id == ration_input.ration_stock_id
-        ).first()
-        if ration_stock:
-            ration_stock.stock -= ration_input.amount
-        
-        db.delete(ration_input)
-        db.commit()
-        return True
-    finally:
-        db.close()
\ No newline at end of file
+        deleted = await run_stock_transaction(db, _delete_ration_input, ration_input_id)
+    except (StockNotFoundError, InsufficientStockError) as e:
+        raise _stock_http_error(e)
+    if deleted:
+        await cache_service.invalidate(TABLE_RATION_INPUT, TABLE_RATION_STOCK)
+    return deleted
@@ -1,29 +1,60 @@
 from typing import Dict, Any, List, Optional, Tuple
-from sqlalchemy import func
+from fastapi import HTTPException
+from sqlalchemy import delete, func, select
 from models.ration_stock_model import RationStock
-from sqlalchemy.orm import Session
-from database import get_db
+from models.stock_movement_model import StockMovement
+from sqlalchemy.ext.asyncio import AsyncSession
+from services.pagination import keyset_paginate, COUNT_NONE
+from services import cache_service
+from services.cache_service import TABLE_RATION_STOCK
 from dtos.create_ration_stock_dto import create_ration_stock_dto
 from dtos.update_ration_stock_dto import update_ration_stock_dto
-
-async def get_all_ration_stock_service(skip: int = 0, limit: int = 1000) -> Tuple[List[RationStock], int]:
+from services.stock_service import (
+    KIND_ADJUSTMENT,
+    KIND_OPENING,
+    InsufficientStockError,
+    adjust_stock,
+    run_stock_transaction
+)
+
+async def get_all_ration_stock_service(db: AsyncSession, skip: int = 0, limit: int = 1000) -> Tuple[List[RationStock], int]:
     """
     Retorna todos os estoques de ração do banco de dados.
-    Obtém a sessão do DB internamente.
+    Usa a sessão da requisição (injetada pelo controller).
 
     Returns:
         Uma lista de objetos ration_stock.
     """
-    db = next(get_db())
-    try:
-        query = db.query(RationStock)
-        ration_stock = query.offset(skip).limit(limit).all()
-        total_ration_stock = db.query(func.count(RationStock.id)).scalar()
-        return ration_stock, total_ration_stock
-    finally:
-        db.close()
-
-async def get_ration_stock_by_id_service(ration_stock_id: int) -> Optional[RationStock]:
+    result = await db.execute(select(RationStock).offset(skip).limit(limit))
+    ration_stock = result.scalars().all()
+    total_ration_stock = await db.scalar(select(func.count(RationStock.id)))
+    return ration_stock, total_ration_stock
+
+async def get_ration_stock_page_service(db: AsyncSession, after: Optional[str] = None, limit: int = 100, count: str = COUNT_NONE) -> Dict[str, Any]:
+    """
+    Retorna uma página de estoques de ração usando paginação por cursor (keyset),
+    ordenada por id. Evita OFFSET e, por padrão, a contagem total.
+
+    Args:
+        after: Cursor opaco retornado na página anterior (vazio para a primeira página).
+        limit: Número máximo de registros da página.
+        count: "none", "exact" ou "estimated".
+
+    Returns:
+        Dicionário com items, next_cursor, limit e total.
+    """
+    return await db.run_sync(
+        lambda session: keyset_paginate(
+            session.query(RationStock),
+            order_columns=(RationStock.id,),
+            after=after,
+            limit=limit,
+            count=count,
+            table_name="ration_stock"
+        )
+    )
+
+async def get_ration_stock_by_id_service(db: AsyncSession, ration_stock_id: int) -> Optional[RationStock]:
     """
     Retorna um estoque de ração específico do banco de dados.
 
@@ -33,14 +64,18 @@ async def get_ration_stock_by_id_service(ration_stock_id: int) -> Optional[Ratio
     Returns:
         Um objeto ration_stock ou None se não encontrado.
     """
-    db = next(get_db())
-    try:
-        ration_stock = db.query(RationStock).filter(RationStock.id == ration_stock_id).first()
-        return ration_stock
-    finally:
-        db.close()
-
-async def create_ration_stock_service(ration_stock_dto: create_ration_stock_dto) -> RationStock:
+    return await db.scalar(select(RationStock).where(RationStock.id == ration_stock_id))
+
+async def _create_ration_stock(db: AsyncSession, ration_stock_dto: create_ration_stock_dto) -> RationStock:
+    # O saldo inicial entra pelo livro-razão (movimento de abertura)
+    db_ration_stock = RationStock(**ration_stock_dto.model_dump(exclude={'stock'}), stock=0)
+    db.add(db_ration_stock)
+    await db.flush()
+    if ration_stock_dto.stock:
+        await adjust_stock(db, db_ration_stock.id, ration_stock_dto.stock, kind=KIND_OPENING)
+    return db_ration_stock
+
+async def create_ration_stock_service(db: AsyncSession, ration_stock_dto: create_ration_stock_dto) -> RationStock:
     """
     Cria um novo estoque de ração no banco de dados.
 
@@ -50,19 +85,36 @@ async def create_ration_stock_service(ration_stock_dto: create_ration_stock_dto)
     Returns:
         O objeto ration_stock criado.
     """
-
-    db_ration_stock = RationStock(**ration_stock_dto.model_dump())
-
-    db = next(get_db())
     try:
-        db.add(db_ration_stock)
-        db.commit()
-        db.refresh(db_ration_stock)
-        return db_ration_stock
-    finally:
-        db.close()
-
-async def update_ration_stock_service(ration_stock_dto: update_ration_stock_dto) -> Optional[RationStock]:
+        db_ration_stock = await run_stock_transaction(db, _create_ration_stock, ration_stock_dto)
+    except InsufficientStockError:
+        raise HTTPException(status_code=400, detail="O estoque inicial não pode ser negativo")
+    await db.refresh(db_ration_stock)
+    await cache_service.invalidate(TABLE_RATION_STOCK)
+    return db_ration_stock
+
+async def _update_ration_stock(db: AsyncSession, ration_stock_dto: update_ration_stock_dto) -> Optional[RationStock]:
+    # Bloquear a linha: o ajuste é a diferença para o saldo atual
+    ration_stock = await db.scalar(
+        select(RationStock)
+        .where(RationStock.id == ration_stock_dto.id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+    if not ration_stock:
+        return None
+
+    update_data = ration_stock_dto.model_dump(exclude={'id'}, exclude_unset=True)
+    target_stock = update_data.pop('stock', None)
+    for key, value in update_data.items():
+        setattr(ration_stock, key, value)
+
+    # Alteração manual do saldo vira um ajuste no livro-razão
+    if target_stock is not None and target_stock != (ration_stock.stock or 0):
+        await adjust_stock(db, ration_stock.id, target_stock - (ration_stock.stock or 0), kind=KIND_ADJUSTMENT)
+    return ration_stock
+
+async def update_ration_stock_service(db: AsyncSession, ration_stock_dto: update_ration_stock_dto) -> Optional[RationStock]:
     """
     Atualiza um estoque de ração existente no banco de dados.
 
@@ -72,21 +124,16 @@ async def update_ration_stock_service(ration_stock_dto: update_ration_stock_dto)
     Returns:
         O objeto ration_stock atualizado ou None se não encontrado.
     """
-    db = next(get_db())
     try:
-        ration_stock = db.query(RationStock).filter(RationStock.id == ration_stock_dto.id).first()
-        if ration_stock:
-            update_data = ration_stock_dto.model_dump(exclude={'id'}, exclude_unset=True)
-
-            for key, value in update_data.items():
-                setattr(ration_stock, key, value)
-            db.commit()
-            db.refresh(ration_stock)
-        return ration_stock
-    finally:
-        db.close()
-
-async def delete_ration_stock_service(ration_stock_id: int) -> bool:
+        ration_stock = await run_stock_transaction(db, _update_ration_stock, ration_stock_dto)
+    except InsufficientStockError:
+        raise HTTPException(status_code=400, detail="O estoque não pode ser negativo")
+    if ration_stock:
+        await db.refresh(ration_stock)
+        await cache_service.invalidate(TABLE_RATION_STOCK)
+    return ration_stock
+
+async def delete_ration_stock_service(db: AsyncSession, ration_stock_id: int) -> bool:
     """
     Deleta um estoque de ração do banco de dados.
 
@@ -96,13 +143,11 @@ async def delete_ration_stock_service(ration_stock_id: int) -> bool:
     Returns:
         True se o estoque de ração foi deletado, False caso contrário.
     """
-    db = next(get_db())
-    try:
-        ration_stock = db.query(RationStock).filter(RationStock.id == ration_stock_id).first()
-        if not ration_stock:
-            return False
-        db.delete(ration_stock)
-        db.commit()
-        return True
-    finally:
-        db.close()
\ No newline at end of file
+    ration_stock = await db.scalar(select(RationStock).where(RationStock.id == ration_stock_id))
+    if not ration_stock:
+        return False
+    await db.execute(delete(StockMovement).where(StockMovement.ration_stock_id == ration_stock_id))
+    await db.delete(ration_stock)
+    await db.commit()
+    await cache_service.invalidate(TABLE_RATION_STOCK)
+    return True
\ No newline at end of file
@@ -0,0 +1,192 @@
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+from sqlalchemy import select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from models.ration_stock_model import RationStock
+from models.stock_movement_model import StockMovement
+from services.pagination import keyset_paginate
+from services.period import Period
+
+# Reconstrói o livro-razão a partir das entradas e distribuições: por ração,
+# um movimento de abertura (saldo atual menos o histórico) seguido dos
+# movimentos na ordem em que foram registrados (created_at), com saldo e
+# totais acumulados por janela. recorded_at segue a mesma linha do tempo
+# dos movimentos gravados pelo motor de estoque (momento do registro); a
+# data informada pelo usuário vai para reference_date
+REBUILD_LEDGER_SQL = """
+    WITH events AS (
+        SELECT ration_stock_id, COALESCE(created_at, date) AS recorded_at, date AS reference_date,
+               1 AS priority, 'input' AS kind, id AS source_id, amount AS delta
+        FROM ration_input
+        WHERE ration_stock_id IS NOT NULL AND date IS NOT NULL AND amount IS NOT NULL
+        UNION ALL
+        SELECT ration_id, COALESCE(created_at, date), date, 2, 'distribution', id, -amount
+        FROM distribution
+        WHERE ration_id IS NOT NULL AND date IS NOT NULL AND amount IS NOT NULL
+    ),
+    ledger AS (
+        SELECT rs.id AS ration_stock_id,
+               COALESCE((SELECT MIN(e.recorded_at) FROM events e WHERE e.ration_stock_id = rs.id), rs.created_at, CURRENT_TIMESTAMP) AS recorded_at,
+               NULL AS reference_date,
+               0 AS priority,
+               'opening' AS kind,
+               NULL AS source_id,
+               COALESCE(rs.stock, 0) - COALESCE((SELECT SUM(e.delta) FROM events e WHERE e.ration_stock_id = rs.id), 0) AS delta
+        FROM ration_stock rs
+        UNION ALL
+        SELECT ration_stock_id, recorded_at, reference_date, priority, kind, source_id, delta FROM events
+    )
+    INSERT INTO stock_movement (
+        ration_stock_id, sequence, kind, source_id, reference_date,
+        delta, balance, total_in, total_out, recorded_at
+    )
+    SELECT ration_stock_id,
+           ROW_NUMBER() OVER w,
+           kind,
+           source_id,
+           reference_date,
+           delta,
+           SUM(delta) OVER w,
+           SUM(CASE WHEN delta > 0 THEN delta ELSE 0 END) OVER w,
+           SUM(CASE WHEN delta < 0 THEN -delta ELSE 0 END) OVER w,
+           recorded_at
+    FROM ledger
+    WINDOW w AS (PARTITION BY ration_stock_id ORDER BY recorded_at, priority, source_id ROWS UNBOUNDED PRECEDING)
+"""
+
+
+def _last_movement(ration_stock_id: int, before: Optional[datetime] = None, inclusive: bool = False):
+    """
+    Último movimento da ração registrado antes de `before` (ou o último de
+    todos): uma busca no índice ix_stock_movement_ration_recorded.
+    """
+    conditions = [StockMovement.ration_stock_id == ration_stock_id]
+    if before is not None:
+        conditions.append(StockMovement.recorded_at <= before if inclusive else StockMovement.recorded_at < before)
+    return (
+        select(StockMovement)
+        .where(*conditions)
+        .order_by(StockMovement.recorded_at.desc(), StockMovement.sequence.desc())
+        .limit(1)
+    )
+
+
+async def get_stock_as_of_service(db: AsyncSession, ration_stock_id: int, at: datetime) -> Dict[str, Any]:
+    """
+    Saldo da ração em um instante: o saldo do último movimento registrado
+    até `at` (0 se ainda não havia movimentos). É o saldo que o sistema
+    tinha naquele momento: entradas e distribuições lançadas depois com data
+    retroativa não o alteram (ver StockMovement).
+
+    Returns:
+        Dicionário com ration_stock_id, at, stock, sequence e recorded_at.
+    """
+    last = await db.scalar(_last_movement(ration_stock_id, at, inclusive=True))
+    return {
+        "ration_stock_id": ration_stock_id,
+        "at": at,
+        "stock": last.balance if last else 0.0,
+        "sequence": last.sequence if last else None,
+        "recorded_at": last.recorded_at if last else None,
+    }
+
+
+async def get_stock_movements_service(
+    db: AsyncSession,
+    ration_stock_id: int,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    after: Optional[str] = None,
+    limit: int = 100
+) -> Dict[str, Any]:
+    """
+    Movimentos da ração registrados no período [date_from, date_to]
+    (date_to inclusivo; pelo momento do registro, recorded_at), em ordem de
+    sequência, paginados por cursor.
+    Levanta InvalidPeriodError se date_from for posterior a date_to.
+
+    Saldo inicial, saldo final e totais de entrada/saída do período vêm dos
+    valores acumulados do último movimento antes de cada limite (duas buscas
+    no índice), sem somar os movimentos.
+
+    Returns:
+        Dicionário com items, next_cursor, limit, opening_balance,
+        closing_balance, total_in e total_out.
+    """
+    period = Period.between(date_from, date_to)
+
+    opening = await db.scalar(_last_movement(ration_stock_id, period.start_at)) if period.start else None
+    closing = await db.scalar(_last_movement(ration_stock_id, period.end_at))
+
+    def accumulated(movement: Optional[StockMovement]) -> Dict[str, float]:
+        if movement is None:
+            return {"balance": 0.0, "total_in": 0.0, "total_out": 0.0}
+        return {"balance": movement.balance, "total_in": movement.total_in, "total_out": movement.total_out}
+
+    start, end = accumulated(opening), accumulated(closing)
+
+    page = await db.run_sync(
+        lambda session: keyset_paginate(
+            session.query(StockMovement).filter(
+                StockMovement.ration_stock_id == ration_stock_id,
+                *period.conditions(StockMovement.recorded_at)
+            ),
+            order_columns=(StockMovement.sequence,),
+            after=after,
+            limit=limit
+        )
+    )
+
+    return {
+        "ration_stock_id": ration_stock_id,
+        "date_from": date_from,
+        "date_to": date_to,
+        "items": page["items"],
+        "next_cursor": page["next_cursor"],
+        "limit": limit,
+        "opening_balance": start["balance"],
+        "closing_balance": end["balance"],
+        "total_in": end["total_in"] - start["total_in"],
+        "total_out": end["total_out"] - start["total_out"],
+    }
+
+
+async def refresh_stock_projection(db: AsyncSession, ration_stock_id: int) -> Optional[float]:
+    """
+    Regrava RationStock.stock a partir do último saldo do livro-razão.
+    Não faz commit.
+
+    Returns:
+        O saldo do livro-razão, ou None se a ração não tem movimentos.
+    """
+    last = await db.scalar(
+        select(StockMovement.balance)
+        .where(StockMovement.ration_stock_id == ration_stock_id)
+        .order_by(StockMovement.sequence.desc())
+        .limit(1)
+    )
+    if last is None:
+        return None
+    await db.execute(
+        update(RationStock)
+        .where(RationStock.id == ration_stock_id)
+        .values(stock=last)
+        .execution_options(synchronize_session=False)
+    )
+    return last
+
+
+def rebuild_ledger(db: Session) -> int:
+    """
+    Apaga e reconstrói o livro-razão a partir das entradas e distribuições,
+    mantendo o saldo atual de cada ração (ajustes manuais anteriores ficam
+    no movimento de abertura). Cada entrada/distribuição vira um movimento
+    com o valor atual, registrado no seu created_at. Não faz commit.
+
+    Returns:
+        Número de movimentos gravados.
+    """
+    db.query(StockMovement).delete(synchronize_session=False)
+    db.execute(text(REBUILD_LEDGER_SQL))
+    return db.query(StockMovement).count()
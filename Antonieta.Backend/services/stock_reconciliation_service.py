@@ -0,0 +1,290 @@
+import time
+from datetime import datetime, timezone
+from os import getenv
+from typing import Any, Dict, Iterable, List, Optional, Set
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.distribution_model import Distribution
+from models.ration_input_model import RationInput
+from models.ration_stock_model import RationStock
+from models.stock_movement_model import StockMovement
+from models.stock_reconciliation_model import StockReconciliationCheckpoint
+from services.stock_ledger_service import refresh_stock_projection
+from services.stock_service import KIND_DISTRIBUTION, KIND_INPUT, InsufficientStockError, adjust_stock
+
+# IDs abaixo do checkpoint verificados de novo a cada execução: cobre
+# transações que obtiveram o ID antes da execução anterior e só fizeram
+# commit depois dela
+RECONCILE_ID_OVERLAP = int(getenv('RECONCILE_ID_OVERLAP', '1000'))
+# Tamanho dos lotes de IDs consultados por vez (cláusula IN)
+RECONCILE_BATCH_SIZE = int(getenv('RECONCILE_BATCH_SIZE', '1000'))
+TOLERANCE = 1e-6
+
+CHECKPOINT_ID = 1
+
+# Tipos de divergência
+DRIFT_PROJECTION = "projection"  # ration_stock.stock diferente do último saldo do livro-razão
+DRIFT_CHAIN = "chain"            # sequência ou saldo acumulado quebrado no livro-razão
+DRIFT_SOURCE = "source"          # movimentos de uma entrada/distribuição não somam o valor atual
+
+# Sinal de cada tabela de origem no estoque
+SOURCES = {
+    KIND_INPUT: (RationInput, RationInput.ration_stock_id, 1),
+    KIND_DISTRIBUTION: (Distribution, Distribution.ration_id, -1),
+}
+
+
+def _differs(a: Optional[float], b: Optional[float]) -> bool:
+    return abs((a or 0) - (b or 0)) > TOLERANCE
+
+
+def _batches(ids: Iterable[int], size: int = RECONCILE_BATCH_SIZE):
+    ids = sorted(ids)
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+async def _load_checkpoint(db: AsyncSession) -> StockReconciliationCheckpoint:
+    """Checkpoint bloqueado para esta execução (impede execuções simultâneas)"""
+    checkpoint = await db.scalar(
+        select(StockReconciliationCheckpoint)
+        .where(StockReconciliationCheckpoint.id == CHECKPOINT_ID)
+        .with_for_update()
+    )
+    if checkpoint is None:
+        checkpoint = StockReconciliationCheckpoint(
+            id=CHECKPOINT_ID, last_input_id=0, last_distribution_id=0, last_movement_id=0, last_drift_count=0
+        )
+        db.add(checkpoint)
+        await db.flush()
+    return checkpoint
+
+
+async def _projection_drift(db: AsyncSession) -> List[Dict[str, Any]]:
+    """
+    Compara o saldo de cada ração com o último movimento do livro-razão
+    (uma busca no índice por ração, sem percorrer o histórico).
+    """
+    last_balance = (
+        select(StockMovement.balance)
+        .where(StockMovement.ration_stock_id == RationStock.id)
+        .order_by(StockMovement.sequence.desc())
+        .limit(1)
+        .correlate(RationStock)
+        .scalar_subquery()
+    )
+    rows = (await db.execute(select(RationStock.id, RationStock.stock, last_balance.label("ledger_balance")))).all()
+    return [
+        {
+            "type": DRIFT_PROJECTION,
+            "ration_stock_id": row.id,
+            "expected": row.ledger_balance or 0,
+            "recorded": row.stock or 0,
+        }
+        for row in rows
+        if _differs(row.stock, row.ledger_balance)
+    ]
+
+
+async def _chain_drift(db: AsyncSession, after_id: int) -> Dict[str, Any]:
+    """
+    Confere a sequência e os valores acumulados dos movimentos com ID maior
+    que `after_id`, partindo do movimento anterior de cada ração.
+    """
+    movements = (await db.execute(
+        select(StockMovement)
+        .where(StockMovement.id > after_id)
+        .order_by(StockMovement.ration_stock_id, StockMovement.sequence)
+    )).scalars().all()
+
+    drift = []
+    by_ration: Dict[int, List[StockMovement]] = {}
+    for movement in movements:
+        by_ration.setdefault(movement.ration_stock_id, []).append(movement)
+
+    for ration_stock_id, ration_movements in by_ration.items():
+        previous = await db.scalar(
+            select(StockMovement).where(
+                StockMovement.ration_stock_id == ration_stock_id,
+                StockMovement.sequence == ration_movements[0].sequence - 1
+            )
+        )
+        if previous is None and ration_movements[0].sequence != 1:
+            drift.append({
+                "type": DRIFT_CHAIN,
+                "ration_stock_id": ration_stock_id,
+                "sequence": ration_movements[0].sequence,
+                "detail": "movimento anterior ausente",
+            })
+        balance = previous.balance if previous else 0.0
+        total_in = previous.total_in if previous else 0.0
+        total_out = previous.total_out if previous else 0.0
+        sequence = previous.sequence if previous else ration_movements[0].sequence - 1
+
+        for movement in ration_movements:
+            balance += movement.delta
+            total_in += max(movement.delta, 0)
+            total_out += max(-movement.delta, 0)
+            sequence += 1
+            if movement.sequence != sequence:
+                detail = f"sequência {movement.sequence}, esperada {sequence}"
+            elif _differs(movement.balance, balance):
+                detail = f"saldo {movement.balance}, esperado {balance}"
+            elif _differs(movement.total_in, total_in) or _differs(movement.total_out, total_out):
+                detail = "totais acumulados divergentes"
+            else:
+                continue
+            drift.append({
+                "type": DRIFT_CHAIN,
+                "ration_stock_id": ration_stock_id,
+                "sequence": movement.sequence,
+                "detail": detail,
+            })
+            # Continua a partir do valor gravado para não repetir a mesma quebra
+            balance, total_in, total_out, sequence = movement.balance, movement.total_in, movement.total_out, movement.sequence
+
+    return {"drift": drift, "checked": len(movements), "max_id": max((m.id for m in movements), default=after_id)}
+
+
+async def _source_drift(db: AsyncSession, kind: str, after_id: int, movement_after_id: int) -> Dict[str, Any]:
+    """
+    Para as entradas (ou distribuições) novas desde o checkpoint e as citadas
+    por movimentos novos (alterações e exclusões), compara o valor atual com
+    a soma dos seus movimentos no livro-razão, por ração.
+    """
+    model, ration_column, sign = SOURCES[kind]
+
+    ids: Set[int] = set((await db.scalars(select(model.id).where(model.id > after_id))).all())
+    ids |= set((await db.scalars(
+        select(StockMovement.source_id).distinct().where(
+            StockMovement.id > movement_after_id,
+            StockMovement.kind == kind,
+            StockMovement.source_id.isnot(None)
+        )
+    )).all())
+
+    drift = []
+    for batch in _batches(ids):
+        expected: Dict[int, Dict[int, float]] = {source_id: {} for source_id in batch}
+        for row in (await db.execute(
+            select(model.id, ration_column.label("ration_stock_id"), model.amount).where(model.id.in_(batch))
+        )).all():
+            if row.ration_stock_id is not None:
+                expected[row.id][row.ration_stock_id] = sign * (row.amount or 0)
+
+        recorded: Dict[int, Dict[int, float]] = {source_id: {} for source_id in batch}
+        for row in (await db.execute(
+            select(StockMovement.source_id, StockMovement.ration_stock_id, func.sum(StockMovement.delta).label("delta"))
+            .where(StockMovement.kind == kind, StockMovement.source_id.in_(batch))
+            .group_by(StockMovement.source_id, StockMovement.ration_stock_id)
+        )).all():
+            recorded[row.source_id][row.ration_stock_id] = row.delta
+
+        for source_id in batch:
+            for ration_stock_id in set(expected[source_id]) | set(recorded[source_id]):
+                expected_delta = expected[source_id].get(ration_stock_id, 0.0)
+                recorded_delta = recorded[source_id].get(ration_stock_id, 0.0)
+                if _differs(expected_delta, recorded_delta):
+                    drift.append({
+                        "type": DRIFT_SOURCE,
+                        "ration_stock_id": ration_stock_id,
+                        "kind": kind,
+                        "source_id": source_id,
+                        "expected": expected_delta,
+                        "recorded": recorded_delta,
+                    })
+
+    max_id = await db.scalar(select(func.max(model.id)))
+    return {"drift": drift, "checked": len(ids), "max_id": max(max_id or 0, after_id)}
+
+
+async def _repair(db: AsyncSession, drift: List[Dict[str, Any]]) -> None:
+    """
+    Corrige as divergências que têm correção segura, marcando cada item com
+    repaired=True/False:
+
+    - projection: regrava ration_stock.stock com o saldo do livro-razão;
+    - source: acrescenta um movimento com a diferença (o saldo acompanha),
+      se o estoque comportar;
+    - chain: não é corrigida (o livro-razão é somente de acréscimo).
+    """
+    for item in drift:
+        if item["type"] == DRIFT_PROJECTION:
+            await refresh_stock_projection(db, item["ration_stock_id"])
+            item["repaired"] = True
+
+    for item in drift:
+        if item["type"] == DRIFT_SOURCE:
+            try:
+                await adjust_stock(
+                    db, item["ration_stock_id"], item["expected"] - item["recorded"],
+                    kind=item["kind"], source_id=item["source_id"]
+                )
+                item["repaired"] = True
+            except InsufficientStockError:
+                item["repaired"] = False
+        elif item["type"] == DRIFT_CHAIN:
+            item["repaired"] = False
+
+
+async def reconcile_stock(db: AsyncSession, repair: bool = False, full: bool = False) -> Dict[str, Any]:
+    """
+    Reconciliação incremental do estoque. Verifica, por ração:
+
+    - o saldo (ration_stock.stock) contra o último movimento do livro-razão;
+    - a sequência e os acumulados dos movimentos novos desde o checkpoint;
+    - as entradas e distribuições novas (ou alteradas/excluídas, via seus
+      movimentos novos) contra a soma dos seus movimentos.
+
+    Com repair=True corrige o que é seguro corrigir (ver _repair). Ao final
+    grava o novo checkpoint. Não faz commit; no PostgreSQL deve rodar em uma
+    transação REPEATABLE READ para que todas as leituras vejam o mesmo estado.
+
+    Args:
+        repair: Corrige as divergências encontradas.
+        full: Ignora o checkpoint e verifica todo o histórico.
+
+    Returns:
+        Relatório com o modo, as quantidades verificadas, as divergências
+        (com repaired quando repair=True) e o checkpoint gravado.
+    """
+    started = time.perf_counter()
+    checkpoint = await _load_checkpoint(db)
+
+    def since(last_id: int) -> int:
+        return 0 if full else max(last_id - RECONCILE_ID_OVERLAP, 0)
+
+    movement_after = since(checkpoint.last_movement_id)
+    projection = await _projection_drift(db)
+    chain = await _chain_drift(db, movement_after)
+    inputs = await _source_drift(db, KIND_INPUT, since(checkpoint.last_input_id), movement_after)
+    distributions = await _source_drift(db, KIND_DISTRIBUTION, since(checkpoint.last_distribution_id), movement_after)
+
+    drift = projection + chain["drift"] + inputs["drift"] + distributions["drift"]
+    if repair and drift:
+        await _repair(db, drift)
+    unresolved = [item for item in drift if not item.get("repaired")]
+
+    checkpoint.last_input_id = inputs["max_id"]
+    checkpoint.last_distribution_id = distributions["max_id"]
+    checkpoint.last_movement_id = max(chain["max_id"], await db.scalar(select(func.max(StockMovement.id))) or 0)
+    checkpoint.last_run_at = datetime.now(timezone.utc)
+    checkpoint.last_drift_count = len(unresolved)
+
+    return {
+        "mode": "full" if full else "incremental",
+        "repair": repair,
+        "checked": {
+            "movements": chain["checked"],
+            "inputs": inputs["checked"],
+            "distributions": distributions["checked"],
+        },
+        "drift": drift,
+        "unresolved": len(unresolved),
+        "checkpoint": {
+            "last_input_id": checkpoint.last_input_id,
+            "last_distribution_id": checkpoint.last_distribution_id,
+            "last_movement_id": checkpoint.last_movement_id,
+        },
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
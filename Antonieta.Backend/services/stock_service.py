@@ -0,0 +1,230 @@
+import asyncio
+from datetime import datetime, timezone
+from os import getenv
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.ration_stock_model import RationStock
+from models.stock_movement_model import StockMovement
+
+T = TypeVar("T")
+
+# Tentativas e espera (segundos, cresce a cada tentativa) para falhas de serialização
+STOCK_MAX_RETRIES = int(getenv('STOCK_MAX_RETRIES', '3'))
+STOCK_RETRY_BACKOFF = float(getenv('STOCK_RETRY_BACKOFF', '0.05'))
+
+# SQLSTATE de serialization_failure e deadlock_detected no PostgreSQL
+RETRYABLE_SQLSTATES = {"40001", "40P01"}
+
+# Tipos de movimento do livro-razão (stock_movement)
+KIND_OPENING = "opening"
+KIND_INPUT = "input"
+KIND_DISTRIBUTION = "distribution"
+KIND_ADJUSTMENT = "adjustment"
+
+
+class StockNotFoundError(LookupError):
+    """O estoque de ração informado não existe"""
+
+    def __init__(self, ration_stock_id: int):
+        super().__init__(f"Estoque de ração {ration_stock_id} não encontrado")
+        self.ration_stock_id = ration_stock_id
+
+
+class InsufficientStockError(ValueError):
+    """O estoque não comporta a retirada solicitada"""
+
+    def __init__(self, ration_stock_id: int, requested: float, available: float):
+        super().__init__(
+            f"Estoque insuficiente para a ração {ration_stock_id}: "
+            f"solicitado {requested}, disponível {available}"
+        )
+        self.ration_stock_id = ration_stock_id
+        self.requested = requested
+        self.available = available
+
+
+def is_retryable_error(error: DBAPIError) -> bool:
+    """Indica se o erro é uma falha de serialização/deadlock (ou banco SQLite travado)"""
+    orig = error.orig
+    sqlstate = getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+    if sqlstate in RETRYABLE_SQLSTATES:
+        return True
+    return "database is locked" in str(orig).lower()
+
+
+def movement(
+    delta: float,
+    kind: str = KIND_ADJUSTMENT,
+    source_id: Optional[int] = None,
+    reference_date: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """Movimento a registrar no livro-razão"""
+    return {"delta": delta, "kind": kind, "source_id": source_id, "reference_date": reference_date}
+
+
+async def update_stock_balance(db: AsyncSession, ration_stock_id: int, delta: float) -> float:
+    """
+    Soma `delta` ao saldo (RationStock.stock) com um único UPDATE condicional,
+    sem ler o valor antes:
+
+        UPDATE ration_stock SET stock = COALESCE(stock, 0) + :delta
+        WHERE id = :id AND COALESCE(stock, 0) + :delta >= 0
+        RETURNING stock
+
+    Retiradas (delta negativo) só são aplicadas se houver saldo, o que impede
+    que duas transações simultâneas vendam o mesmo estoque. O UPDATE também
+    bloqueia a linha da ração até o commit, serializando os registros no
+    livro-razão. Um saldo nulo (estoque cadastrado sem quantidade) conta como
+    zero. Não registra o movimento (ver record_movements) nem faz commit.
+
+    Returns:
+        O novo saldo do estoque.
+
+    Raises:
+        StockNotFoundError: se o estoque não existe.
+        InsufficientStockError: se a retirada deixaria o saldo negativo.
+    """
+    current_stock = func.coalesce(RationStock.stock, 0)
+    conditions = [RationStock.id == ration_stock_id]
+    if delta < 0:
+        conditions.append(current_stock + delta >= 0)
+
+    new_stock = await db.scalar(
+        update(RationStock)
+        .where(*conditions)
+        .values(stock=current_stock + delta)
+        .returning(RationStock.stock)
+        .execution_options(synchronize_session=False)
+    )
+    if new_stock is not None:
+        return new_stock
+
+    available = await db.scalar(select(current_stock).where(RationStock.id == ration_stock_id))
+    if available is None:
+        raise StockNotFoundError(ration_stock_id)
+    raise InsufficientStockError(ration_stock_id, -delta, available)
+
+
+async def record_movements(db: AsyncSession, ration_stock_id: int, new_stock: float, movements: List[Dict[str, Any]]) -> None:
+    """
+    Acrescenta os movimentos ao livro-razão da ração, em ordem, com o saldo
+    e os totais acumulados após cada um. Deve ser chamada na mesma transação
+    de update_stock_balance, com o saldo retornado por ela (já somados todos
+    os movimentos). Não faz commit.
+
+    recorded_at é o momento em que o estoque mudou, não a data da entrada ou
+    distribuição (que vai para reference_date): uma distribuição com data
+    retroativa altera o saldo a partir do registro, sem reescrever saldos
+    já gravados.
+    """
+    if not movements:
+        return
+
+    last = (await db.execute(
+        select(StockMovement.sequence, StockMovement.total_in, StockMovement.total_out, StockMovement.recorded_at)
+        .where(StockMovement.ration_stock_id == ration_stock_id)
+        .order_by(StockMovement.sequence.desc())
+        .limit(1)
+    )).first()
+    sequence, total_in, total_out, last_recorded_at = last if last else (0, 0.0, 0.0, None)
+
+    balance = new_stock - sum(item["delta"] for item in movements)
+    # Momento do registro, nunca anterior ao movimento anterior: a ordem de
+    # recorded_at acompanha a de sequence (relógios de workers diferentes)
+    recorded_at = datetime.now(timezone.utc)
+    if last_recorded_at is not None:
+        if last_recorded_at.tzinfo is None:
+            last_recorded_at = last_recorded_at.replace(tzinfo=timezone.utc)
+        recorded_at = max(recorded_at, last_recorded_at)
+    rows = []
+    for item in movements:
+        sequence += 1
+        balance += item["delta"]
+        total_in += max(item["delta"], 0)
+        total_out += max(-item["delta"], 0)
+        rows.append({
+            "ration_stock_id": ration_stock_id,
+            "sequence": sequence,
+            "kind": item["kind"],
+            "source_id": item["source_id"],
+            "reference_date": item["reference_date"],
+            "delta": item["delta"],
+            "balance": balance,
+            "total_in": total_in,
+            "total_out": total_out,
+            "recorded_at": recorded_at,
+        })
+    # O último saldo é exatamente a projeção gravada em ration_stock
+    rows[-1]["balance"] = new_stock
+    await db.execute(insert(StockMovement), rows)
+
+
+async def apply_movements(db: AsyncSession, ration_stock_id: int, movements: List[Dict[str, Any]]) -> float:
+    """
+    Aplica os movimentos ao saldo da ração (verificando o total) e os
+    registra no livro-razão. Não faz commit.
+
+    Returns:
+        O novo saldo do estoque.
+    """
+    new_stock = await update_stock_balance(db, ration_stock_id, sum(item["delta"] for item in movements))
+    await record_movements(db, ration_stock_id, new_stock, movements)
+    return new_stock
+
+
+async def adjust_stock(
+    db: AsyncSession,
+    ration_stock_id: int,
+    delta: float,
+    kind: str = KIND_ADJUSTMENT,
+    source_id: Optional[int] = None,
+    reference_date: Optional[datetime] = None
+) -> float:
+    """
+    Soma `delta` ao estoque e registra o movimento no livro-razão.
+    Ver update_stock_balance. Não faz commit.
+
+    Returns:
+        O novo saldo do estoque.
+    """
+    return await apply_movements(db, ration_stock_id, [movement(delta, kind, source_id, reference_date)])
+
+
+async def withdraw_stock(db: AsyncSession, ration_stock_id: int, amount: float, **movement_fields: Any) -> float:
+    """Retira `amount` do estoque, falhando se não houver saldo"""
+    return await adjust_stock(db, ration_stock_id, -amount, **movement_fields)
+
+
+async def deposit_stock(db: AsyncSession, ration_stock_id: int, amount: float, **movement_fields: Any) -> float:
+    """Devolve/adiciona `amount` ao estoque"""
+    return await adjust_stock(db, ration_stock_id, amount, **movement_fields)
+
+
+async def run_stock_transaction(
+    db: AsyncSession,
+    work: Callable[..., Awaitable[T]],
+    *args: Any,
+    **kwargs: Any
+) -> T:
+    """
+    Executa `work(db, *args, **kwargs)` e faz commit. Em falha de serialização
+    ou deadlock, desfaz a transação e repete a unidade de trabalho inteira
+    (até STOCK_MAX_RETRIES vezes). Qualquer outro erro desfaz e é propagado.
+    """
+    attempt = 1
+    while True:
+        try:
+            result = await work(db, *args, **kwargs)
+            await db.commit()
+            return result
+        except DBAPIError as e:
+            await db.rollback()
+            if attempt >= STOCK_MAX_RETRIES or not is_retryable_error(e):
+                raise
+        except Exception:
+            await db.rollback()
+            raise
+        await asyncio.sleep(STOCK_RETRY_BACKOFF * attempt)
+        attempt += 1
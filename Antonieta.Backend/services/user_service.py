@@ -2,7 +2,8 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from models.user_model import User
 from dtos.user_dto import UserCreate, UserUpdate
-from services.auth_service import get_password_hash
+from services.password_hasher import password_hasher
+from services.principal_cache import principal_cache
 
 def get_all_users(db: Session) -> List[User]:
     """Obter todos os usuários"""
@@ -16,9 +17,9 @@ def get_user_by_email(db: Session, email: str) -> Optional[User]:
     """Obter um usuário por email"""
     return db.query(User).filter(User.email == email).first()
 
-def create_new_user(db: Session, user: UserCreate) -> User:
-    """Criar um novo usuário"""
-    hashed_password = get_password_hash(user.password)
+async def create_new_user(db: Session, user: UserCreate) -> User:
+    """Criar um novo usuário (hash da senha no pool do bcrypt)"""
+    hashed_password = await password_hasher.hash(user.password)
     db_user = User(
         email=user.email,
         hashed_password=hashed_password,
@@ -30,8 +31,8 @@ def create_new_user(db: Session, user: UserCreate) -> User:
     db.refresh(db_user)
     return db_user
 
-def update_user_by_id(db: Session, user_id: int, user: UserUpdate) -> User:
-    """Atualizar um usuário existente"""
+async def update_user_by_id(db: Session, user_id: int, user: UserUpdate) -> User:
+    """Atualizar um usuário existente (hash da nova senha no pool do bcrypt)"""
     db_user = get_user_by_id(db, user_id)
     if db_user:
         if user.email is not None:
@@ -39,12 +40,13 @@ def update_user_by_id(db: Session, user_id: int, user: UserUpdate) -> User:
         if user.full_name is not None:
             db_user.full_name = user.full_name
         if user.password is not None:
-            db_user.hashed_password = get_password_hash(user.password)
+            db_user.hashed_password = await password_hasher.hash(user.password)
         if user.role is not None:
             db_user.role = user.role
         
         db.commit()
         db.refresh(db_user)
+        principal_cache.invalidate_user(user_id)
     return db_user
 
 def delete_user_by_id(db: Session, user_id: int) -> bool:
@@ -53,5 +55,6 @@ def delete_user_by_id(db: Session, user_id: int) -> bool:
     if db_user:
         db.delete(db_user)
         db.commit()
+        principal_cache.invalidate_user(user_id)
         return True
     return False
@@ -0,0 +1,131 @@
+"""
+Teste de estresse do motor de estoque: dispara distribuições simultâneas
+contra uma mesma ração e confere que o estoque nunca fica negativo, que
+o saldo final bate com a quantidade efetivamente distribuída e que o
+livro-razão (stock_movement) tem um movimento por distribuição e termina
+no mesmo saldo.
+
+Cria uma ração e um beneficiário temporários, executa as escritas em
+sessões independentes (uma por tarefa, como requisições concorrentes) e
+remove os registros criados ao final.
+
+Uso:
+    python stress_stock_concurrency.py [--stock 100] [--amount 3]
+                                       [--workers 50] [--writes 200]
+"""
+
+import argparse
+import asyncio
+import sys
+import uuid
+from datetime import datetime
+from fastapi import HTTPException
+from sqlalchemy import delete, select
+from database import AsyncSessionLocal
+
+# Importar todos os modelos para evitar problemas de referência circular
+import models.user_model  # noqa: F401
+import models.ration_input_model  # noqa: F401
+import models.distribution_model  # noqa: F401
+import models.audit_log_model  # noqa: F401
+
+from models.beneficiary_model import Beneficiary
+from models.ration_stock_model import RationStock
+from models.monthly_rollup_model import MonthlyRollup
+from models.stock_movement_model import StockMovement
+from dtos.create_distribution_dto import create_distribution_dto
+from services.distribution_services import create_distribution_service, delete_distribution_service
+from services.stock_service import KIND_OPENING, deposit_stock
+
+async def create_fixtures(initial_stock: float):
+    """Cria a ração e o beneficiário usados no teste"""
+    suffix = uuid.uuid4().hex[:8]
+    async with AsyncSessionLocal() as db:
+        ration_stock = RationStock(name=f"stress-{suffix}", description="Teste de estresse", unit="kg", stock=0)
+        beneficiary = Beneficiary(name=f"Stress {suffix}", document=f"stress-{suffix}")
+        db.add_all([ration_stock, beneficiary])
+        await db.flush()
+        await deposit_stock(db, ration_stock.id, initial_stock, kind=KIND_OPENING)
+        await db.commit()
+        return ration_stock.id, beneficiary.id
+
+async def hammer(ration_stock_id: int, beneficiary_id: int, amount: float, workers: int, writes: int) -> dict:
+    """Executa `writes` distribuições com até `workers` simultâneas"""
+    semaphore = asyncio.Semaphore(workers)
+    results = {"ok": 0, "insufficient": 0, "errors": 0, "ids": []}
+
+    async def one_write():
+        async with semaphore:
+            async with AsyncSessionLocal() as db:
+                try:
+                    distribution = await create_distribution_service(db, create_distribution_dto(
+                        ration_id=ration_stock_id,
+                        beneficiary_id=beneficiary_id,
+                        amount=amount,
+                        date=datetime.now()
+                    ))
+                    results["ok"] += 1
+                    results["ids"].append(distribution["id"])
+                except HTTPException as e:
+                    results["insufficient" if e.status_code == 400 else "errors"] += 1
+                except Exception as e:
+                    results["errors"] += 1
+                    print(f"  ❌ {type(e).__name__}: {str(e)}")
+
+    await asyncio.gather(*(one_write() for _ in range(writes)))
+    return results
+
+async def cleanup(ration_stock_id: int, beneficiary_id: int, distribution_ids: list):
+    """Remove as distribuições (revertendo estoque e totais mensais) e os registros temporários"""
+    async with AsyncSessionLocal() as db:
+        for distribution_id in distribution_ids:
+            await delete_distribution_service(db, distribution_id)
+        await db.execute(delete(MonthlyRollup).where(MonthlyRollup.ration_stock_id == ration_stock_id))
+        await db.execute(delete(StockMovement).where(StockMovement.ration_stock_id == ration_stock_id))
+        await db.execute(delete(Beneficiary).where(Beneficiary.id == beneficiary_id))
+        await db.execute(delete(RationStock).where(RationStock.id == ration_stock_id))
+        await db.commit()
+
+async def main(args) -> int:
+    ration_stock_id, beneficiary_id = await create_fixtures(args.stock)
+    print(f"\n🧪 Ração {ration_stock_id} com estoque {args.stock}; {args.writes} distribuições de {args.amount} ({args.workers} simultâneas)")
+
+    results = {"ids": []}
+    try:
+        results = await hammer(ration_stock_id, beneficiary_id, args.amount, args.workers, args.writes)
+
+        async with AsyncSessionLocal() as db:
+            final_stock = await db.scalar(select(RationStock.stock).where(RationStock.id == ration_stock_id))
+            ledger = (await db.execute(
+                select(StockMovement.sequence, StockMovement.balance)
+                .where(StockMovement.ration_stock_id == ration_stock_id)
+                .order_by(StockMovement.sequence.desc())
+                .limit(1)
+            )).first()
+
+        expected_stock = args.stock - results["ok"] * args.amount
+        print("\n📊 Resultado:")
+        print(f"  - Distribuições aceitas: {results['ok']}")
+        print(f"  - Recusadas por estoque insuficiente: {results['insufficient']}")
+        print(f"  - Erros inesperados: {results['errors']}")
+        print(f"  - Estoque final: {final_stock} (esperado {expected_stock})")
+        print(f"  - Livro-razão: {ledger.sequence} movimentos, saldo {ledger.balance}")
+
+        # Abertura + uma linha por distribuição aceita, terminando no saldo da projeção
+        ledger_ok = ledger.sequence == results["ok"] + 1 and abs(ledger.balance - final_stock) <= 1e-9
+        if final_stock < 0 or abs(final_stock - expected_stock) > 1e-9 or not ledger_ok or results["errors"]:
+            print("\n❌ Inconsistência detectada no estoque!")
+            return 2
+        print("\n✅ Estoque consistente sob concorrência.")
+        return 0
+    finally:
+        await cleanup(ration_stock_id, beneficiary_id, results["ids"])
+        print("🧹 Registros temporários removidos.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Teste de estresse de escritas concorrentes no estoque")
+    parser.add_argument("--stock", type=float, default=100, help="Estoque inicial da ração temporária")
+    parser.add_argument("--amount", type=float, default=3, help="Quantidade de cada distribuição")
+    parser.add_argument("--workers", type=int, default=50, help="Escritas simultâneas")
+    parser.add_argument("--writes", type=int, default=200, help="Total de distribuições disparadas")
+    sys.exit(asyncio.run(main(parser.parse_args())))
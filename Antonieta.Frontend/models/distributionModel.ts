@@ -5,6 +5,9 @@ export interface Distribution {
   amount: number 
   date: string
   observations?: string | null
+  // Nomes retornados pela listagem e pelo detalhe (JOIN no backend)
+  beneficiary_name?: string | null
+  ration_name?: string | null
   beneficiary?: {
     id: number
     name: string
@@ -31,4 +34,24 @@ export interface DistributionUpdate {
   amount?: number
   date?: string
   observations?: string | null
-}
\ No newline at end of file
+}
+
+export interface BeneficiaryDistributionHistory {
+  beneficiary_id: number
+  date_from: string | null
+  date_to: string | null
+  items: Array<{
+    id: number
+    date: string
+    ration_id: number | null
+    ration_name: string | null
+    amount: number
+    observations: string | null
+    running_total: number
+  }>
+  next_cursor: string | null
+  limit: number
+  total_amount: number
+  total_count: number
+  monthly: Array<{ year: number, month: number, amount: number, count: number }>
+}
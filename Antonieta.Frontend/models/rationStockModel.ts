@@ -7,3 +7,37 @@ export interface RationStock {
   description: string
   distributions_id?: number[]
 }
+
+export interface StockMovement {
+  id: number
+  sequence: number
+  kind: 'opening' | 'input' | 'distribution' | 'adjustment'
+  source_id: number | null
+  reference_date: string | null
+  delta: number
+  balance: number
+  total_in: number
+  total_out: number
+  recorded_at: string
+}
+
+export interface StockAsOf {
+  ration_stock_id: number
+  at: string
+  stock: number
+  sequence: number | null
+  recorded_at: string | null
+}
+
+export interface StockMovements {
+  ration_stock_id: number
+  date_from: string | null
+  date_to: string | null
+  items: StockMovement[]
+  next_cursor: string | null
+  limit: number
+  opening_balance: number
+  closing_balance: number
+  total_in: number
+  total_out: number
+}
@@ -13,9 +13,11 @@ function timestamp_to_date(timestamp: number): string {
 }
 
 export const beneficiaryService = {
-  async getAll(): Promise<[Beneficiary[], number]> {
+  // fields: colunas a retornar ('list' para o resumo da listagem); vazio retorna tudo
+  async getAll(fields?: string): Promise<[Beneficiary[], number]> {
     try {
-      const response = await fetch(`${BASE_URL}/`, {
+      const query = fields ? `?fields=${encodeURIComponent(fields)}` : ''
+      const response = await fetch(`${BASE_URL}/${query}`, {
         headers: {
           'Authorization': `Bearer ${localStorage.getItem('access_token')}`
         }
@@ -230,6 +232,62 @@ export const beneficiaryService = {
     }
   },
 
+  async search(query: string, skip: number = 0, limit: number = 50): Promise<[Beneficiary[], number]> {
+    try {
+      const params = new URLSearchParams({
+        q: query,
+        skip: String(skip),
+        limit: String(limit)
+      })
+      const response = await fetch(`${BASE_URL}/search?${params}`, {
+        headers: {
+          'Authorization': `Bearer ${localStorage.getItem('access_token')}`
+        }
+      })
+      
+      if (!response.ok) {
+        throw new Error('Failed to search beneficiaries')
+      }
+      
+      const data = await response.json()
+      const beneficiaries = data.items.map((item: any) => Beneficiary.fromBackend(item))
+      
+      return [beneficiaries, data.total]
+    } catch (error) {
+      console.error('Error searching beneficiaries:', error)
+      throw error
+    }
+  },
+
+  // Exportação CSV gerada no servidor (sem o limite da listagem)
+  async exportCsv(filters: { dateFrom?: string, dateTo?: string, neighborhood?: string, old?: 'false' | 'true' | 'all' } = {}): Promise<[Blob, string]> {
+    try {
+      const params = new URLSearchParams()
+      if (filters.dateFrom) params.set('date_from', filters.dateFrom)
+      if (filters.dateTo) params.set('date_to', filters.dateTo)
+      if (filters.neighborhood) params.set('neighborhood', filters.neighborhood)
+      if (filters.old) params.set('old', filters.old)
+
+      const response = await fetch(`${BASE_URL}/export?${params}`, {
+        headers: {
+          'Authorization': `Bearer ${localStorage.getItem('access_token')}`
+        }
+      })
+      
+      if (!response.ok) {
+        throw new Error('Failed to export beneficiaries')
+      }
+      
+      const disposition = response.headers.get('Content-Disposition') || ''
+      const filename = disposition.match(/filename="(.+)"/)?.[1] || 'beneficiarios.csv'
+      
+      return [await response.blob(), filename]
+    } catch (error) {
+      console.error('Error exporting beneficiaries:', error)
+      throw error
+    }
+  },
+
   // ✅ NOVO: Métodos para buscar por endereço granularizado
   async searchByNeighborhood(neighborhood: string, skip: number = 0, limit: number = 100): Promise<[Beneficiary[], number]> {
     try {
@@ -72,8 +72,19 @@ export const dashboardService = {
     return response.json()
   },
 
-  async getBeneficiariesDashboard(skip: number = 0, limit: number = 10): Promise<PaginatedResponse<BeneficiaryDashboardData>> {
-    const response = await fetch(`${BASE_URL}/beneficiaries-dashboard?skip=${skip}&limit=${limit}`, {
+  async getBeneficiariesDashboard(
+    skip: number = 0,
+    limit: number = 10,
+    sortBy: 'id' | 'nome' | 'recebido_mes' = 'id',
+    sortOrder: 'asc' | 'desc' = 'asc'
+  ): Promise<PaginatedResponse<BeneficiaryDashboardData>> {
+    const params = new URLSearchParams({
+      skip: String(skip),
+      limit: String(limit),
+      sort_by: sortBy,
+      sort_order: sortOrder
+    })
+    const response = await fetch(`${BASE_URL}/beneficiaries-dashboard?${params}`, {
       headers: {
         'Authorization': `Bearer ${localStorage.getItem('access_token')}`
       }
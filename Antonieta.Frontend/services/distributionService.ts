@@ -1,7 +1,8 @@
-import type { Distribution } from '../models/distributionModel'
+import type { Distribution, BeneficiaryDistributionHistory } from '../models/distributionModel'
 import { useRuntimeConfig } from '#app'
 
 const BASE_URL = `${useRuntimeConfig().public.backendUrl}/distribution`
+const BENEFICIARY_URL = `${useRuntimeConfig().public.backendUrl}/beneficiary`
 
 export const distributionService = {
   async getAll(): Promise<[Distribution[], number]> {
@@ -38,9 +39,21 @@ export const distributionService = {
     return response.json()
   },
 
-  async getByBeneficiaryId(beneficiaryId: number): Promise<[Distribution[], number]> {
+  // Histórico do beneficiário no período (datas YYYY-MM-DD, inclusivas), paginado por cursor
+  async getByBeneficiaryId(
+    beneficiaryId: number,
+    filters: { from?: string, to?: string, cursor?: string, limit?: number } = {}
+  ): Promise<BeneficiaryDistributionHistory> {
     try {
-      const response = await fetch(`${BASE_URL}/beneficiary/${beneficiaryId}`, {
+      const params = new URLSearchParams()
+      Object.entries(filters).forEach(([key, value]) => {
+        if (value !== undefined && value !== null && value !== '') {
+          params.append(key, String(value))
+        }
+      })
+
+      const query = params.toString() ? `?${params}` : ''
+      const response = await fetch(`${BENEFICIARY_URL}/${beneficiaryId}/distributions${query}`, {
         headers: {
           'Authorization': `Bearer ${localStorage.getItem('access_token')}`
         }
@@ -50,8 +63,7 @@ export const distributionService = {
         throw new Error('Failed to fetch beneficiary distributions')
       }
       
-      const [distributions, count] = await response.json()
-      return [distributions, count]
+      return await response.json()
     } catch (error) {
       console.error('Error fetching beneficiary distributions:', error)
       throw error
@@ -1,4 +1,4 @@
-import type { RationStock } from '../models/rationStockModel'
+import type { RationStock, StockAsOf, StockMovements } from '../models/rationStockModel'
 import { useRuntimeConfig } from '#app'
 
 const BASE_URL = `${useRuntimeConfig().public.backendUrl}/ration-stock`
@@ -38,6 +38,47 @@ export const rationStockService = {
     return response.json()
   },
 
+  // Saldo da ração em um instante (ISO 8601), a partir do livro-razão de estoque
+  async getStockAsOf(id: number, at: string): Promise<StockAsOf> {
+    const response = await fetch(`${BASE_URL}/${id}/stock-as-of?at=${encodeURIComponent(at)}`, {
+      headers: {
+        'Authorization': `Bearer ${localStorage.getItem('access_token')}`
+      }
+    })
+    
+    if (!response.ok) {
+      throw new Error('Failed to fetch stock as of date')
+    }
+    
+    return response.json()
+  },
+
+  // Movimentos de estoque no período (datas YYYY-MM-DD, inclusivas), paginados por cursor
+  async getMovements(
+    id: number,
+    filters: { from?: string, to?: string, cursor?: string, limit?: number } = {}
+  ): Promise<StockMovements> {
+    const params = new URLSearchParams()
+    Object.entries(filters).forEach(([key, value]) => {
+      if (value !== undefined && value !== null && value !== '') {
+        params.append(key, String(value))
+      }
+    })
+
+    const query = params.toString() ? `?${params}` : ''
+    const response = await fetch(`${BASE_URL}/${id}/movements${query}`, {
+      headers: {
+        'Authorization': `Bearer ${localStorage.getItem('access_token')}`
+      }
+    })
+    
+    if (!response.ok) {
+      throw new Error('Failed to fetch stock movements')
+    }
+    
+    return response.json()
+  },
+
   async create(rationStock: Omit<RationStock, 'id'>): Promise<RationStock> {
     const response = await fetch(`${BASE_URL}/`, {
       method: 'POST',